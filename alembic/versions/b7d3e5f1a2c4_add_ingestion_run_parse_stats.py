@@ -0,0 +1,27 @@
+"""Add ingestion run parse stats
+
+Revision ID: b7d3e5f1a2c4
+Revises: f1c8a9d2e4b7
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d3e5f1a2c4"
+down_revision: Union[str, None] = "f1c8a9d2e4b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("ingestion_runs", sa.Column("parse_stats", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("ingestion_runs", "parse_stats")
@@ -0,0 +1,27 @@
+"""Add ingestion run commit seconds
+
+Revision ID: c4a8e2d6f9b1
+Revises: b7d3e5f1a2c4
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4a8e2d6f9b1"
+down_revision: Union[str, None] = "b7d3e5f1a2c4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("ingestion_runs", sa.Column("commit_seconds", sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("ingestion_runs", "commit_seconds")
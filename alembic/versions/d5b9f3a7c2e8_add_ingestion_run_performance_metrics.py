@@ -0,0 +1,37 @@
+"""Add ingestion run performance metrics
+
+Revision ID: d5b9f3a7c2e8
+Revises: c4a8e2d6f9b1
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d5b9f3a7c2e8"
+down_revision: Union[str, None] = "c4a8e2d6f9b1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("ingestion_runs", sa.Column("download_seconds", sa.Float(), nullable=True))
+    op.add_column("ingestion_runs", sa.Column("parse_seconds", sa.Float(), nullable=True))
+    op.add_column("ingestion_runs", sa.Column("load_seconds", sa.Float(), nullable=True))
+    op.add_column("ingestion_runs", sa.Column("rows_per_second", sa.Float(), nullable=True))
+    op.add_column("ingestion_runs", sa.Column("peak_rss_bytes", sa.BigInteger(), nullable=True))
+    op.add_column("ingestion_runs", sa.Column("pdf_bytes", sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("ingestion_runs", "pdf_bytes")
+    op.drop_column("ingestion_runs", "peak_rss_bytes")
+    op.drop_column("ingestion_runs", "rows_per_second")
+    op.drop_column("ingestion_runs", "load_seconds")
+    op.drop_column("ingestion_runs", "parse_seconds")
+    op.drop_column("ingestion_runs", "download_seconds")
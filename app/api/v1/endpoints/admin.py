@@ -1,10 +1,12 @@
+from datetime import timedelta
+
 from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.orm import Session
 
 from app.api.deps import PaginationParams, get_pagination_params, verify_admin_api_key
 from app.core.rate_limiter import limiter
 from app.db.session import get_db
-from app.schemas.ingestion_run import IngestionRunSummary
+from app.schemas.ingestion_run import IngestionRunPerformance, IngestionRunSummary
 from app.schemas.pagination import PaginatedResponse
 from app.services.ingestion_run_service import IngestionRunService
 
@@ -30,3 +32,15 @@ def read_ingestion_runs(
     )
     total = IngestionRunService.count_runs(db, task_name=task_name, status=status)
     return {"items": items, "total": total, "skip": pagination.skip, "limit": pagination.limit}
+
+
+@router.get("/ingestion-runs/performance", response_model=IngestionRunPerformance)
+@limiter.limit("60/minute")
+def read_ingestion_run_performance(
+    request: Request,
+    window_hours: int = Query(24 * 7, ge=1, le=24 * 366, description="Look-back window over finished runs"),
+    task_name: str = Query("scrape_daily_prices", description="Ingestion task to summarize"),
+    db: Session = Depends(get_db),
+    _=Depends(verify_admin_api_key),
+):
+    return IngestionRunService.get_performance_summary(db, window=timedelta(hours=window_hours), task_name=task_name)
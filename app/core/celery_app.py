@@ -22,4 +22,9 @@ celery_app.conf.update(
     worker_pool=settings.CELERY_WORKER_POOL,
     worker_concurrency=settings.CELERY_WORKER_CONCURRENCY,
     beat_schedule_filename=settings.CELERY_BEAT_SCHEDULE_FILE,
+    task_routes={
+        "app.scraper.tasks.download_report": {"queue": settings.CELERY_IO_QUEUE},
+        "app.scraper.tasks.parse_report": {"queue": settings.CELERY_CPU_QUEUE},
+        "app.scraper.tasks.load_report": {"queue": settings.CELERY_DB_QUEUE},
+    },
 )
@@ -1,5 +1,5 @@
 import os
-from typing import Dict, List, Optional
+from typing import Dict, List, Literal, Optional
 
 from pydantic import model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -31,6 +31,10 @@ class Settings(BaseSettings):
     CELERY_WORKER_POOL: Optional[str] = None
     CELERY_WORKER_CONCURRENCY: Optional[int] = None
     CELERY_BEAT_SCHEDULE_FILE: Optional[str] = None
+    # Queues for the scrape pipeline's download (network), parse (CPU) and load (database) stages.
+    CELERY_IO_QUEUE: str = "io"
+    CELERY_CPU_QUEUE: str = "cpu"
+    CELERY_DB_QUEUE: str = "db"
     WAIT_FOR_SERVICES_TIMEOUT_SECONDS: int = 60
     INGESTION_STALENESS_HOURS: int = 36
 
@@ -46,6 +50,39 @@ class Settings(BaseSettings):
 
     # Default market for scraper
     DEFAULT_MARKET_NAME: str = "NCR Central Market"
+    # Process-pool size for per-page PDF parsing; 1 keeps the serial parser. Only the backfill/CLI
+    # path (and solo Celery workers) can use it: prefork pool children are daemonic and parse serially.
+    # Reports shorter than PriceParser.PROCESS_POOL_MIN_PAGES pages are always parsed serially.
+    PARSER_WORKERS: int = 1
+    # Parsed rows cached by PDF hash so retries and forced re-runs skip pdfplumber.
+    PARSE_CACHE_ENABLED: bool = True
+    PARSE_CACHE_DIR: Optional[str] = None
+    PARSE_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    # Rows per set-based upsert statement during ingestion.
+    INGESTION_UPSERT_CHUNK_SIZE: int = 500
+    # "copy" streams rows through a COPY staging table on PostgreSQL; SQLite always upserts.
+    INGESTION_LOADER: Literal["upsert", "copy"] = "upsert"
+    # Queued or running scrapes older than this no longer block another worker from claiming their file.
+    INGESTION_LOCK_TTL_SECONDS: int = 2 * 60 * 60
+    # Pooled keep-alive client shared by the PDF downloader and the source page scraper.
+    HTTP_TIMEOUT_SECONDS: float = 60.0
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 10.0
+    HTTP_MAX_CONNECTIONS: int = 10
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 5
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    # Needs the optional h2 package (pip install "httpx[http2]").
+    HTTP2_ENABLED: bool = False
+    # ETag/Last-Modified validators for conditional GETs.
+    HTTP_CACHE_ENABLED: bool = True
+    HTTP_CACHE_DIR: Optional[str] = None
+    # Content-addressed store of downloaded PDFs shared by the downloader, pipeline stages and backfills.
+    PDF_STORE_ENABLED: bool = True
+    PDF_STORE_DIR: Optional[str] = None
+    PDF_STORE_MAX_BYTES: int = 1024 * 1024 * 1024
+    # Politeness cap for concurrent downloads (download_many) against any one host.
+    HTTP_PER_HOST_CONCURRENCY: int = 2
+    # Discovery downloads every new report in one concurrent burst before queueing their pipelines.
+    INGESTION_PREFETCH_PDFS: bool = False
 
     # Cache TTL settings (in seconds)
     CACHE_TTL_SHORT: int = 60  # 1 minute
@@ -84,6 +121,15 @@ class Settings(BaseSettings):
             else:
                 self.CELERY_BEAT_SCHEDULE_FILE = "celerybeat-schedule.local" if self.is_windows else "celerybeat-schedule"
 
+        if self.PARSE_CACHE_DIR is None:
+            self.PARSE_CACHE_DIR = "/app/data/parse-cache" if self.is_production else "cache/parse"
+
+        if self.HTTP_CACHE_DIR is None:
+            self.HTTP_CACHE_DIR = "/app/data/http-cache" if self.is_production else "cache/http"
+
+        if self.PDF_STORE_DIR is None:
+            self.PDF_STORE_DIR = "/app/data/pdf-store" if self.is_production else "cache/pdfs"
+
         return self
 
     @property
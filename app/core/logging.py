@@ -35,6 +35,16 @@ class JsonLogFormatter(logging.Formatter):
             "anomaly_count",
             "anomaly_flags",
             "elapsed_seconds",
+            "page_number",
+            "parse_cache_hit",
+            "parse_stats",
+            "commit_seconds",
+            "download_seconds",
+            "parse_seconds",
+            "load_seconds",
+            "rows_per_second",
+            "peak_rss_bytes",
+            "pdf_bytes",
             "schema_at_head",
         ):
             value = getattr(record, field, None)
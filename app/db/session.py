@@ -1,10 +1,33 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
 
+
+def enable_sqlite_savepoints(engine: Engine) -> Engine:
+    """
+    Let SQLAlchemy own SQLite transactions so SAVEPOINTs nest correctly.
+
+    pysqlite defers BEGIN until the first write, so a SAVEPOINT issued first
+    opens the transaction itself and its RELEASE commits everything.
+    """
+
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    return engine
+
+
 # Synchronous engine and session used by API handlers, Celery tasks, and scripts.
 engine = create_engine(settings.sync_database_url, pool_pre_ping=True)
+if engine.dialect.name == "sqlite":
+    enable_sqlite_savepoints(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
@@ -1,7 +1,7 @@
 import uuid
 from datetime import UTC, datetime
 
-from sqlalchemy import JSON, Column, Date, DateTime, Integer, String, Text
+from sqlalchemy import JSON, BigInteger, Column, Date, DateTime, Float, Integer, String, Text
 
 from app.db.base_class import Base
 from app.db.types import GUID
@@ -25,6 +25,14 @@ class IngestionRun(Base):
     error_count = Column(Integer)
     anomaly_count = Column(Integer)
     anomaly_flags = Column(JSON, nullable=False, default=list)
+    parse_stats = Column(JSON)
+    commit_seconds = Column(Float)
+    download_seconds = Column(Float)
+    parse_seconds = Column(Float)
+    load_seconds = Column(Float)
+    rows_per_second = Column(Float)
+    peak_rss_bytes = Column(BigInteger)
+    pdf_bytes = Column(BigInteger)
     error_message = Column(Text)
     started_at = Column(DateTime, nullable=False, default=lambda: datetime.now(UTC).replace(tzinfo=None))
     finished_at = Column(DateTime)
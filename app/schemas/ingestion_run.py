@@ -1,5 +1,5 @@
 from datetime import date, datetime
-from typing import Optional
+from typing import Any, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -22,7 +22,28 @@ class IngestionRunSummary(BaseModel):
     error_message: Optional[str] = None
     anomaly_count: Optional[int] = None
     anomaly_flags: list[str] = Field(default_factory=list)
+    parse_stats: Optional[dict[str, Any]] = None
+    commit_seconds: Optional[float] = None
+    download_seconds: Optional[float] = None
+    parse_seconds: Optional[float] = None
+    load_seconds: Optional[float] = None
+    rows_per_second: Optional[float] = None
+    peak_rss_bytes: Optional[int] = None
+    pdf_bytes: Optional[int] = None
     started_at: datetime
     finished_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class MetricPercentiles(BaseModel):
+    p50: Optional[float] = None
+    p95: Optional[float] = None
+
+
+class IngestionRunPerformance(BaseModel):
+    task_name: str
+    window_start: datetime
+    window_end: datetime
+    run_count: int
+    metrics: dict[str, MetricPercentiles]
@@ -1,11 +1,14 @@
 import logging
 import time
+from uuid import uuid4
 
 from app.core.celery_app import celery_app
+from app.core.config import settings
 from app.db.session import SessionLocal
 from app.models import PriceEntry
+from app.scraper.downloader import PDFDownloader
 from app.scraper.source import MonitoringSource
-from app.scraper.tasks import scrape_daily_prices
+from app.scraper.tasks import scrape_pipeline
 from app.services.ingestion_run_service import IngestionRunService
 
 logger = logging.getLogger(__name__)
@@ -25,7 +28,8 @@ def get_processed_files() -> list:
 def discover_and_scrape():
     """
     Periodic task to check for new Daily Retail Price PDFs and trigger scraping.
-    Only processes PDFs that haven't been ingested yet.
+    Only processes PDFs that haven't been ingested yet and aren't already
+    queued or being scraped.
     """
     started_at = time.monotonic()
     logger.info(
@@ -34,6 +38,8 @@ def discover_and_scrape():
     )
     db = SessionLocal()
     run = IngestionRunService.start_run(db, task_name="discover_and_scrape")
+    # Runs recorded as queued but not yet handed to a worker; they hold their files' ingestion locks.
+    undispatched = {}
 
     try:
         # Get already processed files
@@ -47,8 +53,9 @@ def discover_and_scrape():
             },
         )
 
-        # Get new PDFs only
-        new_links = MonitoringSource.get_new_pdf_links(processed_files)
+        # Get new PDFs only, leaving files another scrape has already claimed
+        in_flight_files = IngestionRunService.get_in_flight_source_files(db)
+        new_links = MonitoringSource.get_new_pdf_links(processed_files + in_flight_files)
 
         if not new_links:
             logger.info(
@@ -67,28 +74,70 @@ def discover_and_scrape():
 
         processed_count = 0
         queue_errors = 0
+        queued = []
         for url in new_links[:5]:  # Process up to 5 new PDFs at a time
+            source_file = url.split("/")[-1]
+            task_id = str(uuid4())
+            queued_run = IngestionRunService.queue_run(
+                db,
+                task_name="scrape_daily_prices",
+                task_id=task_id,
+                source_url=url,
+                source_file=source_file,
+            )
+            if queued_run is None:
+                logger.info(
+                    "Report is already queued or being scraped",
+                    extra={
+                        "event": "discovery_skipped_in_flight",
+                        "task_name": "discover_and_scrape",
+                        "source_url": url,
+                        "source_file": source_file,
+                    },
+                )
+                continue
+            queued.append((url, source_file, task_id, queued_run))
+            undispatched[task_id] = queued_run
+
+        # One concurrent burst over a shared client instead of a download per pipeline;
+        # a report whose prefetch failed is simply downloaded by its own pipeline.
+        prefetched = {}
+        if settings.INGESTION_PREFETCH_PDFS and queued:
+            results = PDFDownloader().download_many_sync([url for url, _, _, _ in queued])
+            prefetched = {result.url: str(result.path) for result in results if result.ok}
+
+        for url, source_file, task_id, queued_run in queued:
             logger.info(
                 "Queueing scrape task for new report",
                 extra={
                     "event": "discovery_queueing_scrape",
                     "task_name": "discover_and_scrape",
+                    "task_id": task_id,
                     "source_url": url,
-                    "source_file": url.split("/")[-1],
+                    "source_file": source_file,
                 },
             )
             try:
-                scrape_daily_prices.delay(url)
+                scrape_pipeline(url, task_id=task_id, pdf_path=prefetched.get(url)).apply_async()
+                del undispatched[task_id]
                 processed_count += 1
-            except Exception:
+            except Exception as exc:
+                del undispatched[task_id]
                 queue_errors += 1
+                IngestionRunService.finish_run(
+                    db,
+                    queued_run,
+                    status="failed",
+                    error_count=1,
+                    error_message=f"Failed to queue scrape task: {exc}",
+                )
                 logger.error(
                     "Failed to queue scrape task",
                     extra={
                         "event": "discovery_queue_failed",
                         "task_name": "discover_and_scrape",
                         "source_url": url,
-                        "source_file": url.split("/")[-1],
+                        "source_file": source_file,
                         "error_count": queue_errors,
                     },
                 )
@@ -122,6 +171,14 @@ def discover_and_scrape():
             "new_files": len(new_links),
         }
     except Exception as exc:
+        for queued_run in undispatched.values():
+            IngestionRunService.finish_run(
+                db,
+                queued_run,
+                status="failed",
+                error_count=1,
+                error_message=f"Discovery failed before the scrape task was queued: {exc}",
+            )
         IngestionRunService.finish_run(
             db,
             run,
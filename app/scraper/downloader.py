@@ -1,35 +1,222 @@
+import asyncio
+import hashlib
 import logging
+import os
+import random
 import time
+import uuid
+from contextlib import nullcontext
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse
 
 import httpx
 
+from app.core.config import settings
 from app.core.exceptions import PDFDownloadError
+from app.scraper.http_cache import HTTPValidatorCache
+from app.scraper.http_client import build_async_http_client, get_http_client
+from app.scraper.pdf_store import PDFStore
 
 logger = logging.getLogger(__name__)
 
+PDF_MAGIC = b"%PDF"
+
+
+class _PDFStreamWriter:
+    """
+    Stream a PDF body into a temp file beside its target, validating as it goes.
+
+    The magic bytes are checked as soon as they arrive, the size cap is
+    enforced per chunk and the SHA-256 is computed on the fly; the file only
+    replaces ``target_path`` once ``commit`` passes. An uncommitted temp file
+    is removed on exit.
+    """
+
+    def __init__(self, url: str, target_path: Path, max_bytes: int):
+        self.url = url
+        self.target_path = target_path
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.sha256 = hashlib.sha256()
+        self._head = b""
+        self._tmp_path = target_path.with_name(f".{target_path.name}.{uuid.uuid4().hex}.part")
+        self._file = None
+
+    def __enter__(self) -> "_PDFStreamWriter":
+        self._file = open(self._tmp_path, "wb")
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if not self._file.closed:
+            self._file.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+    def check_content_length(self, content_length: Optional[str]) -> None:
+        if content_length and content_length.isdigit() and int(content_length) > self.max_bytes:
+            raise PDFDownloadError(
+                url=self.url,
+                reason=f"PDF too large ({content_length} bytes, limit {self.max_bytes})",
+            )
+
+    def write(self, chunk: bytes) -> None:
+        if len(self._head) < len(PDF_MAGIC):
+            self._head += chunk[: len(PDF_MAGIC) - len(self._head)]
+            if len(self._head) == len(PDF_MAGIC) and self._head != PDF_MAGIC:
+                raise PDFDownloadError(url=self.url, reason=f"Response is not a PDF (starts with {self._head!r})")
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise PDFDownloadError(url=self.url, reason=f"PDF too large (over {self.max_bytes} bytes)")
+        self.sha256.update(chunk)
+        self._file.write(chunk)
+
+    def commit(self, min_bytes: int) -> str:
+        """Validate the complete body, move it into place atomically and return its SHA-256."""
+        if self._head != PDF_MAGIC:
+            raise PDFDownloadError(url=self.url, reason="Response is not a PDF")
+        # A valid report is at least 1KB; anything smaller is an error page.
+        if self.size < min_bytes:
+            raise PDFDownloadError(url=self.url, reason=f"PDF too small ({self.size} bytes)")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self._tmp_path, self.target_path)
+        return self.sha256.hexdigest()
+
+
+@dataclass
+class DownloadResult:
+    """Outcome of one URL in ``PDFDownloader.download_many``."""
+
+    url: str
+    path: Optional[Path] = None
+    bytes: Optional[int] = None
+    sha256: Optional[str] = None
+    elapsed_seconds: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
 
 class PDFDownloader:
     """
     Downloads PDF files with retry logic and error handling.
+
+    Every completed download is kept in the shared ``PDFStore``. A URL already
+    stored there is revalidated with a conditional GET and its stored copy is
+    only reused after a 304, so a report republished at the same URL is picked
+    up. Callers re-ingesting archived reports can pass ``prefer_stored`` to
+    check the stored copy out with no request at all.
     """
 
     MAX_RETRIES = 3
     RETRY_DELAY = 2  # seconds
-    TIMEOUT = 60  # seconds
+    TIMEOUT: Optional[float] = None  # seconds; None keeps the pooled client's HTTP_TIMEOUT_SECONDS
+    CHUNK_SIZE = 64 * 1024  # bytes written per streamed chunk
+    MIN_BYTES = 1024
+    MAX_BYTES = 50 * 1024 * 1024
 
-    def __init__(self, download_dir: str = "downloads"):
+    def __init__(self, download_dir: str = "downloads", client: Optional[httpx.Client] = None):
         self.download_dir = Path(download_dir)
         self.download_dir.mkdir(parents=True, exist_ok=True)
+        self._client = client
+        # SHA-256 of the last completed download, so callers need not re-read the file.
+        self.last_sha256: Optional[str] = None
+
+    @property
+    def client(self) -> httpx.Client:
+        """The injected client, or the process-wide pooled one."""
+        return self._client or get_http_client()
+
+    @staticmethod
+    def _pdf_store() -> Optional[PDFStore]:
+        return PDFStore() if settings.PDF_STORE_ENABLED else None
+
+    @staticmethod
+    def _serve_stored(store: Optional[PDFStore], url: str, target_path: Path) -> Optional[str]:
+        """Check out the stored body for ``url`` and return its SHA-256, or None if it is not stored."""
+        sha256 = store.lookup(url) if store else None
+        if sha256 is None:
+            return None
+        try:
+            store.checkout(sha256, target_path)
+        except OSError as e:
+            # Evicted between lookup and checkout; fall back to the network.
+            logger.warning(f"Stored PDF for {url} is unavailable: {e}")
+            return None
+        logger.info(f"Served {target_path} from the PDF store without a request")
+        return sha256
+
+    @staticmethod
+    def _validator_cache(url: str, store: Optional[PDFStore]) -> tuple[Optional[HTTPValidatorCache], Optional[dict]]:
+        """Return the validator cache and this URL's revalidatable entry, if any."""
+        if not settings.HTTP_CACHE_ENABLED or store is None:
+            return None, None
+        cache = HTTPValidatorCache()
+        entry = cache.lookup(url)
+        return cache, entry if entry and store.contains(entry.get("sha256")) else None
+
+    @staticmethod
+    def _serve_not_modified(
+        cache: HTTPValidatorCache, store: PDFStore, entry: dict, url: str, target_path: Path
+    ) -> Optional[str]:
+        """
+        Check out the stored body for a 304 and return its SHA-256.
 
-    def download_pdf_sync(self, url: str, filename: Optional[str] = None) -> Path:
+        Returns None, and forgets the validators, if the body has gone since
+        the lookup; they would only earn another 304 for a body we cannot serve.
+        """
+        try:
+            store.checkout(entry["sha256"], target_path)
+        except OSError as e:
+            logger.warning(f"PDF not modified but its stored copy is unavailable ({e}); refetching {url}")
+            cache.discard(url)
+            return None
+        cache.record_hit(url)
+        logger.info(f"PDF not modified; served {target_path} from the PDF store")
+        return entry["sha256"]
+
+    @staticmethod
+    def _remember(
+        cache: Optional[HTTPValidatorCache],
+        store: Optional[PDFStore],
+        url: str,
+        headers,
+        target_path: Path,
+        sha256: str,
+    ) -> None:
+        if store is None:
+            return
+        store.put(target_path, sha256=sha256, url=url)
+        if cache is not None:
+            cache.record_miss(url)
+            cache.store(url, headers, sha256=sha256)
+
+    def _target_path(self, url: str, filename: Optional[str] = None) -> Path:
+        if not filename:
+            filename = url.split("/")[-1]
+            # Sanitize filename
+            filename = "".join(c for c in filename if c.isalnum() or c in ".-_")
+
+        if not filename.lower().endswith(".pdf"):
+            filename += ".pdf"
+        return self.download_dir / filename
+
+    def _backoff_seconds(self, attempt: int) -> float:
+        # Exponential backoff with full-range jitter, so workers that failed together do not retry in lockstep.
+        return self.RETRY_DELAY * (2**attempt) * random.uniform(0.5, 1.5)
+
+    def download_pdf_sync(self, url: str, filename: Optional[str] = None, prefer_stored: bool = False) -> Path:
         """
         Download a PDF file synchronously with retry logic.
 
         Args:
             url: URL of the PDF to download
             filename: Optional filename to save as
+            prefer_stored: Reuse a stored copy without revalidating it with the source
 
         Returns:
             Path to the downloaded file
@@ -37,49 +224,42 @@ class PDFDownloader:
         Raises:
             PDFDownloadError: If download fails after all retries
         """
-        if not filename:
-            filename = url.split("/")[-1]
-            # Sanitize filename
-            filename = "".join(c for c in filename if c.isalnum() or c in ".-_")
-
-        if not filename.lower().endswith(".pdf"):
-            filename += ".pdf"
-
-        target_path = self.download_dir / filename
+        target_path = self._target_path(url, filename)
+        store = self._pdf_store()
+        sha256 = self._serve_stored(store, url, target_path) if prefer_stored else None
+        if sha256:
+            self.last_sha256 = sha256
+            return target_path
         last_error = None
+        cache, entry = self._validator_cache(url, store)
+        headers = HTTPValidatorCache.conditional_headers(entry)
 
         for attempt in range(self.MAX_RETRIES):
             try:
                 logger.info(f"Downloading PDF (attempt {attempt + 1}/{self.MAX_RETRIES}): {url}")
 
-                with httpx.Client(
-                    timeout=self.TIMEOUT,
-                    follow_redirects=True,
-                    headers={"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"},
-                ) as client:
-                    response = client.get(url)
+                # Pooled keep-alive connections are reused across attempts and reports.
+                timeout = self.TIMEOUT if self.TIMEOUT is not None else httpx.USE_CLIENT_DEFAULT
+                with self.client.stream("GET", url, timeout=timeout, headers=headers) as response:
+                    if response.status_code == 304 and entry is not None:
+                        sha256 = self._serve_not_modified(cache, store, entry, url, target_path)
+                        if sha256 is not None:
+                            self.last_sha256 = sha256
+                            return target_path
+                        # Retry straight away with an unconditional GET.
+                        entry, headers = None, {}
+                        last_error = OSError("stored PDF missing after 304 Not Modified")
+                        continue
                     response.raise_for_status()
+                    with _PDFStreamWriter(url, target_path, self.MAX_BYTES) as writer:
+                        writer.check_content_length(response.headers.get("content-length"))
+                        for chunk in response.iter_bytes(self.CHUNK_SIZE):
+                            writer.write(chunk)
+                        self.last_sha256 = writer.commit(self.MIN_BYTES)
 
-                    # Verify it's a PDF
-                    content_type = response.headers.get("content-type", "")
-                    if "pdf" not in content_type.lower() and not response.content[:4] == b"%PDF":
-                        raise PDFDownloadError(
-                            url=url,
-                            reason=f"Response is not a PDF (content-type: {content_type})",
-                        )
-
-                    # Check file size (should be at least 1KB for a valid PDF)
-                    if len(response.content) < 1024:
-                        raise PDFDownloadError(
-                            url=url,
-                            reason=f"PDF too small ({len(response.content)} bytes)",
-                        )
-
-                    with open(target_path, "wb") as f:
-                        f.write(response.content)
-
-                    logger.info(f"Successfully downloaded: {target_path} ({len(response.content)} bytes)")
-                    return target_path
+                self._remember(cache, store, url, response.headers, target_path, self.last_sha256)
+                logger.info(f"Successfully downloaded: {target_path} ({writer.size} bytes)")
+                return target_path
 
             except httpx.TimeoutException as e:
                 last_error = e
@@ -107,8 +287,8 @@ class PDFDownloader:
 
             # Wait before retry with exponential backoff
             if attempt < self.MAX_RETRIES - 1:
-                wait_time = self.RETRY_DELAY * (2**attempt)
-                logger.info(f"Waiting {wait_time}s before retry...")
+                wait_time = self._backoff_seconds(attempt)
+                logger.info(f"Waiting {wait_time:.1f}s before retry...")
                 time.sleep(wait_time)
 
         # All retries exhausted
@@ -117,13 +297,21 @@ class PDFDownloader:
             reason=f"Failed after {self.MAX_RETRIES} attempts: {str(last_error)}",
         )
 
-    async def download_pdf_async(self, url: str, filename: Optional[str] = None) -> Path:
+    async def download_pdf_async(
+        self,
+        url: str,
+        filename: Optional[str] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        prefer_stored: bool = False,
+    ) -> Path:
         """
         Download a PDF file asynchronously with retry logic.
 
         Args:
             url: URL of the PDF to download
             filename: Optional filename to save as
+            client: Optional AsyncClient to reuse; a short-lived one is built otherwise
+            prefer_stored: Reuse a stored copy without revalidating it with the source
 
         Returns:
             Path to the downloaded file
@@ -131,43 +319,67 @@ class PDFDownloader:
         Raises:
             PDFDownloadError: If download fails after all retries
         """
-        import asyncio
-
-        if not filename:
-            filename = url.split("/")[-1]
-            filename = "".join(c for c in filename if c.isalnum() or c in ".-_")
-
-        if not filename.lower().endswith(".pdf"):
-            filename += ".pdf"
+        target_path = self._target_path(url, filename)
+        if client is not None:
+            self.last_sha256, _ = await self._download_async(client, url, target_path, prefer_stored=prefer_stored)
+            return target_path
+        async with self._async_client() as owned_client:
+            self.last_sha256, _ = await self._download_async(
+                owned_client, url, target_path, prefer_stored=prefer_stored
+            )
+        return target_path
+
+    def _async_client(self) -> httpx.AsyncClient:
+        if self.TIMEOUT is not None:
+            return build_async_http_client(timeout=self.TIMEOUT)
+        return build_async_http_client()
+
+    async def _download_async(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        target_path: Path,
+        host_slots: Optional[asyncio.Semaphore] = None,
+        prefer_stored: bool = False,
+    ) -> tuple[str, int]:
+        """
+        Stream ``url`` into ``target_path`` with retries; returns ``(sha256, size)``.
 
-        target_path = self.download_dir / filename
+        ``host_slots`` is held for each attempt but released during backoff, so
+        a failing report does not block the other downloads from its host.
+        """
+        store = self._pdf_store()
+        sha256 = self._serve_stored(store, url, target_path) if prefer_stored else None
+        if sha256:
+            return sha256, target_path.stat().st_size
         last_error = None
+        cache, entry = self._validator_cache(url, store)
+        headers = HTTPValidatorCache.conditional_headers(entry)
 
         for attempt in range(self.MAX_RETRIES):
             try:
                 logger.info(f"Async downloading PDF (attempt {attempt + 1}/{self.MAX_RETRIES}): {url}")
 
-                async with httpx.AsyncClient(
-                    timeout=self.TIMEOUT,
-                    follow_redirects=True,
-                    headers={"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"},
-                ) as client:
-                    response = await client.get(url)
-                    response.raise_for_status()
-
-                    # Verify it's a PDF
-                    content_type = response.headers.get("content-type", "")
-                    if "pdf" not in content_type.lower() and not response.content[:4] == b"%PDF":
-                        raise PDFDownloadError(
-                            url=url,
-                            reason=f"Response is not a PDF (content-type: {content_type})",
-                        )
-
-                    with open(target_path, "wb") as f:
-                        f.write(response.content)
-
-                    logger.info(f"Successfully downloaded: {target_path}")
-                    return target_path
+                async with host_slots or nullcontext():
+                    async with client.stream("GET", url, headers=headers) as response:
+                        if response.status_code == 304 and entry is not None:
+                            sha256 = self._serve_not_modified(cache, store, entry, url, target_path)
+                            if sha256 is not None:
+                                return sha256, target_path.stat().st_size
+                            # Retry straight away with an unconditional GET.
+                            entry, headers = None, {}
+                            last_error = OSError("stored PDF missing after 304 Not Modified")
+                            continue
+                        response.raise_for_status()
+                        with _PDFStreamWriter(url, target_path, self.MAX_BYTES) as writer:
+                            writer.check_content_length(response.headers.get("content-length"))
+                            async for chunk in response.aiter_bytes(self.CHUNK_SIZE):
+                                writer.write(chunk)
+                            sha256 = writer.commit(self.MIN_BYTES)
+
+                self._remember(cache, store, url, response.headers, target_path, sha256)
+                logger.info(f"Successfully downloaded: {target_path} ({writer.size} bytes)")
+                return sha256, writer.size
 
             except httpx.TimeoutException as e:
                 last_error = e
@@ -187,13 +399,70 @@ class PDFDownloader:
                 logger.warning(f"Error downloading {url} (attempt {attempt + 1}): {e}")
 
             if attempt < self.MAX_RETRIES - 1:
-                await asyncio.sleep(self.RETRY_DELAY * (2**attempt))
+                await asyncio.sleep(self._backoff_seconds(attempt))
 
         raise PDFDownloadError(
             url=url,
             reason=f"Failed after {self.MAX_RETRIES} attempts: {str(last_error)}",
         )
 
+    async def download_many(
+        self,
+        urls: Iterable[str],
+        *,
+        per_host_limit: Optional[int] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        prefer_stored: bool = False,
+    ) -> List[DownloadResult]:
+        """
+        Download ``urls`` concurrently over one shared AsyncClient.
+
+        At most ``per_host_limit`` (default ``HTTP_PER_HOST_CONCURRENCY``)
+        requests run against any one host at a time. Stored URLs are
+        revalidated, or with ``prefer_stored`` checked out without a request.
+        A failed URL never aborts the others; its result carries the error
+        instead of a path. Results come back in the order of ``urls``.
+        """
+        urls = list(dict.fromkeys(urls))
+        limit = per_host_limit or settings.HTTP_PER_HOST_CONCURRENCY
+        host_slots: Dict[str, asyncio.Semaphore] = {}
+
+        async def _fetch(shared_client: httpx.AsyncClient, url: str) -> DownloadResult:
+            host = urlparse(url).hostname or ""
+            slots = host_slots.setdefault(host, asyncio.Semaphore(limit))
+            started_at = time.perf_counter()
+            target_path = self._target_path(url)
+            try:
+                sha256, size = await self._download_async(
+                    shared_client, url, target_path, slots, prefer_stored=prefer_stored
+                )
+            except Exception as e:
+                logger.warning(f"Prefetch failed for {url}: {e}")
+                return DownloadResult(url=url, error=str(e), elapsed_seconds=time.perf_counter() - started_at)
+            return DownloadResult(
+                url=url,
+                path=target_path,
+                bytes=size,
+                sha256=sha256,
+                elapsed_seconds=time.perf_counter() - started_at,
+            )
+
+        if client is not None:
+            results = await asyncio.gather(*(_fetch(client, url) for url in urls))
+        else:
+            async with self._async_client() as owned_client:
+                results = await asyncio.gather(*(_fetch(owned_client, url) for url in urls))
+
+        failed = sum(1 for result in results if not result.ok)
+        logger.info(f"Prefetched {len(results) - failed}/{len(results)} PDFs ({failed} failed)")
+        return list(results)
+
+    def download_many_sync(
+        self, urls: Iterable[str], *, per_host_limit: Optional[int] = None, prefer_stored: bool = False
+    ) -> List[DownloadResult]:
+        """Blocking wrapper around ``download_many`` for Celery tasks and scripts."""
+        return asyncio.run(self.download_many(urls, per_host_limit=per_host_limit, prefer_stored=prefer_stored))
+
     def list_downloaded_pdfs(self) -> List[Path]:
         """List all downloaded PDF files."""
         return list(self.download_dir.glob("*.pdf"))
@@ -0,0 +1,108 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Process-wide lookup outcomes, reported by ``http_cache_stats``.
+_counters: Counter = Counter()
+_counters_lock = threading.Lock()
+
+
+def http_cache_stats() -> Dict[str, int]:
+    """Return this process's validator cache hit and miss counts."""
+    with _counters_lock:
+        return {"hits": _counters["hits"], "misses": _counters["misses"]}
+
+
+def reset_http_cache_stats() -> None:
+    with _counters_lock:
+        _counters.clear()
+
+
+class HTTPValidatorCache:
+    """
+    On-disk cache of HTTP validators (``ETag`` / ``Last-Modified``) per URL.
+
+    Each URL has an entry at ``<cache_dir>/entries/<sha256(url)>.json`` holding
+    its validators plus either a small JSON ``payload`` (the monitoring page's
+    PDF links) or the SHA-256 of a body kept in the ``PDFStore``.
+    """
+
+    def __init__(self, cache_dir: str | Path | None = None):
+        self.cache_dir = Path(cache_dir or settings.HTTP_CACHE_DIR)
+
+    def _entry_path(self, url: str) -> Path:
+        return self.cache_dir / "entries" / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the stored entry for ``url``, or None if there is nothing to revalidate."""
+        try:
+            return json.loads(self._entry_path(url).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def discard(self, url: str) -> None:
+        """Forget the validators for ``url``, e.g. when the body they describe is gone."""
+        self._entry_path(url).unlink(missing_ok=True)
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def record_hit(self, url: str) -> None:
+        self._record("hits", "hit", url)
+
+    def record_miss(self, url: str) -> None:
+        self._record("misses", "miss", url)
+
+    @staticmethod
+    def _record(counter: str, outcome: str, url: str) -> None:
+        with _counters_lock:
+            _counters[counter] += 1
+            hits, misses = _counters["hits"], _counters["misses"]
+        logger.info(f"HTTP validator cache {outcome} for {url} (hits={hits}, misses={misses})")
+
+    def store(
+        self,
+        url: str,
+        headers,
+        *,
+        payload: Any = None,
+        sha256: str | None = None,
+    ) -> None:
+        """
+        Remember the validators from ``headers`` for ``url``.
+
+        Responses without an ``ETag`` or ``Last-Modified`` cannot be revalidated
+        and are not stored. ``sha256`` names the body kept in the ``PDFStore``.
+        """
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        if not etag and not last_modified:
+            return
+        try:
+            entry_path = self._entry_path(url)
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = entry_path.with_name(f"{entry_path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(
+                json.dumps(
+                    {"url": url, "etag": etag, "last_modified": last_modified, "payload": payload, "sha256": sha256}
+                ),
+                encoding="utf-8",
+            )
+            os.replace(tmp_path, entry_path)
+        except OSError as e:
+            logger.warning(f"Failed to write HTTP validator cache entry for {url}: {e}")
@@ -0,0 +1,90 @@
+import importlib.util
+import logging
+import os
+import threading
+from typing import Optional
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+_client: Optional[httpx.Client] = None
+_client_pid: Optional[int] = None
+_lock = threading.Lock()
+
+
+def _client_options(**overrides) -> dict:
+    http2 = settings.HTTP2_ENABLED
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning("HTTP2_ENABLED is set but the h2 package is not installed; using HTTP/1.1")
+        http2 = False
+
+    options = {
+        "http2": http2,
+        "follow_redirects": True,
+        "headers": {"User-Agent": USER_AGENT},
+        "timeout": httpx.Timeout(settings.HTTP_TIMEOUT_SECONDS, connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS),
+        "limits": httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+    }
+    options.update(overrides)
+    return options
+
+
+def build_http_client(**overrides) -> httpx.Client:
+    """
+    Build a keep-alive client from the HTTP_* settings.
+
+    ``overrides`` are passed straight to ``httpx.Client``, e.g. ``transport=``
+    for a mock transport in tests.
+    """
+    return httpx.Client(**_client_options(**overrides))
+
+
+def build_async_http_client(**overrides) -> httpx.AsyncClient:
+    """Async counterpart of ``build_http_client``; callers own (and close) the client."""
+    return httpx.AsyncClient(**_client_options(**overrides))
+
+
+def get_http_client() -> httpx.Client:
+    """
+    Return the process-wide pooled client, creating it on first use.
+
+    A forked worker never reuses its parent's client (or its sockets); it
+    builds its own the first time it asks.
+    """
+    global _client, _client_pid
+    with _lock:
+        if _client is None or _client.is_closed or _client_pid != os.getpid():
+            _client = build_http_client()
+            _client_pid = os.getpid()
+        return _client
+
+
+def set_http_client(client: Optional[httpx.Client]) -> Optional[httpx.Client]:
+    """Swap in ``client`` (e.g. one with a mock transport) and return the previous one."""
+    global _client, _client_pid
+    with _lock:
+        previous = _client
+        _client = client
+        _client_pid = os.getpid() if client is not None else None
+        return previous
+
+
+def close_http_client() -> None:
+    """Close this process's pooled client, if it has one."""
+    global _client, _client_pid
+    with _lock:
+        if _client is not None and _client_pid == os.getpid():
+            _client.close()
+        _client = None
+        _client_pid = None
@@ -0,0 +1,154 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+from collections.abc import Mapping
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.scraper.parser import PRICE_ROW_FIELDS, PriceRow
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout changes; it is folded into the fingerprint.
+CACHE_FORMAT_VERSION = 1
+_HASH_CHUNK_SIZE = 1024 * 1024
+_PARSER_DIR = Path(__file__).parent
+
+
+def hash_file(path: str | Path) -> str:
+    """Return the SHA-256 hex digest of a file without loading it into memory."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parser_fingerprint(map_path: str | Path | None = None) -> str:
+    """
+    Fingerprint the parser code and normalization map.
+
+    Any edit to the parser module or ``map.json`` yields a new fingerprint, so
+    rows cached by an older parser are never served.
+    """
+    digest = hashlib.sha256(f"format:{CACHE_FORMAT_VERSION}".encode())
+    for path in (_PARSER_DIR / "parser.py", Path(map_path) if map_path else _PARSER_DIR / "map.json"):
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+class ParseCache:
+    """
+    Content-addressed cache of parsed price rows.
+
+    Entries live at ``<cache_dir>/<parser fingerprint>/<pdf sha256>.json.gz`` and
+    store rows column-wise (one key list plus value lists) to keep them small.
+    The cache is bounded by ``max_bytes``; entries from stale fingerprints are
+    evicted first, then the least recently used ones.
+    """
+
+    SUFFIX = ".json.gz"
+
+    def __init__(
+        self,
+        cache_dir: str | Path | None = None,
+        max_bytes: int | None = None,
+        map_path: str | Path | None = None,
+    ):
+        self.cache_dir = Path(cache_dir or settings.PARSE_CACHE_DIR)
+        self.max_bytes = settings.PARSE_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.fingerprint = parser_fingerprint(map_path)
+
+    def _entry_path(self, sha256: str) -> Path:
+        return self.cache_dir / self.fingerprint / f"{sha256}{self.SUFFIX}"
+
+    def get(self, pdf_path: str | Path, sha256: Optional[str] = None) -> Optional[List[Mapping[str, Any]]]:
+        """Return cached rows for the PDF, or None on a miss or unreadable entry."""
+        try:
+            entry_path = self._entry_path(sha256 or hash_file(pdf_path))
+            if not entry_path.exists():
+                return None
+            with gzip.open(entry_path, "rt", encoding="utf-8") as f:
+                payload = json.load(f)
+            os.utime(entry_path)  # mtime doubles as the LRU clock
+            return self._decode_rows(payload)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable parse cache entry for {pdf_path}: {e}")
+            return None
+
+    def put(self, pdf_path: str | Path, rows: List[Mapping[str, Any]], sha256: Optional[str] = None) -> Optional[str]:
+        """Store rows for the PDF and return the cache key, or None if the write failed."""
+        try:
+            sha256 = sha256 or hash_file(pdf_path)
+            entry_path = self._entry_path(sha256)
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = entry_path.with_name(f"{entry_path.name}.{os.getpid()}.tmp")
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                json.dump(self._encode_rows(rows), f, separators=(",", ":"))
+            os.replace(tmp_path, entry_path)
+            self.evict()
+            return sha256
+        except OSError as e:
+            logger.warning(f"Failed to write parse cache entry for {pdf_path}: {e}")
+            return None
+
+    def invalidate(self) -> int:
+        """Drop every cached entry regardless of fingerprint. Returns the number removed."""
+        removed = len(self._entries())
+        if self.cache_dir.exists():
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+        return removed
+
+    def evict(self) -> int:
+        """Trim the cache to ``max_bytes``. Returns the number of entries removed."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        # Stale fingerprints sort first, then oldest access time.
+        for path, size, _ in sorted(entries, key=lambda e: (e[0].parent.name == self.fingerprint, e[2])):
+            if total <= self.max_bytes and path.parent.name == self.fingerprint:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def _entries(self) -> list[tuple[Path, int, float]]:
+        entries = []
+        if not self.cache_dir.exists():
+            return entries
+        for path in self.cache_dir.glob(f"*/*{self.SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    @staticmethod
+    def _encode_rows(rows: List[Mapping[str, Any]]) -> Dict[str, Any]:
+        columns = list(rows[0].keys()) if rows else []
+        values = [
+            [value.isoformat() if isinstance(value, date) else value for value in (row.get(c) for c in columns)]
+            for row in rows
+        ]
+        return {"columns": columns, "rows": values}
+
+    @staticmethod
+    def _decode_rows(payload: Dict[str, Any]) -> List[Mapping[str, Any]]:
+        columns = payload["columns"]
+        rows = [dict(zip(columns, values)) for values in payload["rows"]]
+        for row in rows:
+            if isinstance(row.get("report_date"), str):
+                row["report_date"] = date.fromisoformat(row["report_date"])
+        if tuple(columns) == PRICE_ROW_FIELDS:
+            return [PriceRow(**row) for row in rows]
+        return rows
@@ -1,12 +1,23 @@
 import json
 import logging
+import multiprocessing
 import re
-from dataclasses import dataclass
-from datetime import datetime
+import sys
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields
+from datetime import date, datetime
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import pdfplumber
+from pdfplumber.utils import extract_words as extract_words_from_chars
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +33,11 @@ IGNORED_KEYWORDS = (
     "note:",
 )
 
+TABLE_FOOTER_PREFIXES = ("NOTE", "SOURCE:", "DISCLAIMER")
+_FOOTER_INITIALS = frozenset(prefix[0] for prefix in TABLE_FOOTER_PREFIXES)
+_char_top = itemgetter("top")
+_char_x0 = itemgetter("x0")
+
 
 @dataclass(frozen=True)
 class LayoutProfile:
@@ -32,7 +48,169 @@ class LayoutProfile:
     max_price: float
 
 
+@dataclass(frozen=True, slots=True, eq=False)
+class PriceRow(Mapping):
+    """
+    One parsed price cell.
+
+    Slotted to keep large reparses cheap; the read-only mapping interface lets
+    callers keep using ``row["market"]``, ``row.get(...)`` and ``dict(row)``.
+    """
+
+    commodity: str
+    category: Optional[str]
+    unit: str
+    market: str
+    price_low: Optional[float]
+    price_high: Optional[float]
+    price_prevailing: Optional[float]
+    price_average: Optional[float]
+    report_date: Optional[date]
+    report_type: str = "DAILY_RETAIL"
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in PRICE_ROW_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(PRICE_ROW_FIELDS)
+
+    def __len__(self) -> int:
+        return len(PRICE_ROW_FIELDS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in PRICE_ROW_FIELDS}
+
+
+PRICE_ROW_FIELDS = tuple(f.name for f in fields(PriceRow))
+
+
+@dataclass(frozen=True)
+class PageScan:
+    # Page text from the quick character scan, used for date and unit detection.
+    text: str
+    # Word lines for the table region only; empty when the page has no header.
+    lines: List[List[Dict[str, Any]]]
+
+
+@dataclass(frozen=True)
+class PageLayout:
+    col_centers: List[float]
+    col_midpoints: List[float]
+    columns: Dict[int, str]
+    profile: LayoutProfile
+
+
+@dataclass
+class ParseStats:
+    """
+    Counters and per-stage wall time for one parse.
+
+    Stages: ``open`` (PDF open), ``chars`` (pdfminer layout analysis behind
+    ``page.chars``), ``scan`` (line grouping and table location), ``words``
+    (word extraction and grouping), ``layout`` (column detection and token
+    assignment) and ``rows`` (row emission).
+    """
+
+    pages_total: int = 0
+    pages_skipped: int = 0
+    tokens_seen: int = 0
+    rows_emitted: int = 0
+    rows_rejected: int = 0
+    stage_seconds: Dict[str, float] = field(default_factory=dict)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_seconds[name] = self.stage_seconds.get(name, 0.0) + time.perf_counter() - started_at
+
+    def merge(self, other: "ParseStats") -> None:
+        self.pages_total += other.pages_total
+        self.pages_skipped += other.pages_skipped
+        self.tokens_seen += other.tokens_seen
+        self.rows_emitted += other.rows_emitted
+        self.rows_rejected += other.rows_rejected
+        for name, seconds in other.stage_seconds.items():
+            self.stage_seconds[name] = self.stage_seconds.get(name, 0.0) + seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "pages_total": self.pages_total,
+            "pages_skipped": self.pages_skipped,
+            "tokens_seen": self.tokens_seen,
+            "rows_emitted": self.rows_emitted,
+            "rows_rejected": self.rows_rejected,
+            "stage_seconds": {name: round(seconds, 4) for name, seconds in self.stage_seconds.items()},
+        }
+
+
+@dataclass(frozen=True)
+class CommodityVocabulary:
+    """
+    Commodity name normalization and keyword categories from ``map.json``.
+
+    Categories are tried in file order, so earlier ones win ("eggplant" is
+    Eggs). Each distinct header label is resolved once and memoized.
+    """
+
+    normalization_map: Dict[str, str]
+    category_patterns: Tuple[Tuple[str, "re.Pattern[str]"], ...]
+    resolved: Dict[str, Tuple[str, Optional[str]]] = field(default_factory=dict, compare=False)
+
+    @classmethod
+    def from_map(cls, data: Dict[str, Any]) -> "CommodityVocabulary":
+        category_patterns = tuple(
+            (category, re.compile("|".join(re.escape(k.lower()) for k in keywords)))
+            for category, keywords in data.get("categories", {}).items()
+            if keywords
+        )
+        return cls(normalization_map=data.get("commodities", {}), category_patterns=category_patterns)
+
+    def normalize(self, name: str) -> str:
+        if not name:
+            return ""
+        # Remove extra whitespace and newlines
+        name = " ".join(name.split())
+        return self.normalization_map.get(name, name)
+
+    def categorize(self, name: str) -> Optional[str]:
+        name = (name or "").lower()
+        if not name:
+            return None
+        for category, pattern in self.category_patterns:
+            if pattern.search(name):
+                return category
+        return None
+
+    def resolve(self, label: str) -> Tuple[str, Optional[str]]:
+        """Return ``(normalized name, category)`` for a raw header label."""
+        resolved = self.resolved.get(label)
+        if resolved is None:
+            resolved = self.resolved[label] = (self.normalize(label), self.categorize(label))
+        return resolved
+
+
+@lru_cache(maxsize=None)
+def load_vocabulary(map_path: str) -> CommodityVocabulary:
+    # One vocabulary per map file and process, shared by every parser instance.
+    with open(map_path, "r") as f:
+        return CommodityVocabulary.from_map(json.load(f))
+
+
 class PriceParser:
+    # Layouts keyed by header fingerprint, shared by every parser in the process
+    # because DA reports keep the same table geometry for weeks at a time.
+    LAYOUT_CACHE_SIZE = 32
+    LAYOUT_MATCH_TOLERANCE = 30.0
+    # Starting a pool and reopening the PDF in every worker costs more than a
+    # few pages of parsing, so short reports always take the serial path.
+    PROCESS_POOL_MIN_PAGES = 8
+    _layout_cache: "OrderedDict[Tuple[Tuple[str, int], ...], PageLayout]" = OrderedDict()
+
     LAYOUT_PROFILES = [
         LayoutProfile(
             name="retail_range_2025_2026",
@@ -50,20 +228,19 @@ class PriceParser:
         ),
     ]
 
-    def __init__(self, map_path: str = None):
+    def __init__(self, map_path: str = None, workers: int = 1):
         if map_path is None:
             map_path = Path(__file__).parent / "map.json"
 
-        with open(map_path, "r") as f:
-            data = json.load(f)
-            self.normalization_map = data.get("commodities", {})
+        self.map_path = map_path
+        self.workers = workers
+        self.last_page_timings: List[Tuple[int, float]] = []
+        self.last_stats = ParseStats()
+        self.vocabulary = load_vocabulary(str(map_path))
+        self.normalization_map = self.vocabulary.normalization_map
 
     def normalize_commodity(self, name: str) -> str:
-        if not name:
-            return ""
-        # Remove extra whitespace and newlines
-        name = " ".join(name.split())
-        return self.normalization_map.get(name, name)
+        return self.vocabulary.normalize(name)
 
     def is_category_row(self, row: List[Optional[str]]) -> bool:
         """
@@ -75,104 +252,304 @@ class PriceParser:
             return first_col.isupper()
         return False
 
-    def parse_daily_prevailing(self, pdf_path: str) -> List[Dict[str, Any]]:
+    def parse_daily_prevailing(self, pdf_path: str) -> List[PriceRow]:
         """
         Parse Daily Retail Price Range PDFs (deterministic, layout-aware).
         """
         return self.parse_daily_retail_range(pdf_path)
 
-    def parse_daily_retail_range(self, pdf_path: str) -> List[Dict[str, Any]]:
-        results: List[Dict[str, Any]] = []
-
-        with pdfplumber.open(pdf_path) as pdf:
-            report_date = None
-            for i in range(min(2, len(pdf.pages))):
-                text = pdf.pages[i].extract_text()
-                report_date = self.extract_date_from_text(text)
-                if report_date:
-                    break
-
-            for page in pdf.pages:
-                page_text = page.extract_text() or ""
-                unit = self._extract_unit_from_text(page_text) or "kg"
+    def parse_daily_retail_range(self, pdf_path: str, workers: Optional[int] = None) -> List[PriceRow]:
+        """
+        Parse every page of a Daily Retail Price Range PDF into a list of rows.
+
+        When ``workers`` (or the parser default) is greater than one and the
+        report has at least ``PROCESS_POOL_MIN_PAGES`` pages, pages are spread
+        across a process pool and merged back in page order, producing the same
+        rows as the serial path. Daily reports of a few pages parse faster
+        serially, so ``workers`` only helps on large multi-page reports.
+        Per-page wall times are kept on ``last_page_timings`` as
+        ``(page_number, seconds)`` pairs, and stage timings and counters on
+        ``last_stats``.
+        """
+        return list(self.iter_daily_retail_range(pdf_path, workers=workers))
 
-                words = page.extract_words()
-                lines = self._group_words_by_line(words)
+    def iter_daily_retail_range(self, pdf_path: str, workers: Optional[int] = None) -> Iterator[PriceRow]:
+        """Yield parsed rows as each page finishes, in page order."""
+        for _, rows in self.iter_page_batches(pdf_path, workers=workers):
+            yield from rows
 
-                header_idx = self._find_header_line_index(lines)
-                if header_idx is None:
-                    continue
+    def iter_page_batches(
+        self, pdf_path: str, workers: Optional[int] = None
+    ) -> Iterator[Tuple[int, List[PriceRow]]]:
+        """
+        Yield ``(page_number, rows)`` for every page, in page order.
 
-                data_start_idx = self._find_first_data_line_index(lines, header_idx + 1)
-                if data_start_idx is None:
-                    continue
+        The report date is resolved from the first pages before anything is
+        yielded, so every row carries it. Pages are released after parsing to
+        keep memory flat on long reports.
+        """
+        workers = self.workers if workers is None else workers
+        self.last_page_timings = []
+        self.last_stats = stats = ParseStats()
+
+        with stats.stage("open"):
+            pdf = pdfplumber.open(pdf_path)
+        with pdf:
+            # Pages scanned while looking for the report date are reused below,
+            # so every page goes through pdfminer layout analysis only once.
+            page_scans: Dict[int, PageScan] = {}
+            report_date = self._resolve_report_date(pdf.pages, page_scans, stats)
+            page_count = len(pdf.pages)
+            if workers > 1 and page_count >= self.PROCESS_POOL_MIN_PAGES and self._can_use_process_pool():
+                page_results = self._iter_pages_in_pool(pdf_path, page_count, report_date, workers)
+            else:
+                page_results = self._iter_pages_serial(pdf.pages, report_date, page_scans)
+
+            for page_number, rows, elapsed, page_stats in page_results:
+                self.last_page_timings.append((page_number, elapsed))
+                stats.merge(page_stats)
+                logger.debug(
+                    "Parsed PDF page",
+                    extra={
+                        "event": "parser_page_parsed",
+                        "page_number": page_number,
+                        "entries_total": len(rows),
+                        "elapsed_seconds": round(elapsed, 4),
+                    },
+                )
+                yield page_number, rows
+
+    def _iter_pages_serial(
+        self, pages, report_date: Optional[datetime], page_scans: Dict[int, PageScan]
+    ) -> Iterator[Tuple[int, List[PriceRow], float, ParseStats]]:
+        for page_number, page in enumerate(pages, start=1):
+            yield self._timed_parse_page(page, page_number, report_date, page_scans.pop(page_number, None))
+            close = getattr(page, "close", None)
+            if close is not None:
+                close()
+
+    def _resolve_report_date(
+        self, pages, page_scans: Dict[int, PageScan], stats: ParseStats
+    ) -> Optional[datetime]:
+        for i in range(min(2, len(pages))):
+            scan = self._scan_page(pages[i], stats)
+            page_scans[i + 1] = scan
+            report_date = self.extract_date_from_text(scan.text)
+            if report_date:
+                return report_date
+        return None
 
-                header_lines = lines[header_idx:data_start_idx]
-                data_lines = lines[data_start_idx:]
+    def _scan_page(self, page, stats: Optional[ParseStats] = None) -> PageScan:
+        """
+        Locate the table from a quick pass over ``page.chars`` and extract words
+        only from the characters between the header line and any footer notes.
 
-                col_centers = self._derive_column_centers(data_lines)
-                if not col_centers:
-                    continue
+        Pages without a header line never reach word extraction.
+        """
+        stats = stats if stats is not None else ParseStats()
+        with stats.stage("chars"):
+            chars = page.chars
+        with stats.stage("scan"):
+            char_lines = self._group_chars_by_line(chars)
+            header_idx = next(
+                (i for i, line in enumerate(char_lines) if self._is_header_text(self._char_line_text(line).split())),
+                None,
+            )
+            if header_idx is None:
+                return PageScan(text="\n".join(self._char_line_text(line) for line in char_lines), lines=[])
+            end_idx = self._find_footer_char_line(char_lines, header_idx + 1)
+            table_chars = [c for line in char_lines[header_idx:end_idx] for c in line]
+
+        with stats.stage("words"):
+            lines = self._group_words_by_line(extract_words_from_chars(table_chars))
+        # Text around the table comes from the char scan, the table's own text from its words.
+        text = "\n".join(
+            [self._char_line_text(line) for line in char_lines[:header_idx]]
+            + [self._line_text(line) for line in lines]
+            + [self._char_line_text(line) for line in char_lines[end_idx:]]
+        )
+        return PageScan(text=text, lines=lines)
+
+    def _group_chars_by_line(self, chars: List[Dict[str, Any]], y_tolerance: float = 3) -> List[List[Dict[str, Any]]]:
+        chars = sorted(chars, key=_char_top)
+        tops = list(map(_char_top, chars))
+        char_lines: List[List[Dict[str, Any]]] = []
+        start = 0
+        while start < len(chars):
+            # A line holds every char within y_tolerance of its topmost char.
+            end = bisect_right(tops, tops[start] + y_tolerance, start)
+            char_lines.append(chars[start:end])
+            start = end
+        return char_lines
+
+    def _char_line_text(self, line_chars: List[Dict[str, Any]], x_tolerance: float = 3) -> str:
+        """Join a line's chars left to right, splitting words on blanks or gaps wider than x_tolerance."""
+        parts: List[str] = []
+        prev_x1 = None
+        for c in sorted(line_chars, key=_char_x0):
+            if prev_x1 is not None and c["x0"] - prev_x1 > x_tolerance:
+                parts.append(" ")
+            parts.append(c["text"])
+            prev_x1 = c["x1"]
+        return " ".join("".join(parts).split())
+
+    def _find_footer_char_line(self, char_lines: List[List[Dict[str, Any]]], start: int) -> int:
+        # Notes, sources and disclaimers below the table are never table rows.
+        # Only lines whose leftmost char could open a footer are joined into text.
+        for i in range(start, len(char_lines)):
+            first = min(char_lines[i], key=_char_x0)["text"].upper()
+            if first.strip() and first not in _FOOTER_INITIALS:
+                continue
+            if self._char_line_text(char_lines[i]).upper().startswith(TABLE_FOOTER_PREFIXES):
+                return i
+        return len(char_lines)
+
+    def _can_use_process_pool(self) -> bool:
+        # Daemonic processes (e.g. Celery prefork pool children) cannot start
+        # children, so those callers quietly use the serial path; the Celery
+        # worker warns about an ignored PARSER_WORKERS once at startup instead.
+        return not multiprocessing.current_process().daemon
+
+    def _iter_pages_in_pool(
+        self, pdf_path: str, page_count: int, report_date: Optional[datetime], workers: int
+    ) -> Iterator[Tuple[int, List[PriceRow], float, ParseStats]]:
+        jobs = [(str(pdf_path), page_number, report_date) for page_number in range(1, page_count + 1)]
+        with ProcessPoolExecutor(
+            max_workers=min(workers, page_count),
+            initializer=_init_page_worker,
+            initargs=(str(self.map_path),),
+        ) as executor:
+            # executor.map yields in submission order, so rows stay in page order.
+            yield from executor.map(_parse_page_in_worker, jobs)
+
+    def _timed_parse_page(
+        self,
+        page,
+        page_number: int,
+        report_date: Optional[datetime],
+        scan: Optional[PageScan] = None,
+    ) -> Tuple[int, List[PriceRow], float, ParseStats]:
+        stats = ParseStats(pages_total=1)
+        started_at = time.perf_counter()
+        rows = self._parse_page(page, report_date, scan, stats)
+        elapsed = time.perf_counter() - started_at
+        if not rows:
+            stats.pages_skipped = 1
+        stats.rows_emitted = len(rows)
+        return page_number, rows, elapsed, stats
+
+    def _parse_page(
+        self,
+        page,
+        report_date: Optional[datetime],
+        scan: Optional[PageScan] = None,
+        stats: Optional[ParseStats] = None,
+    ) -> List[PriceRow]:
+        results: List[PriceRow] = []
+        stats = stats if stats is not None else ParseStats()
+        if scan is None:
+            scan = self._scan_page(page, stats)
+        lines = scan.lines
+        if not lines:
+            return results
+        stats.tokens_seen += sum(len(line) for line in lines)
+        unit = self._extract_unit_from_text(scan.text) or "kg"
+        row_date = report_date.date() if report_date else None
+
+        with stats.stage("layout"):
+            header_idx = self._find_header_line_index(lines)
+            if header_idx is None:
+                return results
+
+            data_start_idx = self._find_first_data_line_index(lines, header_idx + 1)
+            if data_start_idx is None:
+                return results
+
+            header_lines = lines[header_idx:data_start_idx]
+            data_lines = lines[data_start_idx:]
+
+            layout = self._resolve_layout(header_lines, data_lines)
+            if layout is None:
+                return results
+
+            # Resolve each column label once per page instead of once per cell.
+            commodities = {idx: self.vocabulary.resolve(label) for idx, label in layout.columns.items() if label}
+            market_boundary = layout.col_centers[0] - 40
+            # One batched pass assigns every data token to a column for the whole page.
+            assignments = self._assign_columns(data_lines, layout.col_midpoints, market_boundary)
+
+        with stats.stage("rows"):
+            return self._emit_rows(data_lines, assignments, layout, commodities, unit, row_date, stats)
+
+    def _emit_rows(
+        self,
+        data_lines: List[List[Dict[str, Any]]],
+        assignments: List[List[Optional[int]]],
+        layout: PageLayout,
+        commodities: Dict[int, Tuple[str, Optional[str]]],
+        unit: str,
+        row_date: Optional[date],
+        stats: ParseStats,
+    ) -> List[PriceRow]:
+        results: List[PriceRow] = []
+        profile = layout.profile
+
+        pending_market_name = ""
+        for line, line_columns in zip(data_lines, assignments):
+            line_text = self._line_text(line).strip()
+            if not line_text:
+                continue
 
-                market_boundary = col_centers[0] - 40
-                columns = self._build_column_labels(header_lines, col_centers)
-                profile = self._select_profile(columns)
-                if not self._validate_column_count(columns, profile):
-                    continue
+            value_tokens = [w for w in line if self._is_value_token(w["text"])]
+            if not value_tokens and line_text:
+                pending_market_name = (pending_market_name + " " + line_text).strip()
+                continue
 
+            market_tokens, col_tokens = self._split_line_tokens(line, line_columns, len(layout.col_centers))
+            market_name = " ".join(market_tokens).strip()
+            if pending_market_name:
+                market_name = f"{pending_market_name} {market_name}".strip()
                 pending_market_name = ""
-                for line in data_lines:
-                    line_text = self._line_text(line).strip()
-                    if not line_text:
-                        continue
 
-                    value_tokens = [w for w in line if self._is_value_token(w["text"])]
-                    if not value_tokens and line_text:
-                        pending_market_name = (pending_market_name + " " + line_text).strip()
-                        continue
+            if not market_name:
+                continue
+            # Market names repeat on every page of a report; share one string object.
+            market_name = sys.intern(market_name)
 
-                    market_tokens, col_tokens = self._split_line_tokens(line, col_centers, market_boundary)
-                    market_name = " ".join(market_tokens).strip()
-                    if pending_market_name:
-                        market_name = f"{pending_market_name} {market_name}".strip()
-                        pending_market_name = ""
+            for col_idx, value_words in col_tokens.items():
+                commodity = commodities.get(col_idx)
+                if commodity is None:
+                    continue
 
-                    if not market_name:
-                        continue
+                value_text = " ".join(value_words).strip()
+                if not value_text:
+                    continue
+                if "NOT AVAILABLE" in value_text.upper():
+                    continue
 
-                    for col_idx, value_words in col_tokens.items():
-                        commodity_name = columns.get(col_idx)
-                        if not commodity_name:
-                            continue
-
-                        value_text = " ".join(value_words).strip()
-                        if not value_text:
-                            continue
-                        if "NOT AVAILABLE" in value_text.upper():
-                            continue
-
-                        low, high = self._parse_price_range(value_text)
-                        if not self._validate_price_range(low, high, profile):
-                            continue
-                        if low is None and high is None:
-                            continue
-                        prevailing = self._derive_prevailing(low, high)
-                        category = self._derive_category(commodity_name)
-
-                        results.append(
-                            {
-                                "commodity": self.normalize_commodity(commodity_name),
-                                "category": category,
-                                "unit": unit,
-                                "market": market_name,
-                                "price_low": low,
-                                "price_high": high,
-                                "price_prevailing": prevailing,
-                                "price_average": None,
-                                "report_date": report_date.date() if report_date else None,
-                                "report_type": "DAILY_RETAIL",
-                            }
-                        )
+                low, high = self._parse_price_range(value_text)
+                if low is None and high is None:
+                    # Blank or non-numeric cell: nothing was reported, so nothing is rejected.
+                    continue
+                if not self._validate_price_range(low, high, profile):
+                    stats.rows_rejected += 1
+                    continue
+                prevailing = self._derive_prevailing(low, high)
+                commodity_name, category = commodity
+
+                results.append(
+                    PriceRow(
+                        commodity=commodity_name,
+                        category=category,
+                        unit=unit,
+                        market=market_name,
+                        price_low=low,
+                        price_high=high,
+                        price_prevailing=prevailing,
+                        price_average=None,
+                        report_date=row_date,
+                    )
+                )
 
         return results
 
@@ -208,26 +585,7 @@ class PriceParser:
         return round((low + high) / 2, 2)
 
     def _derive_category(self, commodity_name: str) -> Optional[str]:
-        name = (commodity_name or "").lower()
-        if not name:
-            return None
-        if "rice" in name:
-            return "Rice"
-        if any(k in name for k in ["egg"]):
-            return "Eggs"
-        if any(k in name for k in ["tilapia", "galunggong", "bangus", "sardines", "tamban", "pusit", "squid", "alumahan"]):
-            return "Fish"
-        if any(k in name for k in ["beef", "pork", "chicken", "kasim", "liempo", "ham", "brisket"]):
-            return "Meat"
-        if any(k in name for k in ["banana", "papaya", "mango", "avocado", "melon", "pomelo", "watermelon", "calamansi"]):
-            return "Fruits"
-        if any(k in name for k in ["onion", "garlic", "ginger", "chili", "ampalaya", "sitao", "pechay", "kalabasa", "eggplant", "tomato", "broccoli", "cabbage", "carrot", "potato", "chayote", "cauliflower", "celery", "lettuce", "bell pepper"]):
-            return "Vegetables"
-        if any(k in name for k in ["sugar", "oil"]):
-            return "Staples"
-        if any(k in name for k in ["corn", "mung bean", "mung", "grits"]):
-            return "Grains"
-        return None
+        return self.vocabulary.categorize(commodity_name)
 
     def extract_date_from_text(self, text: str) -> Optional[datetime]:
         if not text:
@@ -276,25 +634,72 @@ class PriceParser:
 
     def _find_header_line_index(self, lines: List[List[Dict[str, Any]]]) -> Optional[int]:
         for i, line in enumerate(lines):
-            texts = [w["text"] for w in line]
-            if not any(t.upper() == "MARKET" for t in texts):
-                continue
-            line_text = " ".join(texts).upper()
-            if "RETAIL PRICE RANGE" in line_text:
-                continue
-            if line_text.startswith("NOTE"):
-                continue
-            if re.search(r"\b\d{4}\b", line_text):
-                continue
-            return i
+            if self._is_header_text([w["text"] for w in line]):
+                return i
         return None
 
+    def _is_header_text(self, texts: List[str]) -> bool:
+        if not any(t.upper() == "MARKET" for t in texts):
+            return False
+        line_text = " ".join(texts).upper()
+        if "RETAIL PRICE RANGE" in line_text:
+            return False
+        if line_text.startswith("NOTE"):
+            return False
+        if re.search(r"\b\d{4}\b", line_text):
+            return False
+        return True
+
     def _find_first_data_line_index(self, lines: List[List[Dict[str, Any]]], start: int) -> Optional[int]:
         for i in range(start, len(lines)):
             if any(self._is_value_token(w["text"]) for w in lines[i]):
                 return i
         return None
 
+    def _resolve_layout(
+        self, header_lines: List[List[Dict[str, Any]]], data_lines: List[List[Dict[str, Any]]]
+    ) -> Optional[PageLayout]:
+        fingerprint = self._layout_fingerprint(header_lines)
+        cached = self._layout_cache.get(fingerprint)
+        if cached is not None and self._layout_matches(cached, data_lines):
+            self._layout_cache.move_to_end(fingerprint)
+            return cached
+
+        col_centers = self._derive_column_centers(data_lines)
+        if not col_centers:
+            return None
+        col_midpoints = self._column_midpoints(col_centers)
+        columns = self._build_column_labels(header_lines, col_midpoints)
+        profile = self._select_profile(columns)
+        if not self._validate_column_count(columns, profile):
+            return None
+
+        layout = PageLayout(
+            col_centers=col_centers,
+            col_midpoints=col_midpoints,
+            columns=columns,
+            profile=profile,
+        )
+        self._layout_cache[fingerprint] = layout
+        self._layout_cache.move_to_end(fingerprint)
+        while len(self._layout_cache) > self.LAYOUT_CACHE_SIZE:
+            self._layout_cache.popitem(last=False)
+        return layout
+
+    def _layout_fingerprint(self, header_lines: List[List[Dict[str, Any]]]) -> Tuple[Tuple[str, int], ...]:
+        return tuple((w["text"], round(w["x0"])) for line in header_lines for w in line)
+
+    def _layout_matches(self, layout: PageLayout, data_lines: List[List[Dict[str, Any]]]) -> bool:
+        # Cheap check on the same sample _derive_column_centers uses: every value
+        # token must sit close to a cached column, otherwise rerun full detection.
+        for line in data_lines[:10]:
+            for w in line:
+                if not self._is_value_token(w["text"]):
+                    continue
+                if min(abs(w["x0"] - c) for c in layout.col_centers) > self.LAYOUT_MATCH_TOLERANCE:
+                    return False
+        return True
+
     def _derive_column_centers(self, data_lines: List[List[Dict[str, Any]]]) -> List[float]:
         xs: List[float] = []
         for line in data_lines[:10]:
@@ -315,17 +720,16 @@ class PriceParser:
         return centers
 
     def _build_column_labels(
-        self, header_lines: List[List[Dict[str, Any]]], col_centers: List[float]
+        self, header_lines: List[List[Dict[str, Any]]], col_midpoints: List[float]
     ) -> Dict[int, str]:
-        labels: Dict[int, List[Tuple[float, float, str]]] = {i: [] for i in range(len(col_centers))}
+        # n columns have n - 1 midpoints between them.
+        labels: Dict[int, List[Tuple[float, float, str]]] = {i: [] for i in range(len(col_midpoints) + 1)}
         for line in header_lines:
             for w in line:
                 text = w["text"]
                 if text.upper() == "MARKET":
                     continue
-                col_idx = self._nearest_column(w["x0"], col_centers)
-                if col_idx is None:
-                    continue
+                col_idx = self._nearest_column(w["x0"], col_midpoints)
                 labels[col_idx].append((w["top"], w["x0"], text))
         final_labels: Dict[int, str] = {}
         for idx, parts in labels.items():
@@ -335,25 +739,33 @@ class PriceParser:
             final_labels[idx] = label or f"Column {idx + 1}"
         return final_labels
 
-    def _nearest_column(self, x0: float, col_centers: List[float]) -> Optional[int]:
-        if not col_centers:
-            return None
-        distances = [abs(x0 - c) for c in col_centers]
-        return distances.index(min(distances))
+    def _nearest_column(self, x0: float, col_midpoints: List[float]) -> int:
+        return bisect_left(col_midpoints, x0)
+
+    def _column_midpoints(self, col_centers: List[float]) -> List[float]:
+        # Centers are sorted, so the nearest center to x is found by bisecting the
+        # midpoints between neighbours; bisect_left keeps ties on the left column.
+        return [(left + right) / 2 for left, right in zip(col_centers, col_centers[1:])]
+
+    def _assign_columns(
+        self, lines: List[List[Dict[str, Any]]], col_midpoints: List[float], market_boundary: float
+    ) -> List[List[Optional[int]]]:
+        """Column index for every word on the page; None marks market-name tokens."""
+        return [
+            [None if w["x0"] < market_boundary else bisect_left(col_midpoints, w["x0"]) for w in line]
+            for line in lines
+        ]
 
     def _split_line_tokens(
-        self, line: List[Dict[str, Any]], col_centers: List[float], market_boundary: float
+        self, line: List[Dict[str, Any]], line_columns: List[Optional[int]], column_count: int
     ) -> Tuple[List[str], Dict[int, List[str]]]:
         market_tokens: List[str] = []
-        col_tokens: Dict[int, List[str]] = {i: [] for i in range(len(col_centers))}
-        for w in line:
-            text = w["text"]
-            if w["x0"] < market_boundary:
-                market_tokens.append(text)
+        col_tokens: Dict[int, List[str]] = {i: [] for i in range(column_count)}
+        for w, col_idx in zip(line, line_columns):
+            if col_idx is None:
+                market_tokens.append(w["text"])
             else:
-                col_idx = self._nearest_column(w["x0"], col_centers)
-                if col_idx is not None:
-                    col_tokens[col_idx].append(text)
+                col_tokens[col_idx].append(w["text"])
         return market_tokens, col_tokens
 
     def _is_value_token(self, text: str) -> bool:
@@ -397,3 +809,37 @@ class PriceParser:
         if low > profile.max_price or high > profile.max_price:
             return False
         return True
+
+
+# Per-process state for parallel page parsing. Each pool worker builds its own
+# parser once and keeps the PDF it is working on open between page jobs.
+_worker_parser: Optional[PriceParser] = None
+_worker_pdf = None
+_worker_pdf_path: Optional[str] = None
+
+
+def _init_page_worker(map_path: str) -> None:
+    global _worker_parser, _worker_pdf, _worker_pdf_path
+    _worker_parser = PriceParser(map_path=map_path)
+    # A forked worker starts without the parent's open PDF, if the parent ever had one.
+    _worker_pdf = None
+    _worker_pdf_path = None
+
+
+def _parse_page_in_worker(
+    job: Tuple[str, int, Optional[datetime]],
+) -> Tuple[int, List[PriceRow], float, ParseStats]:
+    global _worker_pdf, _worker_pdf_path
+    pdf_path, page_number, report_date = job
+    open_seconds = 0.0
+    if _worker_pdf_path != pdf_path:
+        if _worker_pdf is not None:
+            _worker_pdf.close()
+        started_at = time.perf_counter()
+        _worker_pdf = pdfplumber.open(pdf_path)
+        open_seconds = time.perf_counter() - started_at
+        _worker_pdf_path = pdf_path
+    result = _worker_parser._timed_parse_page(_worker_pdf.pages[page_number - 1], page_number, report_date)
+    if open_seconds:
+        result[3].stage_seconds["open"] = result[3].stage_seconds.get("open", 0.0) + open_seconds
+    return result
@@ -0,0 +1,112 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Optional
+
+from app.core.config import settings
+from app.scraper.parse_cache import hash_file
+
+logger = logging.getLogger(__name__)
+
+
+def link_or_copy(source: Path, target: Path) -> None:
+    """Place ``source`` at ``target`` atomically, sharing the inode when the filesystem allows."""
+    tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    tmp_path.unlink(missing_ok=True)
+    try:
+        os.link(source, tmp_path)
+    except OSError:
+        shutil.copyfile(source, tmp_path)
+    os.replace(tmp_path, target)
+
+
+class PDFStore:
+    """
+    Content-addressed store of downloaded report PDFs.
+
+    Each body is kept once at ``<store_dir>/objects/<sha256>.pdf`` however many
+    URLs served it, and ``<store_dir>/urls/<sha256(url)>.json`` maps a URL to
+    the body it last returned. Callers work on hard-linked (or copied) checkouts,
+    so deleting a working copy after a run never loses the stored body. Bodies
+    are bounded by ``max_bytes`` and evicted least recently used first; a URL
+    whose body is gone is simply a miss.
+    """
+
+    def __init__(self, store_dir: str | Path | None = None, max_bytes: int | None = None):
+        self.store_dir = Path(store_dir or settings.PDF_STORE_DIR)
+        self.max_bytes = settings.PDF_STORE_MAX_BYTES if max_bytes is None else max_bytes
+
+    def object_path(self, sha256: str) -> Path:
+        return self.store_dir / "objects" / f"{sha256}.pdf"
+
+    def _index_path(self, url: str) -> Path:
+        return self.store_dir / "urls" / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+    def contains(self, sha256: Optional[str]) -> bool:
+        return bool(sha256) and self.object_path(sha256).exists()
+
+    def lookup(self, url: str) -> Optional[str]:
+        """Return the SHA-256 of the stored body for ``url``, or None if it is not stored."""
+        try:
+            sha256 = json.loads(self._index_path(url).read_text(encoding="utf-8"))["sha256"]
+        except (OSError, ValueError, KeyError):
+            return None
+        return sha256 if self.contains(sha256) else None
+
+    def put(self, path: str | Path, *, sha256: Optional[str] = None, url: Optional[str] = None) -> Optional[str]:
+        """
+        Store the PDF at ``path`` (and map ``url`` to it) and return its SHA-256.
+
+        Returns None if the write failed; the store is an optimisation, so a
+        failure only costs a later download.
+        """
+        try:
+            sha256 = sha256 or hash_file(path)
+            object_path = self.object_path(sha256)
+            if not object_path.exists():
+                object_path.parent.mkdir(parents=True, exist_ok=True)
+                link_or_copy(Path(path), object_path)
+            if url is not None:
+                index_path = self._index_path(url)
+                index_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+                tmp_path.write_text(json.dumps({"url": url, "sha256": sha256}), encoding="utf-8")
+                os.replace(tmp_path, index_path)
+            self.evict()
+            return sha256
+        except OSError as e:
+            logger.warning(f"Failed to store PDF {path} in the PDF store: {e}")
+            return None
+
+    def checkout(self, sha256: str, target_path: str | Path) -> Path:
+        """Place the stored body ``sha256`` at ``target_path``."""
+        object_path = self.object_path(sha256)
+        target_path = Path(target_path)
+        link_or_copy(object_path, target_path)
+        os.utime(object_path)  # mtime doubles as the LRU clock
+        return target_path
+
+    def evict(self) -> int:
+        """Trim stored bodies to ``max_bytes``. Returns the number removed."""
+        objects = []
+        for path in (self.store_dir / "objects").glob("*.pdf"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            objects.append((path, stat.st_size, stat.st_mtime))
+        total = sum(size for _, size, _ in objects)
+        removed = 0
+        for path, size, _ in sorted(objects, key=lambda body: body[2]):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
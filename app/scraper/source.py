@@ -1,30 +1,47 @@
 import logging
 import re
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 import httpx
 from bs4 import BeautifulSoup
 
+from app.core.config import settings
+from app.scraper.http_cache import HTTPValidatorCache
+from app.scraper.http_client import get_http_client
+
 logger = logging.getLogger(__name__)
 
 
 class MonitoringSource:
     BASE_URL = "https://www.da.gov.ph/price-monitoring/"
+    # Injected client; None uses the process-wide pooled one.
+    client: Optional[httpx.Client] = None
+
+    @classmethod
+    def _http_client(cls) -> httpx.Client:
+        return cls.client or get_http_client()
 
     @staticmethod
     def get_latest_pdf_links() -> List[str]:
         """
         Scrapes the DA monitoring page for Daily Retail Price Range PDFs.
         Only returns Price-Monitoring PDFs (not Daily-Price-Index or Cigarette).
+
+        The page is fetched conditionally; when it answers 304 Not Modified the
+        links parsed last time are returned without downloading or parsing it.
         """
+        page_url = MonitoringSource.BASE_URL
         try:
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            }
-            with httpx.Client(follow_redirects=True, timeout=30.0, headers=headers) as client:
-                response = client.get(MonitoringSource.BASE_URL)
-                response.raise_for_status()
+            cache = HTTPValidatorCache() if settings.HTTP_CACHE_ENABLED else None
+            entry = cache.lookup(page_url) if cache else None
+            headers = HTTPValidatorCache.conditional_headers(entry)
+            response = MonitoringSource._http_client().get(page_url, headers=headers)
+            if response.status_code == 304 and entry is not None:
+                cache.record_hit(page_url)
+                logger.info(f"Monitoring page not modified; reusing {len(entry['payload'])} cached PDF links")
+                return list(entry["payload"])
+            response.raise_for_status()
 
             soup = BeautifulSoup(response.text, "html.parser")
             links = soup.find_all("a", href=re.compile(r"\.pdf$", re.IGNORECASE))
@@ -42,6 +59,9 @@ class MonitoringSource:
                         logger.info(f"Found PDF: {url}")
 
             logger.info(f"Total PDFs found: {len(pdf_urls)}")
+            if cache:
+                cache.record_miss(page_url)
+                cache.store(page_url, response.headers, payload=pdf_urls)
             return pdf_urls
         except Exception as e:
             logger.error(f"Failed to scrape monitoring page: {e}")
@@ -1,14 +1,22 @@
 import logging
 import os
 import time
+from contextlib import contextmanager
 from datetime import date, datetime
+from pathlib import Path
 from statistics import median
 
+from celery import chain
+from celery.concurrency import get_implementation
+from celery.signals import worker_init, worker_process_shutdown, worker_shutdown
+
 from app.core.celery_app import celery_app
 from app.core.config import settings
 from app.core.exceptions import PDFDownloadError, PDFParseError
 from app.db.session import SessionLocal
 from app.scraper.downloader import PDFDownloader
+from app.scraper.http_client import close_http_client
+from app.scraper.parse_cache import ParseCache, hash_file
 from app.scraper.parser import PriceParser
 from app.services.commodity_service import CommodityService
 from app.services.ingestion_run_service import IngestionRunService
@@ -17,6 +25,35 @@ from app.services.price_service import PriceService
 
 logger = logging.getLogger(__name__)
 
+# Per-run performance figures carried on the job and stored on its ingestion run.
+_PERFORMANCE_FIELDS = (
+    "download_seconds",
+    "parse_seconds",
+    "load_seconds",
+    "rows_per_second",
+    "peak_rss_bytes",
+    "pdf_bytes",
+)
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _close_pooled_http_client(**kwargs) -> None:
+    """Close keep-alive connections when a worker (or pool child) shuts down."""
+    close_http_client()
+
+
+@worker_init.connect
+def _warn_ignored_parser_workers(sender=None, **kwargs) -> None:
+    """Prefork pool children are daemonic and cannot start a page pool, so say once that PARSER_WORKERS is unused."""
+    if settings.PARSER_WORKERS <= 1 or sender is None:
+        return
+    if get_implementation(sender.pool_cls).__module__ == "celery.concurrency.prefork":
+        logger.warning(
+            f"PARSER_WORKERS={settings.PARSER_WORKERS} has no effect on prefork Celery workers; "
+            "reports are parsed serially. It applies to the backfill script and solo workers."
+        )
+
 
 def _normalize_report_date(value):
     if value is None:
@@ -37,6 +74,19 @@ def _normalize_name(value: str | None, default: str = "Unknown") -> str:
     return " ".join((value or default).split())
 
 
+def _record_entry_error(task_id, url, source_file, entry, error, errors) -> None:
+    errors.append({"commodity": entry.get("commodity", "Unknown"), "error": str(error)})
+    logger.warning(
+        "Failed to process scraped entry",
+        extra={
+            "event": "scrape_entry_failed",
+            "task_id": task_id,
+            "source_url": url,
+            "source_file": source_file,
+        },
+    )
+
+
 def _build_anomaly_flags(db, parsed_results, report_date):
     anomaly_flags: list[str] = []
 
@@ -47,7 +97,7 @@ def _build_anomaly_flags(db, parsed_results, report_date):
     duplicate_count = 0
     for entry in parsed_results:
         identity = (
-            _normalize_name(entry.get("_normalized_name") or entry.get("commodity")).lower(),
+            _normalize_name(entry.get("commodity")).lower(),
             _normalize_name(entry.get("market"), settings.DEFAULT_MARKET_NAME).lower(),
             str(_normalize_report_date(entry.get("report_date"))),
             entry.get("report_type", "DAILY_RETAIL"),
@@ -81,149 +131,366 @@ def _build_anomaly_flags(db, parsed_results, report_date):
     return anomaly_flags
 
 
-@celery_app.task(
-    name="app.scraper.tasks.scrape_daily_prices",
-    bind=True,
-    autoretry_for=(PDFDownloadError, ConnectionError),
-    retry_backoff=True,
-    retry_backoff_max=600,  # Max 10 minutes between retries
-    retry_kwargs={"max_retries": 3},
-    acks_late=True,  # Acknowledge after task completes
-)
-def scrape_daily_prices(self, url: str):
-    """
-    Scrape daily prices from a PDF URL.
-
-    Features:
-    - Automatic retry on download failures (up to 3 times with exponential backoff)
-    - Proper cleanup of downloaded files
-    - Detailed logging for debugging
-    """
-    downloader = PDFDownloader()
-    parser = PriceParser()
+def _start_job(task_id: str, url: str, source_file: str | None = None) -> dict:
+    """
+    Claim the ingestion run for a report and return the job passed between stages.
+
+    When another worker already holds the source file the job comes back
+    ``skipped`` and every later stage passes it through untouched.
+    """
+    source_file = source_file or url.split("/")[-1]
     db = SessionLocal()
-    pdf_path = None
-    entries_processed = 0
-    entries_inserted = 0
-    entries_updated = 0
-    entries_skipped = 0
-    run = IngestionRunService.start_run(
-        db,
-        task_name="scrape_daily_prices",
-        task_id=self.request.id,
-        source_url=url,
-        source_file=url.split("/")[-1],
-    )
-    report_date = None
+    try:
+        run, claimed = IngestionRunService.claim_run(
+            db,
+            task_name="scrape_daily_prices",
+            task_id=task_id,
+            source_url=url,
+            source_file=source_file,
+        )
+        job = {"run_id": str(run.id), "task_id": task_id, "url": url, "started_at": time.time()}
+        if not claimed:
+            job["status"] = "skipped"
+            logger.info(
+                "Source file is already being scraped; skipping",
+                extra={
+                    "event": "scrape_skipped_in_flight",
+                    "task_id": task_id,
+                    "task_name": "scrape_daily_prices",
+                    "source_url": url,
+                    "source_file": source_file,
+                    "status": "skipped",
+                },
+            )
+        return job
+    finally:
+        db.close()
+
+
+def _reset_peak_rss() -> None:
+    """
+    Restart the kernel's resident set high-water mark (VmHWM) for this process.
+
+    getrusage's ru_maxrss never goes down, so on a long-lived worker it would
+    report the largest report the process ever handled rather than this one.
+    Linux lets a process reset its own mark through /proc/self/clear_refs.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+    except OSError:
+        pass
+
+
+def _record_peak_rss(job: dict) -> None:
+    """Keep the highest resident set size reached by any stage of this job since its stage started."""
+    try:
+        with open("/proc/self/status") as status:
+            peak = next(int(line.split()[1]) * 1024 for line in status if line.startswith("VmHWM:"))
+    except (OSError, StopIteration, ValueError):
+        # No procfs (macOS, Windows); a lifetime peak would be misleading, so record nothing.
+        return
+    job["peak_rss_bytes"] = max(job.get("peak_rss_bytes") or 0, peak)
+
+
+@contextmanager
+def _timed_stage(job: dict, stage: str):
+    _reset_peak_rss()
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        job[f"{stage}_seconds"] = round(time.perf_counter() - started_at, 6)
+        _record_peak_rss(job)
+
+
+def _performance_metrics(job: dict) -> dict:
+    return {field: job.get(field) for field in _PERFORMANCE_FIELDS}
 
+
+def _source_file(job: dict) -> str:
+    return Path(job["pdf_path"]).name if job.get("pdf_path") else job["url"].split("/")[-1]
+
+
+def _remove_pdf(job: dict) -> None:
+    if job.get("keep_pdf"):
+        return
+    pdf_path = Path(job["pdf_path"]) if job.get("pdf_path") else None
+    if pdf_path and pdf_path.exists():
+        os.remove(pdf_path)
+        logger.info(
+            "Cleaned up downloaded PDF",
+            extra={
+                "event": "scrape_cleanup_completed",
+                "task_id": job["task_id"],
+                "source_file": pdf_path.name,
+            },
+        )
+
+
+def _failure_log_extra(job: dict, event: str) -> dict:
+    return {
+        "event": event,
+        "task_id": job["task_id"],
+        "task_name": "scrape_daily_prices",
+        "source_url": job["url"],
+        "source_file": _source_file(job),
+        "report_date": job.get("report_date"),
+        "status": "failed",
+        "entries_processed": job.get("totals", {}).get("processed", 0),
+        "error_count": 1,
+    }
+
+
+def _fail_run(job: dict, error_message: str) -> None:
+    totals = job.get("totals", {})
+    db = SessionLocal()
     try:
-        started_at = time.monotonic()
+        run = IngestionRunService.get_run(db, job["run_id"])
+        if run is not None:
+            IngestionRunService.finish_run(
+                db,
+                run,
+                status="failed",
+                report_date=job.get("report_date"),
+                entries_total=totals.get("processed", 0),
+                entries_processed=totals.get("processed", 0),
+                entries_inserted=totals.get("inserted", 0),
+                entries_updated=totals.get("updated", 0),
+                entries_skipped=totals.get("skipped", 0),
+                error_count=1,
+                anomaly_count=0,
+                anomaly_flags=[],
+                parse_stats=job.get("parse_stats"),
+                error_message=error_message,
+                **_performance_metrics(job),
+            )
+    finally:
+        db.close()
+    # Clean up on failure
+    _remove_pdf(job)
+
+
+@contextmanager
+def _stage_failures(job: dict):
+    """Mark the run failed and drop the PDF when a stage raises, then re-raise for Celery."""
+    try:
+        yield
+    except (PDFDownloadError, PDFParseError) as e:
+        logger.error("Scraping failed and will be retried", extra=_failure_log_extra(job, "scrape_failed_retryable"))
+        _fail_run(job, e.message)
+        raise  # Let Celery handle retry
+    except Exception as e:
+        logger.exception("Unexpected error during scraping", extra=_failure_log_extra(job, "scrape_failed_unexpected"))
+        _fail_run(job, str(e))
+        raise
+
+
+def _download_report(job: dict, pdf_path: str | None = None, prefer_stored: bool = False) -> dict:
+    """
+    Download stage: fetch the PDF to the shared download directory.
+
+    ``pdf_path`` is a copy already fetched by a ``download_many`` prefetch; it
+    is adopted as-is, and the report is downloaded normally if it has gone.
+    ``prefer_stored`` reuses a copy from the PDF store without revalidating it.
+    """
+    if job.get("status") == "skipped":
+        return job
+    with _stage_failures(job):
         logger.info(
             "Starting daily scrape",
             extra={
                 "event": "scrape_started",
-                "task_id": self.request.id,
+                "task_id": job["task_id"],
                 "task_name": "scrape_daily_prices",
-                "source_url": url,
-                "source_file": url.split("/")[-1],
+                "source_url": job["url"],
+                "source_file": job["url"].split("/")[-1],
             },
         )
-
-        # Download PDF with error handling
-        try:
-            pdf_path = downloader.download_pdf_sync(url)
+        try:
+            with _timed_stage(job, "download"):
+                if pdf_path and Path(pdf_path).is_file():
+                    job["pdf_path"] = pdf_path
+                    return job
+                downloader = PDFDownloader()
+                job["pdf_path"] = str(downloader.download_pdf_sync(job["url"], prefer_stored=prefer_stored))
+                # Hashed while streaming, so the parse stage can skip re-reading the file.
+                job["sha256"] = downloader.last_sha256
         except Exception as e:
-            raise PDFDownloadError(url=url, reason=str(e))
-
-        # Parse PDF deterministically
+            raise PDFDownloadError(url=job["url"], reason=str(e))
+    return job
+
+
+def _parse_report(job: dict, handoff: bool = False) -> tuple[dict, list | None]:
+    """
+    Parse stage: turn the downloaded PDF into price rows.
+
+    With ``handoff`` the rows are staged in the parse cache and only their key
+    travels on to the load stage, so they never pass through the broker.
+    """
+    if job.get("status") == "skipped":
+        return job, None
+    with _stage_failures(job):
+        pdf_path = Path(job["pdf_path"])
+        parse_cache = ParseCache() if settings.PARSE_CACHE_ENABLED or handoff else None
+        # Parse PDF deterministically, reusing cached rows for byte-identical files
         try:
-            parsed_results = parser.parse_daily_prevailing(str(pdf_path))
+            with _timed_stage(job, "parse"):
+                job["pdf_bytes"] = pdf_path.stat().st_size
+                sha256 = (job.get("sha256") or hash_file(pdf_path)) if parse_cache else None
+                parsed_results = parse_cache.get(pdf_path, sha256=sha256) if settings.PARSE_CACHE_ENABLED else None
+                job["parse_cache_hit"] = parsed_results is not None
+                if parsed_results is None:
+                    parser = PriceParser(workers=settings.PARSER_WORKERS)
+                    parsed_results = parser.parse_daily_prevailing(str(pdf_path))
+                    job["parse_stats"] = parser.last_stats.to_dict()
+                    if parse_cache and parse_cache.put(pdf_path, parsed_results, sha256=sha256) is None and handoff:
+                        raise OSError("parsed rows could not be staged for the load stage")
         except Exception as e:
-            raise PDFParseError(filename=pdf_path.name if pdf_path else url, reason=str(e))
-
+            raise PDFParseError(filename=pdf_path.name, reason=str(e))
+
+        job["parse_key"] = sha256
         if not parsed_results:
+            job["status"] = "empty"
             logger.warning(
                 "No data extracted from source PDF",
                 extra={
                     "event": "scrape_empty",
-                    "task_id": self.request.id,
-                    "source_url": url,
-                    "source_file": pdf_path.name if pdf_path else url.split("/")[-1],
+                    "task_id": job["task_id"],
+                    "source_url": job["url"],
+                    "source_file": pdf_path.name,
+                    "parse_stats": job.get("parse_stats"),
                 },
             )
-            IngestionRunService.finish_run(
-                db,
-                run,
-                status="empty",
-                entries_total=0,
-                entries_processed=0,
-                error_count=0,
-            )
-            return {"status": "empty", "url": url, "entries": 0}
+            db = SessionLocal()
+            try:
+                IngestionRunService.finish_run(
+                    db,
+                    IngestionRunService.get_run(db, job["run_id"]),
+                    status="empty",
+                    entries_total=0,
+                    entries_processed=0,
+                    error_count=0,
+                    parse_stats=job.get("parse_stats"),
+                    **_performance_metrics(job),
+                )
+            finally:
+                db.close()
+        # The rows are all later stages need, so the PDF can go now.
+        _remove_pdf(job)
+    return job, parsed_results
 
-        report_date = _normalize_report_date(parsed_results[0].get("report_date"))
-        anomaly_flags = _build_anomaly_flags(db, parsed_results, report_date)
 
-        # Pre-process entries to normalize names and identify unique commodities
-        unique_commodity_names = set()
-        name_to_sample_entry = {}
-
-        for entry in parsed_results:
-            raw_name = entry.get("commodity", "Unknown")
-            normalized_name = parser.normalization_map.get(raw_name, raw_name)
-            entry["_normalized_name"] = normalized_name
-            unique_commodity_names.add(normalized_name)
-            if normalized_name not in name_to_sample_entry:
-                name_to_sample_entry[normalized_name] = entry
-
-        # Bulk fetch existing commodities
-        existing_commodities = CommodityService.get_by_names(db, list(unique_commodity_names))
-        commodity_map = {c.name: c for c in existing_commodities}
-        # Create missing commodities
-        for name in unique_commodity_names:
-            if name not in commodity_map:
-                try:
-                    sample = name_to_sample_entry[name]
-                    new_commodity = CommodityService.get_or_create(
-                        db,
-                        name=name,
-                        category=sample.get("category"),
-                        unit=sample.get("unit"),
-                    )
-                    commodity_map[name] = new_commodity
-                except Exception:
-                    logger.error(
-                        "Failed to create commodity during scrape",
-                        extra={
-                            "event": "commodity_create_failed",
-                            "task_id": self.request.id,
-                            "source_url": url,
-                        },
-                    )
-
-        # Process each entry with individual error handling
-        errors = []
-        for entry in parsed_results:
-            try:
-                raw_name = entry.get("commodity", "Unknown")
-                normalized_name = entry.get("_normalized_name")
+def _load_report(job: dict, parsed_results: list | None = None) -> dict:
+    """Load stage: resolve dimensions, diff against stored rows and write the delta."""
+    url = job["url"]
+    if job.get("status") in ("empty", "skipped"):
+        return {"status": job["status"], "url": url, "entries": 0}
+
+    with _stage_failures(job):
+        if parsed_results is None:
+            parsed_results = ParseCache().get(job["pdf_path"], sha256=job["parse_key"])
+            if parsed_results is None:
+                raise PDFParseError(filename=_source_file(job), reason="staged rows are no longer in the parse cache")
+
+        db = SessionLocal()
+        try:
+            return _write_report(db, job, parsed_results)
+        finally:
+            db.close()
 
-                commodity = commodity_map.get(normalized_name)
-                if not commodity:
-                    raise ValueError(f"Commodity {normalized_name} unavailable")
 
-                # Use configurable default market from settings
-                market_name = entry.get("market", settings.DEFAULT_MARKET_NAME)
-                market = MarketService.get_by_name(db, market_name)
-                if market is None:
-                    market = MarketService.get_or_create(db, name=market_name)
+def _write_report(db, job: dict, parsed_results: list) -> dict:
+    _reset_peak_rss()
+    load_started_at = time.perf_counter()
+    url = job["url"]
+    task_id = job["task_id"]
+    parser = PriceParser()
+    totals = {"processed": 0, "inserted": 0, "updated": 0, "skipped": 0}
+    report_date = job["report_date"] = _normalize_report_date(parsed_results[0].get("report_date"))
+    anomaly_flags = _build_anomaly_flags(db, parsed_results, report_date)
 
-                report_date = _normalize_report_date(entry.get("report_date"))
-                if report_date is None:
-                    raise ValueError("Invalid report_date (expected ISO date or date object)")
+    # Pre-process entries to normalize names and identify unique commodities.
+    # Parsed rows are read-only, so normalized names are kept alongside them.
+    normalized_names = {}
+    name_to_sample_entry = {}
+
+    for entry in parsed_results:
+        raw_name = entry.get("commodity", "Unknown")
+        if raw_name in normalized_names:
+            continue
+        normalized_name = parser.normalization_map.get(raw_name, raw_name)
+        normalized_names[raw_name] = normalized_name
+        if normalized_name not in name_to_sample_entry:
+            name_to_sample_entry[normalized_name] = entry
+    unique_commodity_names = set(normalized_names.values())
 
-                _, action = PriceService.upsert_entry(
+    # Bulk fetch existing commodities
+    existing_commodities = CommodityService.get_by_names(db, list(unique_commodity_names))
+    commodity_map = {c.name: c for c in existing_commodities}
+    # Create missing commodities
+    for name in unique_commodity_names:
+        if name not in commodity_map:
+            try:
+                sample = name_to_sample_entry[name]
+                new_commodity = CommodityService.get_or_create(
                     db,
+                    name=name,
+                    category=sample.get("category"),
+                    unit=sample.get("unit"),
+                )
+                commodity_map[name] = new_commodity
+            except Exception:
+                logger.error(
+                    "Failed to create commodity during scrape",
+                    extra={
+                        "event": "commodity_create_failed",
+                        "task_id": task_id,
+                        "source_url": url,
+                    },
+                )
+
+    # Resolve every distinct market up front instead of once per row
+    market_names = {entry.get("market", settings.DEFAULT_MARKET_NAME) for entry in parsed_results}
+    try:
+        market_map = MarketService.get_or_create_many(db, market_names)
+    except Exception:
+        db.rollback()
+        market_map = {}
+        logger.error(
+            "Failed to resolve markets during scrape",
+            extra={
+                "event": "market_create_failed",
+                "task_id": task_id,
+                "source_url": url,
+            },
+        )
+
+    # Resolve each entry to a price row, keeping per-entry error handling
+    errors = []
+    source_file = _source_file(job)
+    pending_rows = []
+    for entry in parsed_results:
+        try:
+            normalized_name = normalized_names[entry.get("commodity", "Unknown")]
+
+            commodity = commodity_map.get(normalized_name)
+            if not commodity:
+                raise ValueError(f"Commodity {normalized_name} unavailable")
+
+            # Use configurable default market from settings
+            market_name = entry.get("market", settings.DEFAULT_MARKET_NAME)
+            market = market_map.get(market_name)
+            if market is None:
+                raise ValueError(f"Market {market_name} unavailable")
+
+            report_date = _normalize_report_date(entry.get("report_date"))
+            if report_date is None:
+                raise ValueError("Invalid report_date (expected ISO date or date object)")
+
+            pending_rows.append(
+                (
+                    entry,
                     {
                         "commodity_id": commodity.id,
                         "market_id": market.id,
@@ -232,171 +499,226 @@ def scrape_daily_prices(self, url: str):
                         "price_high": entry.get("price_high"),
                         "price_prevailing": entry.get("price_prevailing"),
                         "price_average": entry.get("price_average"),
-                        "report_type": entry.get("report_type", "DAILY_RETAIL"),
-                        "source_file": pdf_path.name if pdf_path else url.split("/")[-1],
+                        "report_type": entry.get("report_type", "DAILY_RETAIL"),
+                        "source_file": source_file,
                     },
                 )
-                entries_processed += 1
-                if action == "inserted":
-                    entries_inserted += 1
-                elif action == "updated":
-                    entries_updated += 1
-                else:
-                    entries_skipped += 1
-
-            except Exception as entry_error:
-                entry_name = entry.get("commodity", "Unknown")
-                errors.append({"commodity": entry_name, "error": str(entry_error)})
-                logger.warning(
-                    "Failed to process scraped entry",
-                    extra={
-                        "event": "scrape_entry_failed",
-                        "task_id": self.request.id,
-                        "source_url": url,
-                        "source_file": pdf_path.name if pdf_path else url.split("/")[-1],
-                    },
-                )
-                continue  # Continue processing other entries
-        anomaly_flags = list(dict.fromkeys(anomaly_flags))
+            )
+        except Exception as entry_error:
+            _record_entry_error(task_id, url, source_file, entry, entry_error, errors)
 
-        logger.info(
-            "Daily scrape completed",
+    # Diff against the stored report once so unchanged rows are never written
+    try:
+        changed_indices, unchanged = PriceService.diff_report_entries(db, [row for _, row in pending_rows])
+        totals["processed"] += unchanged
+        totals["skipped"] += unchanged
+        pending_rows = [pending_rows[index] for index in changed_indices]
+    except Exception:
+        db.rollback()
+        logger.warning(
+            "Report diff failed; writing every row",
             extra={
-                "event": "scrape_completed",
-                "task_id": self.request.id,
-                "task_name": "scrape_daily_prices",
+                "event": "scrape_diff_failed",
+                "task_id": task_id,
                 "source_url": url,
-                "source_file": pdf_path.name if pdf_path else url.split("/")[-1],
-                "report_date": report_date,
-                "status": "success" if not errors else "partial_success",
-                "entries_total": len(parsed_results),
-                "entries_processed": entries_processed,
-                "entries_inserted": entries_inserted,
-                "entries_updated": entries_updated,
-                "entries_skipped": entries_skipped,
-                "error_count": len(errors),
-                "anomaly_count": len(anomaly_flags),
-                "anomaly_flags": anomaly_flags,
-                "elapsed_seconds": round(time.monotonic() - started_at, 3),
+                "source_file": source_file,
             },
         )
 
-        if errors:
+    # Write the report in one transaction: each chunk runs in a savepoint, and
+    # a failing chunk is retried row by row in savepoints of their own so one
+    # bad entry only costs its own row. The COPY loader stages the whole delta
+    # at once.
+    loader = settings.INGESTION_LOADER
+    chunk_size = len(pending_rows) if loader == "copy" else settings.INGESTION_UPSERT_CHUNK_SIZE
+    chunk_size = max(1, chunk_size)
+    for offset in range(0, len(pending_rows), chunk_size):
+        chunk = pending_rows[offset : offset + chunk_size]
+        try:
+            with db.begin_nested():
+                counts = PriceService.bulk_upsert_entries(db, [row for _, row in chunk], loader=loader, commit=False)
+        except Exception:
             logger.warning(
-                "Scrape completed with entry-level errors",
+                "Bulk upsert failed; retrying chunk row by row",
                 extra={
-                    "event": "scrape_completed_with_errors",
-                    "task_id": self.request.id,
+                    "event": "scrape_bulk_upsert_fallback",
+                    "task_id": task_id,
                     "source_url": url,
-                    "error_count": len(errors),
+                    "source_file": source_file,
+                    "entries_total": len(chunk),
                 },
             )
-
-        IngestionRunService.finish_run(
-            db,
-            run,
-            status="success" if not errors else "partial_success",
-            report_date=report_date,
-            entries_total=len(parsed_results),
-            entries_processed=entries_processed,
-            entries_inserted=entries_inserted,
-            entries_updated=entries_updated,
-            entries_skipped=entries_skipped,
-            error_count=len(errors),
-            anomaly_count=len(anomaly_flags),
-            anomaly_flags=anomaly_flags,
-            error_message=None if not errors else f"{len(errors)} entries failed during processing",
-        )
+            counts = {"inserted": 0, "updated": 0, "skipped": 0}
+            for entry, row in chunk:
+                try:
+                    with db.begin_nested():
+                        _, action = PriceService.upsert_entry(db, row, commit=False)
+                    counts[action] += 1
+                except Exception as entry_error:
+                    _record_entry_error(task_id, url, source_file, entry, entry_error, errors)
+        totals["processed"] += sum(counts.values())
+        for action, count in counts.items():
+            totals[action] += count
 
-        # Clean up downloaded file
-        if pdf_path and pdf_path.exists():
-            os.remove(pdf_path)
-            logger.info(
-                "Cleaned up downloaded PDF",
-                extra={
-                    "event": "scrape_cleanup_completed",
-                    "task_id": self.request.id,
-                    "source_file": pdf_path.name,
-                },
-            )
-
-        return {
-            "status": "success",
-            "url": url,
-            "entries_processed": entries_processed,
-            "entries_total": len(parsed_results),
-            "errors": len(errors),
-        }
-
-    except (PDFDownloadError, PDFParseError) as e:
-        logger.error(
-            "Scraping failed and will be retried",
-            extra={
-                "event": "scrape_failed_retryable",
-                "task_id": self.request.id,
-                "task_name": "scrape_daily_prices",
-                "source_url": url,
-                "source_file": pdf_path.name if pdf_path else url.split("/")[-1],
-                "report_date": report_date,
-                "status": "failed",
-                "entries_processed": entries_processed,
-                "error_count": 1,
-            },
-        )
-        IngestionRunService.finish_run(
-            db,
-            run,
-            status="failed",
-            report_date=report_date,
-            entries_total=entries_processed,
-            entries_processed=entries_processed,
-            entries_inserted=entries_inserted,
-            entries_updated=entries_updated,
-            entries_skipped=entries_skipped,
-            error_count=1,
-            anomaly_count=0,
-            anomaly_flags=[],
-            error_message=e.message,
-        )
-        # Clean up on failure
-        if pdf_path and pdf_path.exists():
-            os.remove(pdf_path)
-        raise  # Let Celery handle retry
+    commit_started_at = time.perf_counter()
+    db.commit()
+    commit_seconds = round(time.perf_counter() - commit_started_at, 6)
+    job["load_seconds"] = round(time.perf_counter() - load_started_at, 6)
+    _record_peak_rss(job)
+    # Throughput over the time spent in stages, leaving out any wait in the broker between them.
+    stage_seconds = sum(job.get(f"{stage}_seconds") or 0 for stage in ("download", "parse", "load"))
+    job["rows_per_second"] = round(len(parsed_results) / stage_seconds, 1) if stage_seconds else None
+    # Counters only describe the run once the rows are durable.
+    job["totals"] = totals
+    anomaly_flags = list(dict.fromkeys(anomaly_flags))
 
-    except Exception as e:
-        logger.exception(
-            "Unexpected error during scraping",
+    logger.info(
+        "Daily scrape completed",
+        extra={
+            "event": "scrape_completed",
+            "task_id": task_id,
+            "task_name": "scrape_daily_prices",
+            "source_url": url,
+            "source_file": source_file,
+            "report_date": report_date,
+            "status": "success" if not errors else "partial_success",
+            "entries_total": len(parsed_results),
+            "entries_processed": totals["processed"],
+            "entries_inserted": totals["inserted"],
+            "entries_updated": totals["updated"],
+            "entries_skipped": totals["skipped"],
+            "error_count": len(errors),
+            "anomaly_count": len(anomaly_flags),
+            "anomaly_flags": anomaly_flags,
+            "parse_cache_hit": job.get("parse_cache_hit", False),
+            "parse_stats": job.get("parse_stats"),
+            "commit_seconds": commit_seconds,
+            **_performance_metrics(job),
+            "elapsed_seconds": round(time.time() - job["started_at"], 3),
+        },
+    )
+
+    if errors:
+        logger.warning(
+            "Scrape completed with entry-level errors",
             extra={
-                "event": "scrape_failed_unexpected",
-                "task_id": self.request.id,
-                "task_name": "scrape_daily_prices",
+                "event": "scrape_completed_with_errors",
+                "task_id": task_id,
                 "source_url": url,
-                "source_file": pdf_path.name if pdf_path else url.split("/")[-1],
-                "report_date": report_date,
-                "status": "failed",
-                "entries_processed": entries_processed,
-                "error_count": 1,
+                "error_count": len(errors),
             },
         )
-        IngestionRunService.finish_run(
-            db,
-            run,
-            status="failed",
-            report_date=report_date,
-            entries_total=entries_processed,
-            entries_processed=entries_processed,
-            entries_inserted=entries_inserted,
-            entries_updated=entries_updated,
-            entries_skipped=entries_skipped,
-            error_count=1,
-            anomaly_count=0,
-            anomaly_flags=[],
-            error_message=str(e),
-        )
-        # Clean up on failure
-        if pdf_path and pdf_path.exists():
-            os.remove(pdf_path)
-        raise
+
+    IngestionRunService.finish_run(
+        db,
+        IngestionRunService.get_run(db, job["run_id"]),
+        status="success" if not errors else "partial_success",
+        report_date=report_date,
+        entries_total=len(parsed_results),
+        entries_processed=totals["processed"],
+        entries_inserted=totals["inserted"],
+        entries_updated=totals["updated"],
+        entries_skipped=totals["skipped"],
+        error_count=len(errors),
+        anomaly_count=len(anomaly_flags),
+        anomaly_flags=anomaly_flags,
+        parse_stats=job.get("parse_stats"),
+        commit_seconds=commit_seconds,
+        error_message=None if not errors else f"{len(errors)} entries failed during processing",
+        **_performance_metrics(job),
+    )
+
+    return {
+        "status": "success",
+        "url": url,
+        "entries_processed": totals["processed"],
+        "entries_total": len(parsed_results),
+        "errors": len(errors),
+    }
+
+
+@celery_app.task(
+    name="app.scraper.tasks.scrape_daily_prices",
+    bind=True,
+    autoretry_for=(PDFDownloadError, ConnectionError),
+    retry_backoff=True,
+    retry_backoff_max=600,  # Max 10 minutes between retries
+    retry_kwargs={"max_retries": 3},
+    acks_late=True,  # Acknowledge after task completes
+)
+def scrape_daily_prices(self, url: str, pdf_path: str | None = None, prefer_stored: bool = False):
+    """
+    Scrape daily prices from a PDF URL, running every stage in this worker.
+
+    Features:
+    - Automatic retry on download failures (up to 3 times with exponential backoff)
+    - Proper cleanup of downloaded files
+    - Detailed logging for debugging
+
+    Scheduled scrapes use ``scrape_pipeline`` instead, which runs the same
+    stages as separate tasks on the io, cpu and db queues. Backfills pass
+    ``prefer_stored`` to re-ingest archived reports without a request.
+    """
+    job = _download_report(_start_job(self.request.id, url), pdf_path, prefer_stored)
+    job, parsed_results = _parse_report(job)
+    return _load_report(job, parsed_results)
+
+
+@celery_app.task(
+    name="app.scraper.tasks.download_report",
+    bind=True,
+    autoretry_for=(PDFDownloadError, ConnectionError),
+    retry_backoff=True,
+    retry_backoff_max=600,
+    retry_kwargs={"max_retries": 3},
+    acks_late=True,
+)
+def download_report(self, url: str, pdf_path: str | None = None, prefer_stored: bool = False) -> dict:
+    """Pipeline stage 1 (io queue): start the run and download the PDF, unless it was prefetched."""
+    return _download_report(_start_job(self.request.id, url), pdf_path, prefer_stored)
+
+
+@celery_app.task(name="app.scraper.tasks.parse_report", bind=True, acks_late=True)
+def parse_report(self, job: dict) -> dict:
+    """Pipeline stage 2 (cpu queue): parse the PDF and stage rows in the parse cache."""
+    job, _ = _parse_report(job, handoff=True)
+    return job
+
+
+@celery_app.task(name="app.scraper.tasks.load_report", bind=True, acks_late=True)
+def load_report(self, job: dict) -> dict:
+    """Pipeline stage 3 (db queue): write the staged rows and finish the run."""
+    return _load_report(job)
+
 
-    finally:
-        db.close()
+@celery_app.task(name="app.scraper.tasks.ingest_local_report", bind=True, acks_late=True)
+def ingest_local_report(self, path: str):
+    """
+    Parse and load a PDF that is already on disk, with no download.
+
+    Used for offline backfills from an archive; the file is left in place.
+    """
+    pdf_path = Path(path).resolve()
+    job = _start_job(self.request.id, pdf_path.as_uri(), source_file=pdf_path.name)
+    job.update(pdf_path=str(pdf_path), keep_pdf=True)
+    job, parsed_results = _parse_report(job)
+    return _load_report(job, parsed_results)
+
+
+def scrape_pipeline(
+    url: str, task_id: str | None = None, pdf_path: str | None = None, prefer_stored: bool = False
+):
+    """
+    Chain the download, parse and load stages for one report URL.
+
+    Only the job dict (run id, PDF path, parse cache key, counters) travels
+    through the broker, so the download directory and parse cache must be
+    shared by the io, cpu and db workers. ``task_id`` pins the download
+    stage's id so it picks up a run queued under that id; ``pdf_path`` hands
+    over a prefetched copy of the report and ``prefer_stored`` skips
+    revalidating a stored one.
+    """
+    download = download_report.s(url, pdf_path, prefer_stored)
+    if task_id:
+        download = download.set(task_id=task_id)
+    return chain(download, parse_report.s(), load_report.s())
@@ -1,9 +1,38 @@
-from datetime import UTC, datetime
+import hashlib
+from datetime import UTC, datetime, timedelta
+from uuid import UUID
 
+from sqlalchemy import func, or_, select
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.models.ingestion_run import IngestionRun
 
+# Runs in these states hold their source file until they finish or go stale.
+IN_FLIGHT_STATUSES = ("queued", "running")
+# Per-run performance columns summarized by get_performance_summary.
+PERFORMANCE_METRICS = (
+    "download_seconds",
+    "parse_seconds",
+    "load_seconds",
+    "commit_seconds",
+    "rows_per_second",
+    "peak_rss_bytes",
+    "pdf_bytes",
+)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+def _percentile(sorted_values: list[float], percent: float) -> float:
+    """Linearly interpolated percentile of already sorted values."""
+    position = (len(sorted_values) - 1) * percent / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
 
 class IngestionRunService:
     @staticmethod
@@ -24,6 +53,12 @@ class IngestionRunService:
     def get_latest_run(db: Session) -> IngestionRun | None:
         return db.query(IngestionRun).order_by(IngestionRun.started_at.desc()).first()
 
+    @staticmethod
+    def get_run(db: Session, run_id: str | UUID) -> IngestionRun | None:
+        if isinstance(run_id, str):
+            run_id = UUID(run_id)
+        return db.query(IngestionRun).filter(IngestionRun.id == run_id).first()
+
     @staticmethod
     def list_runs(
         db: Session,
@@ -76,6 +111,108 @@ class IngestionRunService:
         db.refresh(run)
         return run
 
+    @staticmethod
+    def _lock_source_file(db: Session, source_file: str) -> None:
+        """Serialize claims on one source file until the caller commits (PostgreSQL only)."""
+        if db.get_bind().dialect.name != "postgresql":
+            return
+        digest = hashlib.blake2b(source_file.encode("utf-8"), digest_size=8).digest()
+        db.execute(select(func.pg_advisory_xact_lock(int.from_bytes(digest, "big", signed=True))))
+
+    @staticmethod
+    def _in_flight_query(db: Session):
+        cutoff = _utcnow() - timedelta(seconds=settings.INGESTION_LOCK_TTL_SECONDS)
+        return db.query(IngestionRun).filter(
+            IngestionRun.status.in_(IN_FLIGHT_STATUSES),
+            IngestionRun.started_at >= cutoff,
+        )
+
+    @staticmethod
+    def get_in_flight_run(
+        db: Session,
+        source_file: str,
+        *,
+        exclude_task_id: str | None = None,
+    ) -> IngestionRun | None:
+        query = IngestionRunService._in_flight_query(db).filter(IngestionRun.source_file == source_file)
+        if exclude_task_id:
+            query = query.filter(or_(IngestionRun.task_id.is_(None), IngestionRun.task_id != exclude_task_id))
+        return query.order_by(IngestionRun.started_at.desc()).first()
+
+    @staticmethod
+    def get_in_flight_source_files(db: Session) -> list[str]:
+        rows = IngestionRunService._in_flight_query(db).with_entities(IngestionRun.source_file).distinct().all()
+        return [row[0] for row in rows if row[0]]
+
+    @staticmethod
+    def queue_run(
+        db: Session,
+        task_name: str,
+        task_id: str,
+        source_url: str,
+        source_file: str,
+    ) -> IngestionRun | None:
+        """Record a queued scrape, or return None if the file is already queued or running."""
+        IngestionRunService._lock_source_file(db, source_file)
+        if IngestionRunService.get_in_flight_run(db, source_file) is not None:
+            db.commit()
+            return None
+
+        run = IngestionRun(
+            task_id=task_id,
+            task_name=task_name,
+            status="queued",
+            source_url=source_url,
+            source_file=source_file,
+            started_at=_utcnow(),
+        )
+        db.add(run)
+        db.commit()
+        db.refresh(run)
+        return run
+
+    @staticmethod
+    def claim_run(
+        db: Session,
+        task_name: str,
+        task_id: str,
+        source_url: str,
+        source_file: str,
+    ) -> tuple[IngestionRun, bool]:
+        """
+        Start (or resume) the run for ``task_id`` if no other run holds ``source_file``.
+
+        Returns the run and whether it was claimed. A run that loses the claim is
+        finished as ``skipped`` so the worker can bail out before downloading.
+        """
+        IngestionRunService._lock_source_file(db, source_file)
+        holder = IngestionRunService.get_in_flight_run(db, source_file, exclude_task_id=task_id)
+        run = db.query(IngestionRun).filter(IngestionRun.task_id == task_id).first()
+        if run is None:
+            run = IngestionRun(
+                task_id=task_id,
+                task_name=task_name,
+                source_url=source_url,
+                source_file=source_file,
+                started_at=_utcnow(),
+            )
+            db.add(run)
+        elif run.status == "queued":
+            # Time spent waiting in the broker is not part of the run.
+            run.started_at = _utcnow()
+
+        if holder is None:
+            run.status = "running"
+            run.finished_at = None
+            run.error_message = None
+        else:
+            run.status = "skipped"
+            run.finished_at = _utcnow()
+            run.error_message = f"Source file is already being processed by run {holder.id}"
+        db.commit()
+        db.refresh(run)
+        return run, holder is None
+
     @staticmethod
     def finish_run(
         db: Session,
@@ -91,6 +228,14 @@ class IngestionRunService:
         error_count: int | None = None,
         anomaly_count: int | None = None,
         anomaly_flags: list[str] | None = None,
+        parse_stats: dict | None = None,
+        commit_seconds: float | None = None,
+        download_seconds: float | None = None,
+        parse_seconds: float | None = None,
+        load_seconds: float | None = None,
+        rows_per_second: float | None = None,
+        peak_rss_bytes: int | None = None,
+        pdf_bytes: int | None = None,
         error_message: str | None = None,
     ) -> IngestionRun:
         run.status = status
@@ -103,12 +248,57 @@ class IngestionRunService:
         run.error_count = error_count
         run.anomaly_count = anomaly_count
         run.anomaly_flags = anomaly_flags or []
+        run.parse_stats = parse_stats
+        run.commit_seconds = commit_seconds
+        run.download_seconds = download_seconds
+        run.parse_seconds = parse_seconds
+        run.load_seconds = load_seconds
+        run.rows_per_second = rows_per_second
+        run.peak_rss_bytes = peak_rss_bytes
+        run.pdf_bytes = pdf_bytes
         run.error_message = error_message
         run.finished_at = datetime.now(UTC).replace(tzinfo=None)
         db.commit()
         db.refresh(run)
         return run
 
+    @staticmethod
+    def get_performance_summary(
+        db: Session,
+        *,
+        window: timedelta,
+        task_name: str = "scrape_daily_prices",
+    ) -> dict:
+        """p50/p95 of each performance metric over runs that finished inside ``window``."""
+        window_end = _utcnow()
+        window_start = window_end - window
+        columns = [getattr(IngestionRun, metric) for metric in PERFORMANCE_METRICS]
+        rows = (
+            db.query(*columns)
+            .filter(
+                IngestionRun.task_name == task_name,
+                IngestionRun.status.in_(("success", "partial_success")),
+                IngestionRun.finished_at >= window_start,
+            )
+            .all()
+        )
+
+        metrics = {}
+        for index, metric in enumerate(PERFORMANCE_METRICS):
+            values = sorted(row[index] for row in rows if row[index] is not None)
+            metrics[metric] = (
+                {"p50": _percentile(values, 50), "p95": _percentile(values, 95)}
+                if values
+                else {"p50": None, "p95": None}
+            )
+        return {
+            "task_name": task_name,
+            "window_start": window_start,
+            "window_end": window_end,
+            "run_count": len(rows),
+            "metrics": metrics,
+        }
+
     @staticmethod
     def get_latest_successful_scrape(db: Session) -> IngestionRun | None:
         return (
@@ -1,4 +1,5 @@
-from typing import Union
+import uuid
+from typing import Dict, Iterable, List, Union
 from uuid import UUID
 
 from sqlalchemy import func
@@ -37,6 +38,63 @@ class MarketService:
 
         normalized = MarketService._normalize_name(name)
         return db.query(Market).filter(func.lower(Market.name) == normalized.lower()).first()
+
+    @staticmethod
+    def get_by_names(db: Session, names: Iterable[str]) -> List:
+        """Bulk fetch markets by names (case-insensitive)."""
+        from app.models.market import Market
+
+        keys = {MarketService._normalize_name(name).lower() for name in names}
+        if not keys:
+            return []
+        return db.query(Market).filter(func.lower(Market.name).in_(keys)).all()
+
+    @staticmethod
+    def get_or_create_many(db: Session, names: Iterable[str]) -> Dict[str, object]:
+        """
+        Resolve market names to markets, creating the missing ones in one statement.
+
+        Existing markets are fetched with one query and the rest are inserted
+        with ``ON CONFLICT DO NOTHING RETURNING``. Names claimed by a concurrent
+        writer in between are not returned by the insert and are re-selected.
+        Returns a mapping from each given name to its market.
+        """
+        from app.models.market import Market
+
+        names = list(dict.fromkeys(names))
+        spellings: Dict[str, str] = {}
+        for name in names:
+            normalized = MarketService._normalize_name(name)
+            spellings.setdefault(normalized.lower(), normalized)
+
+        by_key = {market.name.lower(): market for market in MarketService.get_by_names(db, spellings.values())}
+        missing = [spelling for key, spelling in spellings.items() if key not in by_key]
+        if missing:
+            if db.bind.dialect.name == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert
+
+            stmt = (
+                insert(Market)
+                .values([{"id": uuid.uuid4(), "name": name, "is_regional_average": False} for name in missing])
+                .on_conflict_do_nothing()
+                .returning(Market)
+            )
+            created = db.scalars(stmt).all()
+            db.commit()
+            by_key.update((market.name.lower(), market) for market in created)
+
+            lost = [name for name in missing if name.lower() not in by_key]
+            if lost:
+                by_key.update((market.name.lower(), market) for market in MarketService.get_by_names(db, lost))
+
+        resolved = {}
+        for name in names:
+            market = by_key.get(MarketService._normalize_name(name).lower())
+            if market is not None:
+                resolved[name] = market
+        return resolved
 
     @staticmethod
     def get_multi(db: Session, skip: int = 0, limit: int = 100, query: str | None = None):
@@ -1,15 +1,23 @@
+import io
+import uuid
 from datetime import date
 from decimal import Decimal
-from typing import Any, Dict, Union
+from typing import Any, Dict, List, Union
 from uuid import UUID
 
-from sqlalchemy import desc, func
+from sqlalchemy import desc, func, literal_column, or_, select, text, tuple_
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, joinedload
 
 from app.schemas.price_entry import PriceEntryCompact
 from app.schemas.price_filters import PriceFilters, PriceSortField, SortOrder
 
+PRICE_ENTRY_IDENTITY = ("commodity_id", "market_id", "report_date", "report_type")
+PRICE_ENTRY_PRICE_FIELDS = ("price_low", "price_high", "price_prevailing", "price_average")
+PRICE_ENTRY_LOADERS = ("upsert", "copy")
+PRICE_ENTRY_STAGING_TABLE = "price_entries_staging"
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
 
 class PriceService:
     @staticmethod
@@ -556,7 +564,14 @@ class PriceService:
         return entry
 
     @staticmethod
-    def upsert_entry(db: Session, data: Dict[str, Any]):
+    def upsert_entry(db: Session, data: Dict[str, Any], commit: bool = True):
+        """
+        Insert or update one price entry, returning it with the action taken.
+
+        With ``commit=False`` changes are only flushed, for callers that wrap
+        the call in a savepoint of a larger transaction; a concurrent insert
+        then surfaces as ``IntegrityError`` instead of being retried.
+        """
         from app.models.price_entry import PriceEntry
 
         identity_filter = (
@@ -574,12 +589,18 @@ class PriceService:
                 return existing, "skipped"
             for key, value in data.items():
                 setattr(existing, key, value)
+            if not commit:
+                db.flush()
+                return existing, "updated"
             db.commit()
             db.refresh(existing)
             return existing, "updated"
 
         db_obj = PriceEntry(**data)
         db.add(db_obj)
+        if not commit:
+            db.flush()
+            return db_obj, "inserted"
         try:
             db.commit()
         except IntegrityError:
@@ -597,3 +618,204 @@ class PriceService:
             return existing, "updated"
         db.refresh(db_obj)
         return db_obj, "inserted"
+
+    @staticmethod
+    def _normalize_bulk_entry(data: Dict[str, Any]) -> Dict[str, Any]:
+        # Match the stored representation so unchanged rows compare equal.
+        entry = dict(data)
+        entry["commodity_id"] = PriceService._coerce_uuid(entry["commodity_id"])
+        entry["market_id"] = PriceService._coerce_uuid(entry["market_id"])
+        for field in PRICE_ENTRY_PRICE_FIELDS:
+            if field in entry:
+                entry[field] = PriceService._to_decimal(entry[field])
+        return entry
+
+    @staticmethod
+    def diff_report_entries(db: Session, rows: List[Dict[str, Any]]) -> tuple[List[int], int]:
+        """
+        Compare a batch of price entries with the stored rows for its reports.
+
+        Existing entries for every (report_date, report_type) in the batch are
+        loaded with one query and compared in memory. Returns the indices of
+        rows that would insert or change data, in order, and the number of
+        rows that match what is already stored (or an earlier row in the batch).
+        """
+        from app.models.price_entry import PriceEntry
+
+        if not rows:
+            return [], 0
+
+        entries = [PriceService._normalize_bulk_entry(data) for data in rows]
+        value_fields = [field for field in entries[0] if field not in PRICE_ENTRY_IDENTITY]
+        reports = {(entry["report_date"], entry["report_type"]) for entry in entries}
+        columns = [getattr(PriceEntry, field) for field in (*PRICE_ENTRY_IDENTITY, *value_fields)]
+        stored = db.query(*columns).filter(tuple_(PriceEntry.report_date, PriceEntry.report_type).in_(reports))
+
+        identity_size = len(PRICE_ENTRY_IDENTITY)
+        current = {tuple(row[:identity_size]): tuple(row[identity_size:]) for row in stored}
+        changed: List[int] = []
+        unchanged = 0
+        for index, entry in enumerate(entries):
+            key = tuple(entry[field] for field in PRICE_ENTRY_IDENTITY)
+            values = tuple(entry[field] for field in value_fields)
+            if current.get(key) == values:
+                unchanged += 1
+                continue
+            current[key] = values
+            changed.append(index)
+        return changed, unchanged
+
+    @staticmethod
+    def bulk_upsert_entries(
+        db: Session,
+        rows: List[Dict[str, Any]],
+        loader: str = "upsert",
+        commit: bool = True,
+    ) -> dict[str, int]:
+        """
+        Insert or update a batch of price entries with one statement and one commit.
+
+        Rows are matched on ``uq_price_entries_identity`` and existing rows are
+        only rewritten when a value differs. Rows must share the same keys.
+        Repeated identities within the batch collapse to their last version;
+        the extra copies count as skipped when identical and updated otherwise.
+        With ``loader="copy"`` PostgreSQL streams the batch into a staging
+        table with ``COPY FROM STDIN`` before merging it; other databases use
+        the ``upsert`` loader. ``commit=False`` leaves the transaction open
+        for the caller. Returns ``inserted``/``updated``/``skipped`` counts
+        for the batch.
+        """
+        if loader not in PRICE_ENTRY_LOADERS:
+            raise ValueError(f"Unknown price entry loader: {loader}")
+        counts = {"inserted": 0, "updated": 0, "skipped": 0}
+        latest: dict[tuple, Dict[str, Any]] = {}
+        for data in rows:
+            entry = PriceService._normalize_bulk_entry(data)
+            key = tuple(entry[field] for field in PRICE_ENTRY_IDENTITY)
+            previous = latest.get(key)
+            if previous is not None:
+                counts["updated" if previous != entry else "skipped"] += 1
+            latest[key] = entry
+        if not latest:
+            return counts
+
+        entries = list(latest.values())
+        if db.bind.dialect.name == "postgresql" and loader == "copy":
+            inserted, updated = PriceService._copy_upsert_postgresql(db, entries)
+        elif db.bind.dialect.name == "postgresql":
+            inserted, updated = PriceService._bulk_upsert_postgresql(db, entries)
+        else:
+            inserted, updated = PriceService._bulk_upsert_generic(db, entries)
+        if commit:
+            db.commit()
+
+        counts["inserted"] += inserted
+        counts["updated"] += updated
+        counts["skipped"] += len(entries) - inserted - updated
+        return counts
+
+    @staticmethod
+    def _bulk_upsert_statement(insert_fn, entries: List[Dict[str, Any]], **conflict_target):
+        from app.models.price_entry import PriceEntry
+
+        stmt = insert_fn(PriceEntry.__table__).values([{"id": uuid.uuid4(), **entry} for entry in entries])
+        return PriceService._on_identity_conflict(stmt, list(entries[0]), **conflict_target)
+
+    @staticmethod
+    def _on_identity_conflict(stmt, columns: List[str], **conflict_target):
+        target = stmt.table
+        value_columns = [name for name in columns if name not in PRICE_ENTRY_IDENTITY]
+        return stmt.on_conflict_do_update(
+            **conflict_target,
+            set_={name: stmt.excluded[name] for name in value_columns},
+            where=or_(*(target.c[name].is_distinct_from(stmt.excluded[name]) for name in value_columns)),
+        )
+
+    @staticmethod
+    def _count_postgresql_upsert(db: Session, stmt) -> tuple[int, int]:
+        # Rows left untouched by the WHERE clause are not returned; xmax is 0
+        # only for freshly inserted tuples.
+        returned = db.execute(stmt.returning(literal_column("xmax = 0").label("inserted"))).scalars().all()
+        inserted = sum(1 for was_inserted in returned if was_inserted)
+        return inserted, len(returned) - inserted
+
+    @staticmethod
+    def _bulk_upsert_postgresql(db: Session, entries: List[Dict[str, Any]]) -> tuple[int, int]:
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+        stmt = PriceService._bulk_upsert_statement(pg_insert, entries, constraint="uq_price_entries_identity")
+        return PriceService._count_postgresql_upsert(db, stmt)
+
+    @staticmethod
+    def _copy_text(value) -> str:
+        # COPY text format: \N is NULL and control characters are backslash-escaped.
+        if value is None:
+            return "\\N"
+        return str(value).translate(_COPY_ESCAPES)
+
+    @staticmethod
+    def _copy_upsert_postgresql(db: Session, entries: List[Dict[str, Any]]) -> tuple[int, int]:
+        from sqlalchemy import column, table
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+        from app.models.price_entry import PriceEntry
+
+        columns = ["id", *entries[0]]
+        buffer = io.StringIO()
+        for entry in entries:
+            values = [uuid.uuid4(), *(entry[name] for name in entries[0])]
+            buffer.write("\t".join(PriceService._copy_text(value) for value in values) + "\n")
+        buffer.seek(0)
+
+        column_list = ", ".join(columns)
+        db.execute(
+            text(
+                f"CREATE TEMP TABLE IF NOT EXISTS {PRICE_ENTRY_STAGING_TABLE} "
+                "(LIKE price_entries INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+            )
+        )
+        # Rows from an earlier batch in the same transaction must not merge twice.
+        db.execute(text(f"TRUNCATE {PRICE_ENTRY_STAGING_TABLE}"))
+        dbapi_connection = db.connection().connection.dbapi_connection
+        with dbapi_connection.cursor() as cursor:
+            cursor.copy_expert(f"COPY {PRICE_ENTRY_STAGING_TABLE} ({column_list}) FROM STDIN", buffer)
+
+        staging = table(PRICE_ENTRY_STAGING_TABLE, *(column(name) for name in columns))
+        stmt = pg_insert(PriceEntry.__table__).from_select(columns, select(*staging.c))
+        stmt = PriceService._on_identity_conflict(stmt, list(entries[0]), constraint="uq_price_entries_identity")
+        return PriceService._count_postgresql_upsert(db, stmt)
+
+    @staticmethod
+    def _bulk_upsert_generic(db: Session, entries: List[Dict[str, Any]]) -> tuple[int, int]:
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+        from app.models.price_entry import PriceEntry
+
+        # SQLite cannot tell inserts from updates in RETURNING, so classify
+        # against the stored rows first and only write what changed.
+        identity_columns = [getattr(PriceEntry, field) for field in PRICE_ENTRY_IDENTITY]
+        keys = [tuple(entry[field] for field in PRICE_ENTRY_IDENTITY) for entry in entries]
+        existing = {
+            tuple(getattr(row, field) for field in PRICE_ENTRY_IDENTITY): row
+            for row in db.query(PriceEntry).filter(tuple_(*identity_columns).in_(keys))
+        }
+
+        inserted = updated = 0
+        changed: List[Dict[str, Any]] = []
+        for key, entry in zip(keys, entries):
+            row = existing.get(key)
+            if row is None:
+                inserted += 1
+            elif any(getattr(row, field) != value for field, value in entry.items()):
+                updated += 1
+            else:
+                continue
+            changed.append(entry)
+
+        if changed:
+            stmt = PriceService._bulk_upsert_statement(sqlite_insert, changed, index_elements=list(PRICE_ENTRY_IDENTITY))
+            db.execute(stmt)
+            # Keep rows loaded above from shadowing the values just written.
+            for row in existing.values():
+                db.expire(row)
+        return inserted, updated
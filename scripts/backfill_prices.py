@@ -1,15 +1,27 @@
 import argparse
 import json
 import os
+import shutil
 import sys
+import tarfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from datetime import date
+from pathlib import Path
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.db.session import SessionLocal
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.db.session import SessionLocal, engine
 from app.models.price_entry import PriceEntry
+from app.scraper.downloader import PDFDownloader
 from app.scraper.source import MonitoringSource
-from app.scraper.tasks import scrape_daily_prices
+from app.scraper.tasks import ingest_local_report, scrape_daily_prices, scrape_pipeline
+
+# Results that count as done; anything else is retried when the backfill resumes. "skipped" is
+# deliberately absent: it means another worker held the file's ingestion lock, not that it was loaded.
+FINISHED_STATUSES = {"success", "partial_success", "empty"}
 
 
 def _resolve_links(urls: list[str], start_date: date | None, end_date: date | None) -> list[str]:
@@ -24,35 +36,316 @@ def _resolve_links(urls: list[str], start_date: date | None, end_date: date | No
     return MonitoringSource.filter_links_by_date_range(links, start_date, end_date)
 
 
+def _is_url(target: str) -> bool:
+    return "://" in target
+
+
+def _target_file(target: str) -> str:
+    return target.split("/")[-1] if _is_url(target) else Path(target).name
+
+
+def _extract_archive(archive: Path, target_dir: Path) -> Path:
+    """Unpack the PDFs in a tarball once; a resumed backfill reuses the extracted files."""
+    if target_dir.is_dir():
+        return target_dir
+    staging_dir = target_dir.with_name(f"{target_dir.name}.partial")
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    with tarfile.open(archive) as tar:
+        members = [member for member in tar.getmembers() if member.isfile() and member.name.lower().endswith(".pdf")]
+        tar.extractall(staging_dir, members=members, filter="data")
+    os.replace(staging_dir, target_dir)
+    return target_dir
+
+
+def _resolve_local_files(pdf_dir: Path, start_date: date | None, end_date: date | None) -> list[str]:
+    paths = [str(path.resolve()) for path in pdf_dir.rglob("*") if path.is_file() and path.suffix.lower() == ".pdf"]
+    if start_date is not None:
+        paths = MonitoringSource.filter_links_by_date_range(paths, start_date, end_date or start_date)
+    # Oldest reports first, so an interrupted backfill leaves a contiguous history behind.
+    return sorted(paths, key=lambda path: (MonitoringSource.extract_report_date(path) or date.max, path))
+
+
+def _default_checkpoint_path() -> Path:
+    return Path(settings.PARSE_CACHE_DIR).parent / "backfill-checkpoint.json"
+
+
+def _unfinished(links: list[str], results: dict) -> list[str]:
+    return [url for url in links if results.get(url, {}).get("status") not in FINISHED_STATUSES]
+
+
+def _load_checkpoint(path: Path, request: dict) -> dict:
+    """Return the saved checkpoint for this exact request if it still has unfinished work, or a fresh one."""
+    try:
+        checkpoint = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        checkpoint = None
+    if (
+        not checkpoint
+        or checkpoint.get("request") != request
+        or checkpoint.get("links") is None
+        or not _unfinished(checkpoint["links"], checkpoint.get("results", {}))
+    ):
+        return {"request": request, "links": None, "results": {}}
+    return checkpoint
+
+
+def _save_checkpoint(path: Path, checkpoint: dict) -> None:
+    # Write-then-rename so an interrupted backfill never leaves a torn checkpoint.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    tmp_path.write_text(json.dumps(checkpoint, indent=2, default=str), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def _init_local_worker(loader: str) -> None:
+    # Forked children must not reuse the parent's pooled database connections.
+    engine.dispose(close=False)
+    settings.INGESTION_LOADER = loader
+
+
+def _scrape_locally(target: str, pdf_path: str | None = None, prefer_stored: bool = True) -> dict:
+    # URLs are downloaded first (unless prefetched or stored); local archive files are parsed where they are.
+    if _is_url(target):
+        task, args = scrape_daily_prices, [target, pdf_path, prefer_stored]
+    else:
+        task, args = ingest_local_report, [target]
+    try:
+        return task.apply(args=args).get()
+    except Exception as exc:
+        return {"status": "failed", "url": target, "error": str(exc)}
+
+
+def _prefetch(links: list[str], prefer_stored: bool = True) -> dict[str, str]:
+    """Download every report in one concurrent burst; failures are left to the per-report retries."""
+    started_at = time.monotonic()
+    results = PDFDownloader().download_many_sync(links, prefer_stored=prefer_stored)
+    prefetched = {result.url: str(result.path) for result in results if result.ok}
+    print(
+        f"Prefetched {len(prefetched)} of {len(links)} reports in {time.monotonic() - started_at:.1f}s",
+        file=sys.stderr,
+    )
+    return prefetched
+
+
+def _run_local(
+    links: list[str], workers: int, on_result, prefetched: dict[str, str] | None = None, prefer_stored: bool = True
+) -> None:
+    prefetched = prefetched or {}
+    if workers == 1:
+        for url in links:
+            on_result(url, _scrape_locally(url, prefetched.get(url), prefer_stored))
+        return
+
+    initargs = (settings.INGESTION_LOADER,)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_local_worker, initargs=initargs) as pool:
+        futures = {pool.submit(_scrape_locally, url, prefetched.get(url), prefer_stored): url for url in links}
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                on_result(futures[future], future.result())
+
+
+def _run_celery(
+    links: list[str],
+    workers: int,
+    on_result,
+    prefetched: dict[str, str] | None = None,
+    prefer_stored: bool = True,
+    poll_seconds: float = 1.0,
+) -> None:
+    # A sliding window of pipelines keeps at most ``workers`` reports in flight.
+    prefetched = prefetched or {}
+    queue = list(reversed(links))
+    in_flight = {}
+    while queue or in_flight:
+        while queue and len(in_flight) < workers:
+            url = queue.pop()
+            in_flight[url] = scrape_pipeline(
+                url, pdf_path=prefetched.get(url), prefer_stored=prefer_stored
+            ).apply_async()
+        finished = [url for url, result in in_flight.items() if result.ready()]
+        if not finished:
+            time.sleep(poll_seconds)
+            continue
+        for url in finished:
+            result = in_flight.pop(url)
+            if result.successful():
+                on_result(url, result.result)
+            else:
+                on_result(url, {"status": "failed", "url": url, "error": str(result.result)})
+
+
+def _celery_workers_available() -> bool:
+    try:
+        return bool(celery_app.control.ping(timeout=1.0))
+    except Exception:
+        return False
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Backfill Daily Retail Price PDFs into the local database.")
     parser.add_argument("--start-date", type=date.fromisoformat, help="Start date in YYYY-MM-DD format.")
     parser.add_argument("--end-date", type=date.fromisoformat, help="End date in YYYY-MM-DD format.")
     parser.add_argument("--url", action="append", default=[], help="Explicit PDF URL to ingest. Repeatable.")
-    parser.add_argument("--force", action="store_true", help="Reprocess files even if they already exist in the DB.")
+    parser.add_argument(
+        "--source-dir",
+        type=Path,
+        help="Offline backfill from a directory or tarball of PDFs instead of the DA site; no HTTP requests are made.",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Reprocess files even if they already exist in the DB; implies --restart.",
+    )
+    parser.add_argument(
+        "--loader",
+        choices=["upsert", "copy"],
+        default=settings.INGESTION_LOADER,
+        help=(
+            "Price entry loader for the local executor; copy streams rows through a COPY staging table on "
+            "PostgreSQL. Celery workers use their own INGESTION_LOADER."
+        ),
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Maximum number of reports ingested at once.")
+    parser.add_argument(
+        "--executor",
+        choices=["auto", "celery", "local"],
+        default="auto",
+        help="Run reports on Celery workers or a local process pool; auto uses Celery when a worker answers.",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=None,
+        help="Checkpoint file used to resume an interrupted backfill (default: next to the parse cache).",
+    )
+    parser.add_argument("--restart", action="store_true", help="Ignore any saved checkpoint and start over.")
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help=(
+            "Revalidate report PDFs already in the PDF store with the source (conditional GET) instead of "
+            "re-ingesting the stored copies without any request."
+        ),
+    )
+    parser.add_argument(
+        "--prefetch",
+        action="store_true",
+        help=(
+            "Download every remaining report concurrently up front (HTTP_PER_HOST_CONCURRENCY per host), "
+            "then ingest from the downloaded files. Celery workers must share the download directory."
+        ),
+    )
     args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.source_dir is not None:
+        if args.url:
+            parser.error("--url cannot be combined with --source-dir")
+        if args.executor == "celery":
+            parser.error("--source-dir runs on the local executor only")
+        if args.prefetch:
+            parser.error("--prefetch cannot be combined with --source-dir; local files need no download")
+        if not args.source_dir.exists():
+            parser.error(f"--source-dir {args.source_dir} does not exist")
+    settings.INGESTION_LOADER = args.loader
 
-    links = _resolve_links(args.url, args.start_date, args.end_date)
-    db = SessionLocal()
-    try:
-        processed_files = {
-            row[0]
-            for row in db.query(PriceEntry.source_file).distinct().all()
-            if row[0]
-        }
-    finally:
-        db.close()
-
-    if not args.force:
-        links = [url for url in links if url.split("/")[-1] not in processed_files]
-
-    results = []
-    for url in links:
-        result = scrape_daily_prices.apply(args=[url]).get()
-        results.append(result)
-
-    print(json.dumps({"requested": len(links), "results": results}, indent=2, default=str))
-    return 0
+    checkpoint_path = args.checkpoint or _default_checkpoint_path()
+    request = {
+        "urls": args.url,
+        "source_dir": str(args.source_dir.resolve()) if args.source_dir else None,
+        "start_date": args.start_date.isoformat() if args.start_date else None,
+        "end_date": args.end_date.isoformat() if args.end_date else None,
+        "force": args.force,
+    }
+    checkpoint = {"request": request, "links": None, "results": {}}
+    if not (args.restart or args.force):
+        checkpoint = _load_checkpoint(checkpoint_path, request)
+
+    # A resumed backfill reuses the saved work list instead of re-listing the source site and the DB.
+    pdf_dir = None
+    if args.source_dir is not None:
+        pdf_dir = args.source_dir
+        if not pdf_dir.is_dir():
+            pdf_dir = _extract_archive(pdf_dir, checkpoint_path.parent / "backfill-archives" / pdf_dir.name)
+    if checkpoint["links"] is None:
+        if pdf_dir is not None:
+            links = _resolve_local_files(pdf_dir, args.start_date, args.end_date)
+        else:
+            links = _resolve_links(args.url, args.start_date, args.end_date)
+        if not args.force:
+            db = SessionLocal()
+            try:
+                processed_files = {
+                    row[0]
+                    for row in db.query(PriceEntry.source_file).distinct().all()
+                    if row[0]
+                }
+            finally:
+                db.close()
+            links = [target for target in links if _target_file(target) not in processed_files]
+        checkpoint["links"] = links
+        _save_checkpoint(checkpoint_path, checkpoint)
+
+    links = checkpoint["links"]
+    results = checkpoint["results"]
+    remaining = _unfinished(links, results)
+    executor = args.executor
+    if executor == "auto":
+        executor = "celery" if pdf_dir is None and _celery_workers_available() else "local"
+    print(
+        f"Backfilling {len(remaining)} of {len(links)} reports with {args.workers} {executor} worker(s)",
+        file=sys.stderr,
+    )
+
+    started_at = time.monotonic()
+    completed = len(links) - len(remaining)
+
+    def _record(url: str, result: dict) -> None:
+        nonlocal completed
+        completed += 1
+        results[url] = result
+        _save_checkpoint(checkpoint_path, checkpoint)
+        print(
+            f"[{completed}/{len(links)}] {result.get('status', 'unknown')} {_target_file(url)} "
+            f"({time.monotonic() - started_at:.1f}s elapsed)",
+            file=sys.stderr,
+            flush=True,
+        )
+
+    prefer_stored = not args.refresh
+    prefetched = _prefetch(remaining, prefer_stored) if args.prefetch and remaining else {}
+    if executor == "celery":
+        _run_celery(remaining, args.workers, _record, prefetched, prefer_stored)
+    else:
+        _run_local(remaining, args.workers, _record, prefetched, prefer_stored)
+
+    unfinished = _unfinished(links, results)
+    skipped = [url for url in unfinished if results[url].get("status") == "skipped"]
+    if skipped:
+        print(
+            f"{len(skipped)} report(s) were held by another ingestion run; rerun the same command to retry them",
+            file=sys.stderr,
+        )
+    if not unfinished:
+        # A finished backfill has nothing to resume; the next run lists the reports afresh.
+        checkpoint_path.unlink(missing_ok=True)
+        if pdf_dir is not None and pdf_dir != args.source_dir:
+            shutil.rmtree(pdf_dir, ignore_errors=True)
+    print(
+        json.dumps(
+            {
+                "requested": len(links),
+                "failed": len(unfinished) - len(skipped),
+                "skipped": len(skipped),
+                "results": [results.get(url) for url in links],
+            },
+            indent=2,
+            default=str,
+        )
+    )
+    return 1 if unfinished else 0
 
 
 if __name__ == "__main__":
@@ -0,0 +1,138 @@
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base, Commodity, Market, PriceEntry
+from app.services.price_service import PriceService
+
+BENCHMARK_PREFIX = "Benchmark"
+
+
+def _create_session(database_url: str):
+    engine_kwargs = {}
+    if database_url.startswith("sqlite"):
+        engine_kwargs = {"connect_args": {"check_same_thread": False}, "poolclass": StaticPool}
+    engine = create_engine(database_url, **engine_kwargs)
+    Base.metadata.create_all(engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+
+def _seed_dimensions(db, commodities: int, markets: int):
+    commodity_rows = [
+        Commodity(name=f"{BENCHMARK_PREFIX} Commodity {i}", category="Benchmark", unit="kg") for i in range(commodities)
+    ]
+    market_rows = [Market(name=f"{BENCHMARK_PREFIX} Market {i}", region="Benchmark") for i in range(markets)]
+    db.add_all(commodity_rows + market_rows)
+    db.commit()
+    return [c.id for c in commodity_rows], [m.id for m in market_rows]
+
+
+def _report_rows(commodity_ids, market_ids, report_date: date) -> list[dict]:
+    pairs = [(commodity_id, market_id) for commodity_id in commodity_ids for market_id in market_ids]
+    return [
+        {
+            "commodity_id": commodity_id,
+            "market_id": market_id,
+            "report_date": report_date,
+            "price_low": 40.0 + i % 7,
+            "price_high": 60.0 + i % 11,
+            "price_prevailing": 50.0 + i % 5,
+            "price_average": None,
+            "report_type": "DAILY_RETAIL",
+            "source_file": f"{BENCHMARK_PREFIX}-{report_date.isoformat()}.pdf",
+        }
+        for i, (commodity_id, market_id) in enumerate(pairs)
+    ]
+
+
+def _load_per_row(db, rows: list[dict]) -> None:
+    for row in rows:
+        PriceService.upsert_entry(db, row)
+
+
+def _load_bulk(db, rows: list[dict], loader: str, chunk_size: int) -> None:
+    if loader == "copy":
+        chunk_size = len(rows)
+    for offset in range(0, len(rows), chunk_size):
+        PriceService.bulk_upsert_entries(db, rows[offset : offset + chunk_size], loader=loader)
+
+
+def _rows_per_second(load, rows: list[dict]) -> float:
+    started_at = time.perf_counter()
+    load(rows)
+    return round(len(rows) / (time.perf_counter() - started_at), 1)
+
+
+def benchmark_loaders(db, days: int, commodity_ids, market_ids, chunk_size: int) -> list[dict]:
+    loaders = {
+        "upsert_entry": lambda rows: _load_per_row(db, rows),
+        "bulk_upsert": lambda rows: _load_bulk(db, rows, "upsert", chunk_size),
+        "copy": lambda rows: _load_bulk(db, rows, "copy", chunk_size),
+    }
+    start = date(2000, 1, 1)
+    results = []
+    for index, (name, load) in enumerate(loaders.items()):
+        # Each loader backfills its own date range so every first pass is a pure insert.
+        report_dates = [start + timedelta(days=index * days + offset) for offset in range(days)]
+        batches = [_report_rows(commodity_ids, market_ids, report_date) for report_date in report_dates]
+        rows = [row for batch in batches for row in batch]
+        results.append(
+            {
+                "loader": name,
+                "rows": len(rows),
+                "insert_rows_per_second": _rows_per_second(load, rows),
+                "unchanged_rows_per_second": _rows_per_second(load, rows),
+            }
+        )
+    return results
+
+
+def _cleanup(db) -> None:
+    commodity_ids = [c.id for c in db.query(Commodity).filter(Commodity.name.like(f"{BENCHMARK_PREFIX} %"))]
+    market_ids = [m.id for m in db.query(Market).filter(Market.name.like(f"{BENCHMARK_PREFIX} %"))]
+    db.query(PriceEntry).filter(PriceEntry.commodity_id.in_(commodity_ids)).delete(synchronize_session=False)
+    db.query(Commodity).filter(Commodity.id.in_(commodity_ids)).delete(synchronize_session=False)
+    db.query(Market).filter(Market.id.in_(market_ids)).delete(synchronize_session=False)
+    db.commit()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark price entry loaders (rows per second).")
+    parser.add_argument(
+        "--database-url",
+        default="sqlite://",
+        help="Scratch database to load into (default: in-memory SQLite). Benchmark rows are removed afterwards.",
+    )
+    parser.add_argument("--days", type=int, default=5, help="Report dates backfilled per loader.")
+    parser.add_argument("--commodities", type=int, default=60, help="Synthetic commodities per report.")
+    parser.add_argument("--markets", type=int, default=40, help="Synthetic markets per report.")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Rows per statement for the bulk upsert loader.")
+    args = parser.parse_args()
+
+    db = _create_session(args.database_url)
+    try:
+        _cleanup(db)
+        commodity_ids, market_ids = _seed_dimensions(db, args.commodities, args.markets)
+        report = {
+            "dialect": db.bind.dialect.name,
+            "loaders": benchmark_loaders(db, args.days, commodity_ids, market_ids, args.chunk_size),
+        }
+        _cleanup(db)
+    finally:
+        db.close()
+
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,226 @@
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from statistics import median
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pdfplumber
+from pdfplumber.utils import extract_words as extract_words_from_chars
+
+from app.scraper.parser import PriceParser
+
+
+def _resolve_pdfs(paths: list[str]) -> list[Path]:
+    pdfs: list[Path] = []
+    for raw in paths or ["downloads"]:
+        path = Path(raw)
+        if path.is_dir():
+            pdfs.extend(sorted(path.glob("*.pdf")))
+        elif path.suffix.lower() == ".pdf" and path.exists():
+            pdfs.append(path)
+    return pdfs
+
+
+def _time_call(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started_at)
+    return median(timings)
+
+
+def _legacy_extraction(pdf_path: Path) -> None:
+    """Replay the pre-single-pass extraction calls: text for the date, then text and words per page."""
+    with pdfplumber.open(pdf_path) as pdf:
+        for i in range(min(2, len(pdf.pages))):
+            pdf.pages[i].extract_text()
+        for page in pdf.pages:
+            page.extract_text()
+            page.extract_words()
+
+
+def _single_pass_extraction(parser: PriceParser, pdf_path: Path) -> None:
+    """Run the parser's own extraction: one char scan per page, words only for the table region."""
+    with pdfplumber.open(pdf_path) as pdf:
+        for page in pdf.pages:
+            parser._scan_page(page)
+            page.close()
+
+
+def benchmark_extraction(pdfs: list[Path], repeat: int) -> list[dict]:
+    parser = PriceParser()
+    results = []
+    for pdf_path in pdfs:
+        legacy = _time_call(lambda: _legacy_extraction(pdf_path), repeat)
+        single_pass = _time_call(lambda: _single_pass_extraction(parser, pdf_path), repeat)
+        parse = _time_call(lambda: parser.parse_daily_retail_range(str(pdf_path)), repeat)
+        results.append(
+            {
+                "pdf": pdf_path.name,
+                "legacy_extraction_seconds": round(legacy, 4),
+                "single_pass_extraction_seconds": round(single_pass, 4),
+                "extraction_saving_pct": round((1 - single_pass / legacy) * 100, 1) if legacy else None,
+                "parse_seconds": round(parse, 4),
+            }
+        )
+    return results
+
+
+def _load_fixture_pages(fixtures_dir: Path) -> list[tuple[str, list[dict]]]:
+    pages = []
+    for fixture_path in sorted(fixtures_dir.glob("*.json")):
+        payload = json.loads(fixture_path.read_text(encoding="utf-8"))
+        for page in payload.get("pages", []):
+            pages.append((fixture_path.stem, page["words"]))
+    return pages
+
+
+def _legacy_assign_columns(lines: list, col_centers: list[float], market_boundary: float) -> list:
+    """Per-token nearest-center search used before batched assignment."""
+    assignments = []
+    for line in lines:
+        line_columns = []
+        for w in line:
+            if w["x0"] < market_boundary:
+                line_columns.append(None)
+            else:
+                distances = [abs(w["x0"] - c) for c in col_centers]
+                line_columns.append(distances.index(min(distances)))
+        assignments.append(line_columns)
+    return assignments
+
+
+def benchmark_column_assignment(fixtures_dir: Path, repeat: int, iterations: int = 200) -> list[dict]:
+    parser = PriceParser()
+    results = []
+    for name, words in _load_fixture_pages(fixtures_dir):
+        lines = parser._group_words_by_line(words)
+        header_idx = parser._find_header_line_index(lines)
+        if header_idx is None:
+            continue
+        data_lines = lines[parser._find_first_data_line_index(lines, header_idx + 1) :]
+        col_centers = parser._derive_column_centers(data_lines)
+        midpoints = parser._column_midpoints(col_centers)
+        market_boundary = col_centers[0] - 40
+
+        legacy_assignments = _legacy_assign_columns(data_lines, col_centers, market_boundary)
+        batched_assignments = parser._assign_columns(data_lines, midpoints, market_boundary)
+        legacy = _time_call(
+            lambda: [_legacy_assign_columns(data_lines, col_centers, market_boundary) for _ in range(iterations)],
+            repeat,
+        )
+        batched = _time_call(
+            lambda: [parser._assign_columns(data_lines, midpoints, market_boundary) for _ in range(iterations)],
+            repeat,
+        )
+        results.append(
+            {
+                "fixture": name,
+                "tokens": sum(len(line) for line in data_lines),
+                "columns": len(col_centers),
+                "assignments_match": legacy_assignments == batched_assignments,
+                "legacy_us_per_page": round(legacy / iterations * 1e6, 1),
+                "batched_us_per_page": round(batched / iterations * 1e6, 1),
+            }
+        )
+    return results
+
+
+def _fixture_chars(words: list[dict]) -> list[dict]:
+    """Rebuild per-character objects (plus a trailing blank) from a fixture's word dump."""
+    chars = []
+    for w in words:
+        width = (w["x1"] - w["x0"]) / len(w["text"])
+        spans = [(c, w["x0"] + i * width, w["x0"] + (i + 1) * width) for i, c in enumerate(w["text"])]
+        for text, x0, x1 in spans + [(" ", w["x1"], w["x1"])]:
+            chars.append(
+                {
+                    "text": text,
+                    "x0": x0,
+                    "x1": x1,
+                    "top": w["top"],
+                    "bottom": w["bottom"],
+                    "doctop": w["top"],
+                    "upright": True,
+                }
+            )
+    return chars
+
+
+def _time_cropping(parser: PriceParser, page, iterations: int, repeat: int) -> dict:
+    full = _time_call(
+        lambda: [parser._group_words_by_line(extract_words_from_chars(page.chars)) for _ in range(iterations)], repeat
+    )
+    cropped = _time_call(lambda: [parser._scan_page(page) for _ in range(iterations)], repeat)
+    return {
+        "chars": len(page.chars),
+        "table_words": sum(len(line) for line in parser._scan_page(page).lines),
+        "full_page_ms": round(full / iterations * 1e3, 3),
+        "cropped_ms": round(cropped / iterations * 1e3, 3),
+        "saving_pct": round((1 - cropped / full) * 100, 1) if full else None,
+    }
+
+
+def benchmark_cropping(fixtures_dir: Path, repeat: int, iterations: int = 50) -> list[dict]:
+    """Time full-page word extraction against the char scan plus table-only extraction."""
+    parser = PriceParser()
+    results = []
+    for name, words in _load_fixture_pages(fixtures_dir):
+        page = SimpleNamespace(chars=_fixture_chars(words))
+        results.append({"fixture": name, **_time_cropping(parser, page, iterations, repeat)})
+        # The same page without its table, standing in for cover and notes pages.
+        header_top = min((w["top"] for w in words if w["text"] == "MARKET"), default=None)
+        if header_top is not None:
+            preamble = SimpleNamespace(chars=_fixture_chars([w for w in words if w["top"] < header_top - 3]))
+            results.append({"fixture": f"{name} (no table)", **_time_cropping(parser, preamble, iterations, repeat)})
+    return results
+
+
+def benchmark_pdf_cropping(pdfs: list[Path], repeat: int, iterations: int = 10) -> list[dict]:
+    parser = PriceParser()
+    results = []
+    for pdf_path in pdfs:
+        with pdfplumber.open(pdf_path) as pdf:
+            for page_number, page in enumerate(pdf.pages, start=1):
+                page.chars  # load layout objects up front so only extraction is timed
+                results.append(
+                    {"pdf": pdf_path.name, "page": page_number, **_time_cropping(parser, page, iterations, repeat)}
+                )
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark PDF parsing on local DA price PDFs.")
+    parser.add_argument("paths", nargs="*", help="PDF files or directories of PDFs (default: downloads/).")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement; the median is reported.")
+    parser.add_argument(
+        "--fixtures",
+        type=Path,
+        help="Directory of parser regression fixtures (JSON word dumps) for in-memory micro-benchmarks.",
+    )
+    args = parser.parse_args()
+
+    report = {}
+    if args.fixtures:
+        report["column_assignment"] = benchmark_column_assignment(args.fixtures, args.repeat)
+        report["cropping"] = benchmark_cropping(args.fixtures, args.repeat)
+    if args.paths or not args.fixtures:
+        pdfs = _resolve_pdfs(args.paths)
+        if not pdfs:
+            print("No PDFs found to benchmark.", file=sys.stderr)
+            return 1
+        report["extraction"] = benchmark_extraction(pdfs, args.repeat)
+        report["pdf_cropping"] = benchmark_pdf_cropping(pdfs, args.repeat)
+
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
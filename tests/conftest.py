@@ -12,7 +12,7 @@ from sqlalchemy.pool import StaticPool
 
 from app.core.config import settings
 from app.db.base_class import Base
-from app.db.session import get_db
+from app.db.session import enable_sqlite_savepoints, get_db
 from app.main import app
 
 TEST_API_KEY = "test-api-key"
@@ -28,6 +28,8 @@ if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
     engine_kwargs["poolclass"] = StaticPool
 
 engine = create_engine(SQLALCHEMY_DATABASE_URL, **engine_kwargs)
+if engine.dialect.name == "sqlite":
+    enable_sqlite_savepoints(engine)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
@@ -46,6 +48,27 @@ def configure_test_api_key():
         settings.API_KEY = original_api_key
         settings.SERVICE_API_KEYS = original_service_api_keys
         settings.ADMIN_API_KEYS = original_admin_api_keys
+
+
+SCRAPER_STATE_DIRS = {"PARSE_CACHE_DIR": "parse-cache", "HTTP_CACHE_DIR": "http-cache", "PDF_STORE_DIR": "pdf-store"}
+
+
+@pytest.fixture(autouse=True)
+def isolate_scraper_state(tmp_path_factory):
+    """
+    Point the parse cache, HTTP validator cache and PDF store at a fresh directory per test.
+
+    It lives outside ``tmp_path`` so tests can inspect their own download directories.
+    """
+    state_dir = tmp_path_factory.mktemp("scraper-state")
+    originals = {name: getattr(settings, name) for name in SCRAPER_STATE_DIRS}
+    for name, dirname in SCRAPER_STATE_DIRS.items():
+        setattr(settings, name, str(state_dir / dirname))
+    try:
+        yield
+    finally:
+        for name, value in originals.items():
+            setattr(settings, name, value)
 
 
 @pytest.fixture
@@ -2,7 +2,7 @@
 Tests for API endpoints.
 """
 
-from datetime import UTC, date, datetime
+from datetime import UTC, date, datetime, timedelta
 from decimal import Decimal
 from uuid import uuid4
 
@@ -803,3 +803,34 @@ class TestAdminAPI:
         assert data["items"][0]["task_name"] == "scrape_daily_prices"
         assert data["items"][0]["anomaly_count"] == 1
         assert data["items"][0]["anomaly_flags"] == ["duplicate_entries_in_source:2"]
+
+    def test_ingestion_run_performance_reports_percentiles(self, client, db_session, admin_auth_headers):
+        from app.models.ingestion_run import IngestionRun
+
+        now = datetime.now(UTC).replace(tzinfo=None)
+        runs = [
+            IngestionRun(
+                task_name="scrape_daily_prices",
+                status="success",
+                parse_seconds=float(seconds),
+                rows_per_second=100.0,
+                anomaly_flags=[],
+                started_at=now - timedelta(hours=hours_ago),
+                finished_at=now - timedelta(hours=hours_ago),
+            )
+            for seconds, hours_ago in ((1, 1), (2, 2), (3, 3), (4, 4), (5, 5), (60, 48))
+        ]
+        db_session.add_all(runs)
+        db_session.commit()
+
+        response = client.get(
+            "/api/v1/admin/ingestion-runs/performance",
+            params={"window_hours": 24},
+            headers=admin_auth_headers,
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["run_count"] == 5
+        assert data["metrics"]["parse_seconds"] == {"p50": 3.0, "p95": 4.8}
+        assert data["metrics"]["rows_per_second"] == {"p50": 100.0, "p95": 100.0}
+        assert data["metrics"]["download_seconds"] == {"p50": None, "p95": None}
@@ -0,0 +1,57 @@
+import json
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from scripts import backfill_prices
+
+URLS = ["https://example.com/a.pdf", "https://example.com/b.pdf"]
+
+
+@pytest.fixture
+def backfill_argv(db_session, monkeypatch, tmp_path):
+    """Run the local executor over URLS against the test database and return the checkpoint path."""
+    monkeypatch.setattr(
+        backfill_prices, "SessionLocal", sessionmaker(autocommit=False, autoflush=False, bind=db_session.bind)
+    )
+    checkpoint_path = tmp_path / "checkpoint.json"
+    argv = ["backfill_prices.py", "--executor", "local", "--checkpoint", str(checkpoint_path)]
+    for url in URLS:
+        argv += ["--url", url]
+    monkeypatch.setattr("sys.argv", argv)
+    return checkpoint_path
+
+
+def test_resumed_backfill_retries_reports_skipped_for_a_held_lock(backfill_argv, monkeypatch):
+    # Another worker holds b.pdf during the first run and has released it by the second.
+    outcomes = {"https://example.com/a.pdf": ["success"], "https://example.com/b.pdf": ["skipped", "success"]}
+    calls = []
+
+    def _scrape(target, pdf_path=None, prefer_stored=True):
+        calls.append(target)
+        return {"status": outcomes[target].pop(0), "url": target}
+
+    monkeypatch.setattr(backfill_prices, "_scrape_locally", _scrape)
+
+    assert backfill_prices.main() == 1
+    checkpoint = json.loads(backfill_argv.read_text(encoding="utf-8"))
+    assert checkpoint["results"]["https://example.com/b.pdf"]["status"] == "skipped"
+
+    assert backfill_prices.main() == 0
+    assert calls == [*URLS, "https://example.com/b.pdf"]
+
+
+def test_rerun_after_a_completed_backfill_ingests_the_reports_again(backfill_argv, monkeypatch):
+    calls = []
+
+    def _scrape(target, pdf_path=None, prefer_stored=True):
+        calls.append(target)
+        return {"status": "success", "url": target}
+
+    monkeypatch.setattr(backfill_prices, "_scrape_locally", _scrape)
+
+    assert backfill_prices.main() == 0
+    assert not backfill_argv.exists()
+
+    assert backfill_prices.main() == 0
+    assert calls == [*URLS, *URLS]
@@ -1,8 +1,11 @@
 from datetime import date
+from types import SimpleNamespace
 
 from app.models.ingestion_run import IngestionRun
+from app.models.price_entry import PriceEntry
 from app.scraper.discovery import discover_and_scrape
 from app.scraper.tasks import scrape_daily_prices
+from app.services.ingestion_run_service import IngestionRunService
 
 
 def _session_factory(bind):
@@ -18,7 +21,9 @@ def test_scrape_task_records_successful_ingestion_run(db_session, monkeypatch, t
     pdf_path.write_bytes(b"%PDF-1.4 test")
 
     monkeypatch.setattr("app.scraper.tasks.SessionLocal", session_factory)
-    monkeypatch.setattr("app.scraper.tasks.PDFDownloader.download_pdf_sync", lambda self, url: pdf_path)
+    monkeypatch.setattr(
+        "app.scraper.tasks.PDFDownloader.download_pdf_sync", lambda self, url, prefer_stored=False: pdf_path
+    )
     monkeypatch.setattr(
         "app.scraper.tasks.PriceParser.parse_daily_prevailing",
         lambda self, path: [
@@ -61,7 +66,7 @@ def test_scrape_task_records_failed_ingestion_run(db_session, monkeypatch):
     session_factory = _session_factory(db_session.bind)
     monkeypatch.setattr("app.scraper.tasks.SessionLocal", session_factory)
 
-    def _raise_download_error(self, url):
+    def _raise_download_error(self, url, prefer_stored=False):
         from app.core.exceptions import PDFDownloadError
 
         raise PDFDownloadError(url=url, reason="network down")
@@ -87,7 +92,9 @@ def test_scrape_task_records_anomalies_for_duplicate_rows(db_session, monkeypatc
     pdf_path.write_bytes(b"%PDF-1.4 test")
 
     monkeypatch.setattr("app.scraper.tasks.SessionLocal", session_factory)
-    monkeypatch.setattr("app.scraper.tasks.PDFDownloader.download_pdf_sync", lambda self, url: pdf_path)
+    monkeypatch.setattr(
+        "app.scraper.tasks.PDFDownloader.download_pdf_sync", lambda self, url, prefer_stored=False: pdf_path
+    )
     monkeypatch.setattr(
         "app.scraper.tasks.PriceParser.parse_daily_prevailing",
         lambda self, path: [
@@ -143,17 +150,732 @@ def test_discovery_task_records_run(db_session, monkeypatch):
         "app.scraper.discovery.MonitoringSource.get_new_pdf_links",
         lambda processed_files: ["https://example.com/a.pdf"],
     )
-    monkeypatch.setattr("app.scraper.discovery.scrape_daily_prices.delay", lambda url: delay_calls.append(url))
+    monkeypatch.setattr(
+        "app.scraper.discovery.scrape_pipeline",
+        lambda url, task_id=None, pdf_path=None: SimpleNamespace(
+            apply_async=lambda: delay_calls.append((url, task_id))
+        ),
+    )
 
     result = discover_and_scrape.apply().get()
 
     verification_session = session_factory()
     try:
-        run = verification_session.query(IngestionRun).one()
+        run = verification_session.query(IngestionRun).filter(IngestionRun.task_name == "discover_and_scrape").one()
+        queued = verification_session.query(IngestionRun).filter(IngestionRun.task_name == "scrape_daily_prices").one()
         assert result["status"] == "success"
-        assert run.task_name == "discover_and_scrape"
         assert run.status == "success"
         assert run.entries_processed == 1
-        assert delay_calls == ["https://example.com/a.pdf"]
+        assert (queued.status, queued.source_file) == ("queued", "a.pdf")
+        assert delay_calls == [("https://example.com/a.pdf", queued.task_id)]
+    finally:
+        verification_session.close()
+
+
+def _hold_source_file(session_factory, task_id: str, url: str) -> str:
+    db = session_factory()
+    try:
+        run = IngestionRunService.start_run(
+            db,
+            task_name="scrape_daily_prices",
+            task_id=task_id,
+            source_url=url,
+            source_file=url.split("/")[-1],
+        )
+        return str(run.id)
+    finally:
+        db.close()
+
+
+def test_discovery_skips_reports_already_in_flight(db_session, monkeypatch):
+    session_factory = _session_factory(db_session.bind)
+    _hold_source_file(session_factory, "running-task", "https://example.com/a.pdf")
+    seen_processed_files = []
+    delay_calls = []
+
+    def _new_links(processed_files):
+        seen_processed_files.extend(processed_files)
+        return ["https://example.com/a.pdf", "https://example.com/b.pdf"]
+
+    monkeypatch.setattr("app.scraper.discovery.SessionLocal", session_factory)
+    monkeypatch.setattr("app.scraper.discovery.get_processed_files", lambda: [])
+    monkeypatch.setattr("app.scraper.discovery.MonitoringSource.get_new_pdf_links", _new_links)
+    monkeypatch.setattr(
+        "app.scraper.discovery.scrape_pipeline",
+        lambda url, task_id=None, pdf_path=None: SimpleNamespace(apply_async=lambda: delay_calls.append(url)),
+    )
+
+    result = discover_and_scrape.apply().get()
+
+    assert seen_processed_files == ["a.pdf"]
+    # a.pdf is claimed between listing and queueing, so only b.pdf is queued.
+    assert result["processed"] == 1
+    assert delay_calls == ["https://example.com/b.pdf"]
+
+
+def test_scrape_task_bails_out_while_another_worker_holds_the_file(db_session, monkeypatch):
+    session_factory = _session_factory(db_session.bind)
+    holder_id = _hold_source_file(session_factory, "other-worker", "https://example.com/sample.pdf")
+
+    def _download(self, url, prefer_stored=False):
+        raise AssertionError("a skipped scrape must not download")
+
+    monkeypatch.setattr("app.scraper.tasks.SessionLocal", session_factory)
+    monkeypatch.setattr("app.scraper.tasks.PDFDownloader.download_pdf_sync", _download)
+
+    result = scrape_daily_prices.apply(args=["https://example.com/sample.pdf"]).get()
+
+    verification_session = session_factory()
+    try:
+        run = verification_session.query(IngestionRun).filter(IngestionRun.task_id != "other-worker").one()
+        assert result == {"status": "skipped", "url": "https://example.com/sample.pdf", "entries": 0}
+        assert run.status == "skipped"
+        assert holder_id in run.error_message
+    finally:
+        verification_session.close()
+
+
+def test_stale_in_flight_run_does_not_block_a_new_scrape(db_session, monkeypatch):
+    _hold_source_file(_session_factory(db_session.bind), "crashed-worker", "https://example.com/sample.pdf")
+    monkeypatch.setattr("app.services.ingestion_run_service.settings.INGESTION_LOCK_TTL_SECONDS", -1)
+
+    run, claimed = IngestionRunService.claim_run(
+        db_session,
+        task_name="scrape_daily_prices",
+        task_id="new-worker",
+        source_url="https://example.com/sample.pdf",
+        source_file="sample.pdf",
+    )
+
+    assert claimed
+    assert run.status == "running"
+
+
+def test_scrape_task_reuses_parse_cache_for_identical_pdf(db_session, monkeypatch, tmp_path):
+    session_factory = _session_factory(db_session.bind)
+    pdf_path = tmp_path / "sample.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 test")
+    parse_calls = []
+
+    def _parse(self, path):
+        parse_calls.append(path)
+        return [
+            {
+                "commodity": "Bangus",
+                "category": "Fish",
+                "unit": "kg",
+                "market": "Test Market",
+                "price_low": 100.0,
+                "price_high": 120.0,
+                "price_prevailing": 110.0,
+                "price_average": None,
+                "report_date": date(2025, 1, 20),
+                "report_type": "DAILY_RETAIL",
+            }
+        ]
+
+    monkeypatch.setattr("app.scraper.tasks.SessionLocal", session_factory)
+    monkeypatch.setattr(
+        "app.scraper.tasks.PDFDownloader.download_pdf_sync", lambda self, url, prefer_stored=False: pdf_path
+    )
+    monkeypatch.setattr("app.scraper.tasks.os.remove", lambda path: None)
+    monkeypatch.setattr("app.scraper.tasks.PriceParser.parse_daily_prevailing", _parse)
+
+    scrape_daily_prices.apply(args=["https://example.com/sample.pdf"]).get()
+    scrape_daily_prices.apply(args=["https://example.com/sample.pdf"]).get()
+
+    verification_session = session_factory()
+    try:
+        runs = verification_session.query(IngestionRun).order_by(IngestionRun.started_at).all()
+        assert len(parse_calls) == 1
+        assert [run.entries_skipped for run in runs] == [0, 1]
+    finally:
+        verification_session.close()
+
+
+def test_local_report_ingests_archive_file_without_downloading(db_session, monkeypatch, tmp_path):
+    from app.scraper.tasks import ingest_local_report
+
+    session_factory = _session_factory(db_session.bind)
+    pdf_path = tmp_path / "Price-Monitoring-January-20-2025.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 archive")
+
+    def _download(self, url, prefer_stored=False):
+        raise AssertionError("offline ingestion must not download")
+
+    monkeypatch.setattr("app.scraper.tasks.SessionLocal", session_factory)
+    monkeypatch.setattr("app.scraper.tasks.PDFDownloader.download_pdf_sync", _download)
+    monkeypatch.setattr(
+        "app.scraper.tasks.PriceParser.parse_daily_prevailing",
+        lambda self, path: [
+            {
+                "commodity": "Bangus",
+                "category": "Fish",
+                "unit": "kg",
+                "market": "Test Market",
+                "price_low": 100.0,
+                "price_high": 120.0,
+                "price_prevailing": 110.0,
+                "price_average": None,
+                "report_date": date(2025, 1, 20),
+                "report_type": "DAILY_RETAIL",
+            }
+        ],
+    )
+
+    result = ingest_local_report.apply(args=[str(pdf_path)]).get()
+
+    verification_session = session_factory()
+    try:
+        run = verification_session.query(IngestionRun).one()
+        entry = verification_session.query(PriceEntry).one()
+        assert result["status"] == "success"
+        assert (run.status, run.source_file) == ("success", pdf_path.name)
+        assert entry.source_file == pdf_path.name
+        assert pdf_path.exists()
+    finally:
+        verification_session.close()
+
+
+def test_discovery_prefetches_new_reports_and_pipeline_adopts_them(db_session, monkeypatch, tmp_path):
+    from app.scraper.downloader import DownloadResult
+
+    session_factory = _session_factory(db_session.bind)
+    pdf_path = tmp_path / "a.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 prefetched")
+    prefetch_calls = []
+    pipelines = []
+
+    def _download_many(self, urls, per_host_limit=None):
+        prefetch_calls.append(list(urls))
+        return [
+            DownloadResult(url=urls[0], path=pdf_path, bytes=pdf_path.stat().st_size),
+            DownloadResult(url=urls[1], error="HTTP 503"),
+        ]
+
+    def _download(self, url, prefer_stored=False):
+        raise AssertionError("a prefetched report must not be downloaded again")
+
+    monkeypatch.setattr("app.scraper.discovery.settings.INGESTION_PREFETCH_PDFS", True)
+    monkeypatch.setattr("app.scraper.discovery.SessionLocal", session_factory)
+    monkeypatch.setattr("app.scraper.discovery.get_processed_files", lambda: [])
+    monkeypatch.setattr(
+        "app.scraper.discovery.MonitoringSource.get_new_pdf_links",
+        lambda processed_files: ["https://example.com/a.pdf", "https://example.com/b.pdf"],
+    )
+    monkeypatch.setattr("app.scraper.discovery.PDFDownloader.download_many_sync", _download_many)
+    monkeypatch.setattr(
+        "app.scraper.discovery.scrape_pipeline",
+        lambda url, task_id=None, pdf_path=None: SimpleNamespace(
+            apply_async=lambda: pipelines.append((url, task_id, pdf_path))
+        ),
+    )
+
+    discover_and_scrape.apply().get()
+
+    assert prefetch_calls == [["https://example.com/a.pdf", "https://example.com/b.pdf"]]
+    # b.pdf failed to prefetch, so its pipeline downloads it as usual.
+    assert [(url, path) for url, _, path in pipelines] == [
+        ("https://example.com/a.pdf", str(pdf_path)),
+        ("https://example.com/b.pdf", None),
+    ]
+
+    monkeypatch.setattr("app.scraper.tasks.SessionLocal", session_factory)
+    monkeypatch.setattr("app.scraper.tasks.PDFDownloader.download_pdf_sync", _download)
+    monkeypatch.setattr("app.scraper.tasks.PriceParser.parse_daily_prevailing", lambda self, path: [])
+
+    url, task_id, prefetched_path = pipelines[0]
+    result = scrape_daily_prices.apply(args=[url, prefetched_path], task_id=task_id).get()
+
+    assert result["status"] == "empty"
+    assert not pdf_path.exists()
+
+
+def test_discovery_failure_releases_runs_it_never_dispatched(db_session, monkeypatch):
+    session_factory = _session_factory(db_session.bind)
+
+    def _download_many(self, urls, per_host_limit=None):
+        raise RuntimeError("prefetch crashed")
+
+    monkeypatch.setattr("app.scraper.discovery.settings.INGESTION_PREFETCH_PDFS", True)
+    monkeypatch.setattr("app.scraper.discovery.SessionLocal", session_factory)
+    monkeypatch.setattr("app.scraper.discovery.get_processed_files", lambda: [])
+    monkeypatch.setattr(
+        "app.scraper.discovery.MonitoringSource.get_new_pdf_links",
+        lambda processed_files: ["https://example.com/a.pdf", "https://example.com/b.pdf"],
+    )
+    monkeypatch.setattr("app.scraper.discovery.PDFDownloader.download_many_sync", _download_many)
+
+    result = discover_and_scrape.apply()
+
+    verification_session = session_factory()
+    try:
+        scrapes = verification_session.query(IngestionRun).filter(IngestionRun.task_name == "scrape_daily_prices").all()
+        assert result.failed()
+        assert [run.status for run in scrapes] == ["failed", "failed"]
+        assert all("prefetch crashed" in run.error_message for run in scrapes)
+        assert IngestionRunService.get_in_flight_source_files(verification_session) == []
     finally:
         verification_session.close()
+
+
+def test_scrape_task_records_stage_performance(db_session, monkeypatch, tmp_path):
+    session_factory = _session_factory(db_session.bind)
+    pdf_path = tmp_path / "sample.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 performance")
+
+    monkeypatch.setattr("app.scraper.tasks.SessionLocal", session_factory)
+    monkeypatch.setattr(
+        "app.scraper.tasks.PDFDownloader.download_pdf_sync", lambda self, url, prefer_stored=False: pdf_path
+    )
+    monkeypatch.setattr(
+        "app.scraper.tasks.PriceParser.parse_daily_prevailing",
+        lambda self, path: [
+            {
+                "commodity": "Bangus",
+                "category": "Fish",
+                "unit": "kg",
+                "market": "Test Market",
+                "price_low": 100.0,
+                "price_high": 120.0,
+                "price_prevailing": 110.0,
+                "price_average": None,
+                "report_date": date(2025, 1, 20),
+                "report_type": "DAILY_RETAIL",
+            }
+        ],
+    )
+
+    scrape_daily_prices.apply(args=["https://example.com/sample.pdf"]).get()
+
+    verification_session = session_factory()
+    try:
+        run = verification_session.query(IngestionRun).one()
+        assert run.pdf_bytes == len(b"%PDF-1.4 performance")
+        assert all(value >= 0 for value in (run.download_seconds, run.parse_seconds, run.load_seconds))
+        assert run.rows_per_second > 0
+        assert run.peak_rss_bytes is None or run.peak_rss_bytes > 0
+    finally:
+        verification_session.close()
+
+
+def test_scrape_task_records_peak_rss_per_run_not_for_the_worker_lifetime(db_session, monkeypatch, tmp_path):
+    import pytest
+
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+    except OSError:
+        pytest.skip("needs a resettable Linux RSS high-water mark")
+
+    session_factory = _session_factory(db_session.bind)
+    pdf_path = tmp_path / "sample.pdf"
+    ballast_bytes = 64 * 1024 * 1024
+    parse_calls = []
+
+    def _download(self, url, prefer_stored=False):
+        pdf_path.write_bytes(b"%PDF-1.4 " + url.encode())
+        return pdf_path
+
+    def _parse(self, path):
+        parse_calls.append(path)
+        if len(parse_calls) == 1:
+            # Only the first report is large; the worker's lifetime peak stays at its size afterwards.
+            ballast = b"x" * ballast_bytes
+            del ballast
+        return []
+
+    monkeypatch.setattr("app.scraper.tasks.SessionLocal", session_factory)
+    monkeypatch.setattr("app.scraper.tasks.PDFDownloader.download_pdf_sync", _download)
+    monkeypatch.setattr("app.scraper.tasks.PriceParser.parse_daily_prevailing", _parse)
+
+    scrape_daily_prices.apply(args=["https://example.com/large.pdf"]).get()
+    scrape_daily_prices.apply(args=["https://example.com/small.pdf"]).get()
+
+    verification_session = session_factory()
+    try:
+        large, small = verification_session.query(IngestionRun).order_by(IngestionRun.started_at).all()
+        assert large.peak_rss_bytes - small.peak_rss_bytes > ballast_bytes // 2
+    finally:
+        verification_session.close()
+
+
+def test_scrape_task_persists_parse_stats(db_session, monkeypatch, tmp_path):
+    from app.scraper.parser import ParseStats
+
+    session_factory = _session_factory(db_session.bind)
+    pdf_path = tmp_path / "sample.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 stats")
+
+    def _parse(self, path):
+        self.last_stats = ParseStats(pages_total=2, pages_skipped=1, tokens_seen=40, rows_emitted=1, rows_rejected=3)
+        self.last_stats.stage_seconds["chars"] = 0.25
+        return [
+            {
+                "commodity": "Bangus",
+                "category": "Fish",
+                "unit": "kg",
+                "market": "Test Market",
+                "price_low": 100.0,
+                "price_high": 120.0,
+                "price_prevailing": 110.0,
+                "price_average": None,
+                "report_date": date(2025, 1, 20),
+                "report_type": "DAILY_RETAIL",
+            }
+        ]
+
+    monkeypatch.setattr("app.scraper.tasks.SessionLocal", session_factory)
+    monkeypatch.setattr(
+        "app.scraper.tasks.PDFDownloader.download_pdf_sync", lambda self, url, prefer_stored=False: pdf_path
+    )
+    monkeypatch.setattr("app.scraper.tasks.PriceParser.parse_daily_prevailing", _parse)
+
+    scrape_daily_prices.apply(args=["https://example.com/sample.pdf"]).get()
+
+    verification_session = session_factory()
+    try:
+        run = verification_session.query(IngestionRun).one()
+        assert run.parse_stats == {
+            "pages_total": 2,
+            "pages_skipped": 1,
+            "tokens_seen": 40,
+            "rows_emitted": 1,
+            "rows_rejected": 3,
+            "stage_seconds": {"chars": 0.25},
+        }
+    finally:
+        verification_session.close()
+
+
+def test_scrape_task_falls_back_to_row_upserts_when_bulk_chunk_fails(db_session, monkeypatch, tmp_path):
+    session_factory = _session_factory(db_session.bind)
+    pdf_path = tmp_path / "sample.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 fallback")
+    rows = [
+        {
+            "commodity": "Bangus",
+            "category": "Fish",
+            "unit": "kg",
+            "market": market,
+            "price_low": 100.0,
+            "price_high": 120.0,
+            "price_prevailing": 110.0,
+            "price_average": None,
+            "report_date": date(2025, 1, 20),
+            "report_type": "DAILY_RETAIL",
+        }
+        for market in ("Market A", "Market B", "Market C")
+    ]
+
+    def _failing_bulk_upsert(db, batch, loader, commit):
+        if len(batch) > 1:
+            raise RuntimeError("bulk statement rejected")
+        return {"inserted": len(batch), "updated": 0, "skipped": 0}
+
+    monkeypatch.setattr("app.scraper.tasks.settings.INGESTION_UPSERT_CHUNK_SIZE", 2)
+    monkeypatch.setattr("app.scraper.tasks.SessionLocal", session_factory)
+    monkeypatch.setattr(
+        "app.scraper.tasks.PDFDownloader.download_pdf_sync", lambda self, url, prefer_stored=False: pdf_path
+    )
+    monkeypatch.setattr("app.scraper.tasks.PriceParser.parse_daily_prevailing", lambda self, path: rows)
+    monkeypatch.setattr("app.scraper.tasks.PriceService.bulk_upsert_entries", _failing_bulk_upsert)
+
+    result = scrape_daily_prices.apply(args=["https://example.com/sample.pdf"]).get()
+
+    verification_session = session_factory()
+    try:
+        run = verification_session.query(IngestionRun).one()
+        assert result["status"] == "success"
+        # The first chunk of two went through upsert_entry, the last single row through the bulk path.
+        assert run.entries_processed == 3
+        assert run.entries_inserted == 3
+        assert verification_session.query(PriceEntry).count() == 2
+    finally:
+        verification_session.close()
+
+
+def test_scrape_task_rerun_of_unchanged_report_writes_nothing(db_session, monkeypatch, tmp_path):
+    from sqlalchemy import event
+
+    session_factory = _session_factory(db_session.bind)
+    pdf_path = tmp_path / "sample.pdf"
+    rows = [
+        {
+            "commodity": "Bangus",
+            "category": "Fish",
+            "unit": "kg",
+            "market": market,
+            "price_low": 100.0,
+            "price_high": 120.0,
+            "price_prevailing": 110.0,
+            "price_average": None,
+            "report_date": date(2025, 1, 20),
+            "report_type": "DAILY_RETAIL",
+        }
+        for market in ("Market A", "Market B", "Market C")
+    ]
+
+    def _download(self, url, prefer_stored=False):
+        # Each run downloads (and later removes) its own copy of the report.
+        pdf_path.write_bytes(b"%PDF-1.4 rerun")
+        return pdf_path
+
+    monkeypatch.setattr("app.scraper.tasks.SessionLocal", session_factory)
+    monkeypatch.setattr("app.scraper.tasks.PDFDownloader.download_pdf_sync", _download)
+    monkeypatch.setattr("app.scraper.tasks.PriceParser.parse_daily_prevailing", lambda self, path: rows)
+    scrape_daily_prices.apply(args=["https://example.com/sample.pdf"]).get()
+
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if "price_entries" in statement:
+            statements.append(statement.split()[0].upper())
+
+    event.listen(db_session.bind, "before_cursor_execute", _record)
+    try:
+        result = scrape_daily_prices.apply(args=["https://example.com/sample.pdf"]).get()
+    finally:
+        event.remove(db_session.bind, "before_cursor_execute", _record)
+
+    verification_session = session_factory()
+    try:
+        rerun = verification_session.query(IngestionRun).order_by(IngestionRun.started_at.desc()).first()
+        assert result["status"] == "success"
+        assert statements == ["SELECT"]
+        assert (rerun.entries_processed, rerun.entries_inserted, rerun.entries_updated, rerun.entries_skipped) == (
+            3,
+            0,
+            0,
+            3,
+        )
+    finally:
+        verification_session.close()
+
+
+def test_pipeline_stages_hand_off_by_reference_and_finish_one_run(db_session, monkeypatch, tmp_path):
+    import json
+
+    from app.core.celery_app import celery_app
+    from app.scraper.tasks import download_report, load_report, parse_report, scrape_pipeline
+
+    session_factory = _session_factory(db_session.bind)
+    pdf_path = tmp_path / "sample.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 pipeline")
+    rows = [
+        {
+            "commodity": "Bangus",
+            "category": "Fish",
+            "unit": "kg",
+            "market": "Test Market",
+            "price_low": 100.0,
+            "price_high": 120.0,
+            "price_prevailing": 110.0,
+            "price_average": None,
+            "report_date": date(2025, 1, 20),
+            "report_type": "DAILY_RETAIL",
+        }
+    ]
+
+    monkeypatch.setattr("app.scraper.tasks.SessionLocal", session_factory)
+    monkeypatch.setattr(
+        "app.scraper.tasks.PDFDownloader.download_pdf_sync", lambda self, url, prefer_stored=False: pdf_path
+    )
+    monkeypatch.setattr("app.scraper.tasks.PriceParser.parse_daily_prevailing", lambda self, path: rows)
+
+    # Each stage is applied on its own, as separate workers would run it.
+    job = download_report.apply(args=["https://example.com/sample.pdf"]).get()
+    job = parse_report.apply(args=[json.loads(json.dumps(job))]).get()
+    assert "Bangus" not in json.dumps(job)
+    assert job["parse_key"]
+    assert not pdf_path.exists()
+    result = load_report.apply(args=[json.loads(json.dumps(job))]).get()
+
+    verification_session = session_factory()
+    try:
+        run = verification_session.query(IngestionRun).one()
+        assert result["status"] == "success"
+        assert run.status == "success"
+        assert run.entries_inserted == 1
+        assert str(run.id) == job["run_id"]
+    finally:
+        verification_session.close()
+
+    stages = [signature.task for signature in scrape_pipeline("https://example.com/sample.pdf").tasks]
+    assert [celery_app.amqp.router.route({}, name)["queue"].name for name in stages] == ["io", "cpu", "db"]
+
+
+def test_pipeline_load_stage_failure_marks_run_failed(db_session, monkeypatch, tmp_path):
+    from app.scraper.tasks import download_report, load_report, parse_report
+
+    session_factory = _session_factory(db_session.bind)
+    pdf_path = tmp_path / "sample.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 pipeline failure")
+    rows = [
+        {
+            "commodity": "Bangus",
+            "category": "Fish",
+            "unit": "kg",
+            "market": "Test Market",
+            "price_low": 100.0,
+            "price_high": 120.0,
+            "price_prevailing": 110.0,
+            "price_average": None,
+            "report_date": date(2025, 1, 20),
+            "report_type": "DAILY_RETAIL",
+        }
+    ]
+
+    monkeypatch.setattr("app.scraper.tasks.SessionLocal", session_factory)
+    monkeypatch.setattr(
+        "app.scraper.tasks.PDFDownloader.download_pdf_sync", lambda self, url, prefer_stored=False: pdf_path
+    )
+    monkeypatch.setattr("app.scraper.tasks.PriceParser.parse_daily_prevailing", lambda self, path: rows)
+
+    job = parse_report.apply(args=[download_report.apply(args=["https://example.com/sample.pdf"]).get()]).get()
+    monkeypatch.setattr("app.scraper.tasks.ParseCache.get", lambda self, pdf_path, sha256=None: None)
+    result = load_report.apply(args=[job])
+
+    verification_session = session_factory()
+    try:
+        run = verification_session.query(IngestionRun).one()
+        assert result.failed()
+        assert run.status == "failed"
+        assert "no longer in the parse cache" in run.error_message
+    finally:
+        verification_session.close()
+
+
+def test_scrape_task_rolls_back_failed_chunk_before_row_retries(db_session, monkeypatch, tmp_path):
+    from sqlalchemy import event
+
+    from app.services.price_service import PriceService
+
+    session_factory = _session_factory(db_session.bind)
+    pdf_path = tmp_path / "sample.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 savepoint")
+    rows = [
+        {
+            "commodity": "Bangus",
+            "category": "Fish",
+            "unit": "kg",
+            "market": market,
+            "price_low": 100.0,
+            "price_high": 120.0,
+            "price_prevailing": 110.0,
+            "price_average": None,
+            "report_date": date(2025, 1, 20),
+            "report_type": "DAILY_RETAIL",
+        }
+        for market in ("Market A", "Market B", "Market C")
+    ]
+    bulk_upsert_entries = PriceService.bulk_upsert_entries
+
+    def _write_then_fail(db, batch, loader, commit):
+        bulk_upsert_entries(db, batch, loader=loader, commit=commit)
+        raise RuntimeError("chunk failed after writing")
+
+    commits = []
+
+    @event.listens_for(session_factory, "after_commit")
+    def _record_commit(session):
+        # Releasing a savepoint also fires after_commit; only count real COMMITs.
+        if not session.in_nested_transaction():
+            commits.append(session)
+
+    monkeypatch.setattr("app.scraper.tasks.settings.INGESTION_UPSERT_CHUNK_SIZE", 1)
+    monkeypatch.setattr("app.scraper.tasks.SessionLocal", session_factory)
+    monkeypatch.setattr(
+        "app.scraper.tasks.PDFDownloader.download_pdf_sync", lambda self, url, prefer_stored=False: pdf_path
+    )
+    monkeypatch.setattr("app.scraper.tasks.PriceParser.parse_daily_prevailing", lambda self, path: rows)
+    monkeypatch.setattr("app.scraper.tasks.PriceService.bulk_upsert_entries", _write_then_fail)
+
+    scrape_daily_prices.apply(args=["https://example.com/sample.pdf"]).get()
+
+    verification_session = session_factory()
+    try:
+        run = verification_session.query(IngestionRun).one()
+        # Savepoints discarded each chunk's writes, so every row retry was a fresh insert.
+        assert (run.entries_inserted, run.entries_skipped) == (3, 0)
+        assert verification_session.query(PriceEntry).count() == 3
+        assert run.commit_seconds is not None and run.commit_seconds >= 0
+        # Run start, commodity and market creation, the report itself and the run finish.
+        assert len(commits) == 5
+    finally:
+        verification_session.close()
+
+
+def test_scrape_task_leaves_no_rows_when_worker_dies_mid_report(db_session, monkeypatch, tmp_path):
+    from app.services.price_service import PriceService
+
+    class _WorkerLost(BaseException):
+        pass
+
+    session_factory = _session_factory(db_session.bind)
+    pdf_path = tmp_path / "sample.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 crash")
+    rows = [
+        {
+            "commodity": "Bangus",
+            "category": "Fish",
+            "unit": "kg",
+            "market": market,
+            "price_low": 100.0,
+            "price_high": 120.0,
+            "price_prevailing": 110.0,
+            "price_average": None,
+            "report_date": date(2025, 1, 20),
+            "report_type": "DAILY_RETAIL",
+        }
+        for market in ("Market A", "Market B", "Market C")
+    ]
+    bulk_upsert_entries = PriceService.bulk_upsert_entries
+    calls = []
+
+    def _die_on_second_chunk(db, batch, loader, commit):
+        calls.append(batch)
+        if len(calls) == 2:
+            raise _WorkerLost()
+        return bulk_upsert_entries(db, batch, loader=loader, commit=commit)
+
+    monkeypatch.setattr("app.scraper.tasks.settings.INGESTION_UPSERT_CHUNK_SIZE", 2)
+    monkeypatch.setattr("app.scraper.tasks.SessionLocal", session_factory)
+    monkeypatch.setattr(
+        "app.scraper.tasks.PDFDownloader.download_pdf_sync", lambda self, url, prefer_stored=False: pdf_path
+    )
+    monkeypatch.setattr("app.scraper.tasks.PriceParser.parse_daily_prevailing", lambda self, path: rows)
+    monkeypatch.setattr("app.scraper.tasks.PriceService.bulk_upsert_entries", _die_on_second_chunk)
+
+    try:
+        scrape_daily_prices.apply(args=["https://example.com/sample.pdf"], throw=True)
+    except _WorkerLost:
+        pass
+
+    verification_session = session_factory()
+    try:
+        assert len(calls) == 2
+        assert verification_session.query(PriceEntry).count() == 0
+    finally:
+        verification_session.close()
+
+
+def test_scrape_task_claims_the_run_discovery_queued(db_session):
+    queued = IngestionRunService.queue_run(
+        db_session,
+        task_name="scrape_daily_prices",
+        task_id="queued-task",
+        source_url="https://example.com/sample.pdf",
+        source_file="sample.pdf",
+    )
+
+    run, claimed = IngestionRunService.claim_run(
+        db_session,
+        task_name="scrape_daily_prices",
+        task_id="queued-task",
+        source_url="https://example.com/sample.pdf",
+        source_file="sample.pdf",
+    )
+
+    assert claimed
+    assert (run.id, run.status) == (queued.id, "running")
@@ -2,6 +2,8 @@
 Unit tests for MarketService.
 """
 
+from unittest.mock import patch
+
 from sqlalchemy.exc import IntegrityError
 
 from app.models.market import Market
@@ -123,3 +125,38 @@ class TestMarketService:
             db_session.rollback()
         else:
             raise AssertionError("Expected case-insensitive unique constraint to reject duplicate market name")
+
+    def test_get_by_names_case_insensitive(self, db_session, sample_market):
+        """Test bulk fetch matches names regardless of case and spacing."""
+        db_session.add(Market(name="Kamuning Market", region="NCR"))
+        db_session.commit()
+
+        results = MarketService.get_by_names(db_session, [sample_market.name.upper(), " kamuning  market", "Unknown"])
+
+        assert {m.name for m in results} == {sample_market.name, "Kamuning Market"}
+        assert MarketService.get_by_names(db_session, []) == []
+
+    def test_get_or_create_many_creates_missing_markets(self, db_session, sample_market):
+        """Test bulk resolution reuses existing markets and creates each new name once."""
+        names = [sample_market.name.upper(), "Kamuning Market", "kamuning market", "Divisoria"]
+
+        resolved = MarketService.get_or_create_many(db_session, names)
+
+        assert resolved[sample_market.name.upper()].id == sample_market.id
+        assert resolved["Kamuning Market"].id == resolved["kamuning market"].id
+        assert resolved["Divisoria"].name == "Divisoria"
+        assert db_session.query(Market).count() == 3
+
+    def test_get_or_create_many_reselects_names_created_concurrently(self, db_session):
+        """Test names inserted by another writer after the lookup are re-selected."""
+        db_session.add(Market(name="Kamuning Market", region="NCR"))
+        db_session.commit()
+        get_by_names = MarketService.get_by_names
+
+        # The first lookup misses, as if the row was committed right after it.
+        with patch.object(MarketService, "get_by_names", side_effect=[[], get_by_names(db_session, ["Kamuning Market"])]):
+            resolved = MarketService.get_or_create_many(db_session, ["Kamuning Market", "Divisoria"])
+
+        assert resolved["Kamuning Market"].region == "NCR"
+        assert resolved["Divisoria"].name == "Divisoria"
+        assert db_session.query(Market).count() == 2
@@ -0,0 +1,78 @@
+from datetime import date
+
+from app.scraper.parse_cache import ParseCache, hash_file
+
+ROWS = [
+    {
+        "commodity": "Bangus",
+        "category": "Fish",
+        "unit": "kg",
+        "market": "Test Market",
+        "price_low": 100.0,
+        "price_high": 120.0,
+        "price_prevailing": 110.0,
+        "price_average": None,
+        "report_date": date(2025, 1, 20),
+        "report_type": "DAILY_RETAIL",
+    }
+]
+
+
+def _write_pdf(path, payload: bytes):
+    path.write_bytes(b"%PDF-1.4 " + payload)
+    return path
+
+
+def test_parse_cache_round_trips_rows(tmp_path):
+    cache = ParseCache(cache_dir=tmp_path / "cache")
+    pdf_path = _write_pdf(tmp_path / "report.pdf", b"same bytes")
+
+    assert cache.get(pdf_path) is None
+    assert cache.put(pdf_path, ROWS) == hash_file(pdf_path)
+    assert cache.get(pdf_path) == ROWS
+
+
+def test_parse_cache_is_keyed_by_content_not_filename(tmp_path):
+    cache = ParseCache(cache_dir=tmp_path / "cache")
+    cache.put(_write_pdf(tmp_path / "a.pdf", b"same bytes"), ROWS)
+
+    assert cache.get(_write_pdf(tmp_path / "renamed.pdf", b"same bytes")) == ROWS
+    assert cache.get(_write_pdf(tmp_path / "other.pdf", b"different bytes")) is None
+
+
+def test_parse_cache_misses_when_map_changes(tmp_path):
+    pdf_path = _write_pdf(tmp_path / "report.pdf", b"same bytes")
+    map_path = tmp_path / "map.json"
+    map_path.write_text('{"commodities": {}}')
+    ParseCache(cache_dir=tmp_path / "cache", map_path=map_path).put(pdf_path, ROWS)
+
+    map_path.write_text('{"commodities": {"Milkfish": "Bangus"}}')
+    cache = ParseCache(cache_dir=tmp_path / "cache", map_path=map_path)
+
+    assert cache.get(pdf_path) is None
+    # Entries written under the old fingerprint are evicted on the next write.
+    cache.put(pdf_path, ROWS)
+    assert len(list((tmp_path / "cache").glob("*/*.json.gz"))) == 1
+
+
+def test_parse_cache_evicts_least_recently_used_over_budget(tmp_path):
+    cache = ParseCache(cache_dir=tmp_path / "cache", max_bytes=10**6)
+    first = _write_pdf(tmp_path / "first.pdf", b"1")
+    second = _write_pdf(tmp_path / "second.pdf", b"2")
+    cache.put(first, ROWS)
+    entry_size = sum(p.stat().st_size for p in (tmp_path / "cache").glob("*/*.json.gz"))
+
+    cache.max_bytes = entry_size
+    cache.put(second, ROWS)
+
+    assert cache.get(first) is None
+    assert cache.get(second) == ROWS
+
+
+def test_parse_cache_invalidate_removes_everything(tmp_path):
+    cache = ParseCache(cache_dir=tmp_path / "cache")
+    pdf_path = _write_pdf(tmp_path / "report.pdf", b"same bytes")
+    cache.put(pdf_path, ROWS)
+
+    assert cache.invalidate() == 1
+    assert cache.get(pdf_path) is None
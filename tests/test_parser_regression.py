@@ -6,16 +6,44 @@ import json
 from pathlib import Path
 from unittest.mock import patch
 
+import pytest
+from pdfplumber.utils import extract_words as extract_words_from_chars
+
 from app.scraper.parser import PriceParser
 
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
 
 class _MockPage:
+    """Stand-in for a pdfplumber page built from a fixture's extracted words."""
+
     def __init__(self, text, words):
         self._text = text
         self._words = words
 
+    @property
+    def chars(self):
+        chars = []
+        for w in self._words:
+            width = (w["x1"] - w["x0"]) / len(w["text"])
+            for i, char in enumerate(w["text"]):
+                x0 = w["x0"] + i * width
+                chars.append(self._char(char, x0, x0 + width, w))
+            chars.append(self._char(" ", w["x1"], w["x1"], w))
+        return chars
+
+    @staticmethod
+    def _char(text, x0, x1, word):
+        return {
+            "text": text,
+            "x0": x0,
+            "x1": x1,
+            "top": word["top"],
+            "bottom": word["bottom"],
+            "doctop": word["top"],
+            "upright": True,
+        }
+
     def extract_text(self):
         return self._text
 
@@ -34,6 +62,40 @@ class _MockPDF:
         return False
 
 
+def _write_fixture_pdf(path, words, page_count, page_width=792, page_height=612):
+    """Write a real PDF repeating a fixture page's words in Helvetica at their original positions."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for _ in range(page_count):
+        ops = []
+        for w in words:
+            size = round(w["bottom"] - w["top"], 2)
+            text = w["text"].replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            # The trailing space keeps neighbouring words apart, as in the source PDF.
+            baseline = page_height - w["bottom"] + size * 0.2
+            ops.append(f"BT /F1 {size} Tf {w['x0']:.2f} {baseline:.2f} Td ({text} ) Tj ET")
+        stream = "\n".join(ops)
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {page_width} {page_height}] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    body = b"%PDF-1.4\n"
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(body))
+        body += f"{number} 0 obj\n{obj}\nendobj\n".encode("latin-1")
+    xref_offset = len(body)
+    body += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    body += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    body += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode("latin-1")
+    path.write_bytes(body)
+    return path
+
+
 def _load_results(snapshot_name: str):
     fixture_path = FIXTURES_DIR / snapshot_name
     assert fixture_path.exists(), f"Missing parser regression fixture: {fixture_path}"
@@ -83,3 +145,256 @@ def test_parse_jan_20_2026_consistency():
     assert egg is not None
     assert egg["price_low"] == 8.5
     assert egg["price_high"] == 8.5
+
+
+def test_parallel_page_parsing_matches_serial(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    payload = json.loads((FIXTURES_DIR / "Price-Monitoring-December-27-2025.json").read_text(encoding="utf-8"))
+    page = payload["pages"][0]
+    pages = [_MockPage(page["text"], page["words"]) for _ in range(3)]
+    parser = PriceParser()
+
+    with patch("app.scraper.parser.pdfplumber.open", return_value=_MockPDF(pages)):
+        serial = parser.parse_daily_retail_range("fixture.pdf", workers=1)
+        serial_stats = parser.last_stats
+        # Threads stand in for worker processes so the patched pdfplumber stays visible.
+        monkeypatch.setattr("app.scraper.parser.ProcessPoolExecutor", ThreadPoolExecutor)
+        monkeypatch.setattr(PriceParser, "PROCESS_POOL_MIN_PAGES", 2)
+        parallel = parser.parse_daily_retail_range("fixture.pdf", workers=3)
+
+    assert parallel == serial
+    # Worker stats are merged back, so the counters match the serial run.
+    assert (parser.last_stats.pages_total, parser.last_stats.tokens_seen, parser.last_stats.rows_emitted) == (
+        serial_stats.pages_total,
+        serial_stats.tokens_seen,
+        serial_stats.rows_emitted,
+    )
+    assert [page_number for page_number, _ in parser.last_page_timings] == [1, 2, 3]
+    assert all(elapsed >= 0 for _, elapsed in parser.last_page_timings)
+
+
+def test_process_pool_parses_a_real_pdf_like_the_serial_path(monkeypatch, tmp_path):
+    payload = json.loads((FIXTURES_DIR / "Price-Monitoring-December-27-2025.json").read_text(encoding="utf-8"))
+    pdf_path = _write_fixture_pdf(tmp_path / "report.pdf", payload["pages"][0]["words"], page_count=2)
+    parser = PriceParser()
+
+    serial = parser.parse_daily_retail_range(str(pdf_path), workers=1)
+    serial_stats = parser.last_stats
+    assert len(serial) == 2 * len(_load_results("Price-Monitoring-December-27-2025.json"))
+    monkeypatch.setattr(PriceParser, "PROCESS_POOL_MIN_PAGES", 2)
+    # Rows, stats and per-worker pdfplumber handles all cross real process boundaries here.
+    monkeypatch.setattr(PriceParser, "_iter_pages_serial", lambda *args: pytest.fail("expected the process pool"))
+    parallel = parser.parse_daily_retail_range(str(pdf_path), workers=2)
+
+    assert parallel == serial
+    assert (parser.last_stats.pages_total, parser.last_stats.tokens_seen, parser.last_stats.rows_emitted) == (
+        serial_stats.pages_total,
+        serial_stats.tokens_seen,
+        serial_stats.rows_emitted,
+    )
+    assert [page_number for page_number, _ in parser.last_page_timings] == [1, 2]
+
+
+def test_short_reports_skip_the_process_pool():
+    payload = json.loads((FIXTURES_DIR / "Price-Monitoring-December-27-2025.json").read_text(encoding="utf-8"))
+    page = payload["pages"][0]
+    pages = [_MockPage(page["text"], page["words"]) for _ in range(PriceParser.PROCESS_POOL_MIN_PAGES - 1)]
+
+    with (
+        patch("app.scraper.parser.pdfplumber.open", return_value=_MockPDF(pages)),
+        patch("app.scraper.parser.ProcessPoolExecutor", side_effect=AssertionError("short reports parse serially")),
+    ):
+        results = PriceParser().parse_daily_retail_range("fixture.pdf", workers=3)
+
+    assert len(results) == len(pages) * len(_load_results("Price-Monitoring-December-27-2025.json"))
+
+
+def test_each_page_is_word_extracted_once():
+    payload = json.loads((FIXTURES_DIR / "Price-Monitoring-January-20-2026.json").read_text(encoding="utf-8"))
+    page = payload["pages"][0]
+    pages = [_MockPage(page["text"], page["words"]) for _ in range(3)]
+    for mock_page in pages:
+        mock_page.extract_text = lambda: pytest.fail("extract_text should not be called")
+        mock_page.extract_words = lambda: pytest.fail("words come from the cropped chars")
+
+    with (
+        patch("app.scraper.parser.pdfplumber.open", return_value=_MockPDF(pages)),
+        patch("app.scraper.parser.extract_words_from_chars", wraps=extract_words_from_chars) as extract_words,
+    ):
+        results = PriceParser().parse_daily_retail_range("fixture.pdf")
+
+    assert str(results[0]["report_date"]) == "2026-01-20"
+    assert extract_words.call_count == 3
+
+
+def test_iter_page_batches_streams_rows_in_page_order():
+    payload = json.loads((FIXTURES_DIR / "Price-Monitoring-December-27-2025.json").read_text(encoding="utf-8"))
+    page = payload["pages"][0]
+    pages = [_MockPage(page["text"], page["words"]) for _ in range(2)]
+    parser = PriceParser()
+
+    with patch("app.scraper.parser.pdfplumber.open", return_value=_MockPDF(pages)):
+        batches = parser.iter_page_batches("fixture.pdf")
+        first_page_number, first_rows = next(batches)
+        # Only the first page has been parsed so far.
+        assert len(parser.last_page_timings) == 1
+        remaining = list(batches)
+        streamed = list(parser.iter_daily_retail_range("fixture.pdf"))
+
+    assert first_page_number == 1
+    assert [page_number for page_number, _ in remaining] == [2]
+    assert all(str(row["report_date"]) == "2025-12-27" for row in first_rows)
+    assert streamed == first_rows + remaining[0][1]
+
+
+def test_layout_cache_reuses_detected_geometry_across_parsers():
+    PriceParser._layout_cache.clear()
+    first = _load_results("Price-Monitoring-January-20-2026.json")
+    assert len(PriceParser._layout_cache) == 1
+
+    with patch.object(PriceParser, "_derive_column_centers", side_effect=AssertionError("layout not reused")):
+        second = _load_results("Price-Monitoring-January-20-2026.json")
+
+    assert second == first
+
+
+def test_layout_cache_falls_back_when_data_columns_move():
+    PriceParser._layout_cache.clear()
+    payload = json.loads((FIXTURES_DIR / "Price-Monitoring-January-20-2026.json").read_text(encoding="utf-8"))
+    page = payload["pages"][0]
+    parser = PriceParser()
+    with patch("app.scraper.parser.pdfplumber.open", return_value=_MockPDF([_MockPage(page["text"], page["words"])])):
+        parser.parse_daily_retail_range("fixture.pdf")
+
+    lines = parser._group_words_by_line(page["words"])
+    header_idx = parser._find_header_line_index(lines)
+    data_start_idx = parser._find_first_data_line_index(lines, header_idx + 1)
+    shifted = [[dict(w, x0=w["x0"] + 40) for w in line] for line in lines[data_start_idx:]]
+
+    with patch.object(parser, "_derive_column_centers", wraps=parser._derive_column_centers) as derive:
+        layout = parser._resolve_layout(lines[header_idx:data_start_idx], shifted)
+
+    assert derive.called
+    assert layout is not None
+
+
+def test_parsed_rows_are_compact_records_with_mapping_access():
+    from app.scraper.parser import PriceRow
+
+    results = _load_results("Price-Monitoring-December-27-2025.json")
+    row = results[0]
+
+    assert isinstance(row, PriceRow)
+    assert not hasattr(row, "__dict__")
+    assert row["commodity"] == row.commodity
+    assert row.get("_normalized_name") is None
+    assert dict(row) == row.to_dict()
+    assert list(row.keys())[-1] == "report_type"
+    # Rows from the same market line share one interned market string.
+    same_market = [r for r in results if r["market"] == row["market"]]
+    assert all(r.market is row.market for r in same_market)
+
+
+def test_pages_without_table_header_skip_word_extraction():
+    payload = json.loads((FIXTURES_DIR / "Price-Monitoring-December-27-2025.json").read_text(encoding="utf-8"))
+    page = payload["pages"][0]
+    cover = _MockPage("", [w for w in page["words"] if w["top"] < page["words"][0]["top"] + 20])
+    table = _MockPage(page["text"], page["words"])
+
+    with (
+        patch("app.scraper.parser.pdfplumber.open", return_value=_MockPDF([cover, table])),
+        patch("app.scraper.parser.extract_words_from_chars", wraps=extract_words_from_chars) as extract_words,
+    ):
+        results = PriceParser().parse_daily_retail_range("fixture.pdf")
+
+    # Only the table page reaches word extraction.
+    assert extract_words.call_count == 1
+    assert len(results) >= 80
+
+
+def test_table_crop_excludes_preamble_and_footer_notes():
+    payload = json.loads((FIXTURES_DIR / "Price-Monitoring-December-27-2025.json").read_text(encoding="utf-8"))
+    words = payload["pages"][0]["words"]
+    last_bottom = max(w["bottom"] for w in words)
+    note = {"text": "Note:", "x0": 40.0, "x1": 60.0, "top": last_bottom + 10, "bottom": last_bottom + 18}
+    note_tail = dict(note, text="2025", x0=62.0, x1=80.0)
+    page = _MockPage("", words + [note, note_tail])
+    parser = PriceParser()
+
+    scan = parser._scan_page(page)
+
+    assert "27 December 2025" in scan.text
+    assert parser._find_header_line_index(scan.lines) == 0
+    assert all(w["text"] not in {"Note:", "Retail"} for line in scan.lines for w in line)
+
+
+def test_parse_stats_count_pages_tokens_and_stage_times():
+    payload = json.loads((FIXTURES_DIR / "Price-Monitoring-December-27-2025.json").read_text(encoding="utf-8"))
+    page = payload["pages"][0]
+    cover = _MockPage("", [w for w in page["words"] if w["top"] < page["words"][0]["top"] + 20])
+    pages = [cover, _MockPage(page["text"], page["words"])]
+    parser = PriceParser()
+
+    with patch("app.scraper.parser.pdfplumber.open", return_value=_MockPDF(pages)):
+        results = parser.parse_daily_retail_range("fixture.pdf")
+
+    stats = parser.last_stats.to_dict()
+    assert stats["pages_total"] == 2
+    assert stats["pages_skipped"] == 1
+    assert stats["rows_emitted"] == len(results)
+    assert stats["tokens_seen"] == sum(len(line) for line in parser._scan_page(pages[1]).lines)
+    assert {"open", "chars", "scan", "words", "layout", "rows"} <= set(stats["stage_seconds"])
+
+
+def test_parse_stats_count_rejected_price_ranges():
+    payload = json.loads((FIXTURES_DIR / "Price-Monitoring-December-27-2025.json").read_text(encoding="utf-8"))
+    page = payload["pages"][0]
+    parser = PriceParser()
+
+    with patch("app.scraper.parser.pdfplumber.open", return_value=_MockPDF([_MockPage(page["text"], page["words"])])):
+        baseline = parser.parse_daily_retail_range("fixture.pdf")
+        with patch.object(PriceParser, "_validate_price_range", return_value=False):
+            rejected = parser.parse_daily_retail_range("fixture.pdf")
+
+    assert rejected == []
+    assert parser.last_stats.rows_rejected == len(baseline)
+    assert parser.last_stats.pages_skipped == 1
+
+
+def test_parse_stats_do_not_count_non_numeric_cells_as_rejected():
+    payload = json.loads((FIXTURES_DIR / "Price-Monitoring-December-27-2025.json").read_text(encoding="utf-8"))
+    page = payload["pages"][0]
+    words = [dict(word) for word in page["words"]]
+    price = next(word for word in words if word["text"] == "45.00")
+    price["text"] = "-"
+    parser = PriceParser()
+
+    with patch("app.scraper.parser.pdfplumber.open", return_value=_MockPDF([_MockPage(page["text"], words)])):
+        results = parser.parse_daily_retail_range("fixture.pdf")
+
+    assert parser.last_stats.rows_emitted == len(results)
+    assert parser.last_stats.rows_rejected == 0
+
+
+def test_daemonic_worker_parses_serially_without_per_parse_warnings(monkeypatch, caplog):
+    from types import SimpleNamespace
+
+    from app.scraper.tasks import _warn_ignored_parser_workers
+
+    payload = json.loads((FIXTURES_DIR / "Price-Monitoring-December-27-2025.json").read_text(encoding="utf-8"))
+    page = payload["pages"][0]
+    pages = [_MockPage(page["text"], page["words"]) for _ in range(3)]
+    monkeypatch.setattr("app.scraper.parser.multiprocessing.current_process", lambda: SimpleNamespace(daemon=True))
+    monkeypatch.setattr("app.scraper.tasks.settings.PARSER_WORKERS", 4)
+
+    with patch("app.scraper.parser.pdfplumber.open", return_value=_MockPDF(pages)):
+        rows = PriceParser().parse_daily_retail_range("fixture.pdf", workers=4)
+
+    assert rows
+    assert not [record for record in caplog.records if record.levelname == "WARNING"]
+
+    _warn_ignored_parser_workers(sender=SimpleNamespace(pool_cls="solo"))
+    _warn_ignored_parser_workers(sender=SimpleNamespace(pool_cls="prefork"))
+    warnings = [record.getMessage() for record in caplog.records if record.levelname == "WARNING"]
+    assert len(warnings) == 1 and "PARSER_WORKERS=4" in warnings[0]
@@ -0,0 +1,57 @@
+import os
+
+from app.scraper.parse_cache import hash_file
+from app.scraper.pdf_store import PDFStore
+
+
+def _write_pdf(path, payload: bytes):
+    path.write_bytes(b"%PDF-1.4 " + payload)
+    return path
+
+
+def test_pdf_store_maps_urls_to_content(tmp_path):
+    store = PDFStore(store_dir=tmp_path / "store")
+    pdf_path = _write_pdf(tmp_path / "report.pdf", b"same bytes")
+
+    assert store.lookup("https://example.com/report.pdf") is None
+    sha256 = store.put(pdf_path, url="https://example.com/report.pdf")
+
+    assert sha256 == hash_file(pdf_path)
+    assert store.lookup("https://example.com/report.pdf") == sha256
+    checkout = store.checkout(sha256, tmp_path / "checkout.pdf")
+    assert checkout.read_bytes() == pdf_path.read_bytes()
+
+
+def test_pdf_store_keeps_identical_content_once(tmp_path):
+    store = PDFStore(store_dir=tmp_path / "store")
+    first = store.put(_write_pdf(tmp_path / "a.pdf", b"same bytes"), url="https://example.com/a.pdf")
+    second = store.put(_write_pdf(tmp_path / "b.pdf", b"same bytes"), url="https://mirror.example.com/b.pdf")
+
+    assert first == second
+    assert len(list((tmp_path / "store" / "objects").iterdir())) == 1
+    assert store.lookup("https://mirror.example.com/b.pdf") == first
+
+
+def test_pdf_store_survives_deleting_the_working_copy(tmp_path):
+    store = PDFStore(store_dir=tmp_path / "store")
+    pdf_path = _write_pdf(tmp_path / "report.pdf", b"parsed then removed")
+    sha256 = store.put(pdf_path, url="https://example.com/report.pdf")
+
+    pdf_path.unlink()
+
+    assert store.lookup("https://example.com/report.pdf") == sha256
+
+
+def test_pdf_store_evicts_least_recently_used_over_budget(tmp_path):
+    store = PDFStore(store_dir=tmp_path / "store", max_bytes=10**6)
+    first = store.put(_write_pdf(tmp_path / "first.pdf", b"1"), url="https://example.com/first.pdf")
+    second = store.put(_write_pdf(tmp_path / "second.pdf", b"2"), url="https://example.com/second.pdf")
+    # Make "first" the most recently used by checking it out after "second" was stored.
+    os.utime(store.object_path(second), (0, 0))
+    store.checkout(first, tmp_path / "checkout.pdf")
+
+    store.max_bytes = store.object_path(first).stat().st_size
+    assert store.evict() == 1
+
+    assert store.lookup("https://example.com/first.pdf") == first
+    assert store.lookup("https://example.com/second.pdf") is None
@@ -2,10 +2,13 @@
 Unit tests for PriceService.
 """
 
+import os
 from datetime import date, timedelta
 from decimal import Decimal
+from unittest.mock import MagicMock
 from uuid import uuid4
 
+import pytest
 from sqlalchemy.exc import IntegrityError
 
 from app.models.commodity import Commodity
@@ -571,3 +574,181 @@ class TestPriceService:
             db_session.rollback()
         else:
             raise AssertionError("Expected unique constraint to reject duplicate price entry identity")
+
+    def _bulk_row(self, commodity_id, market_id, prevailing, report_date=date(2025, 1, 20)):
+        return {
+            "commodity_id": commodity_id,
+            "market_id": market_id,
+            "report_date": report_date,
+            "price_low": prevailing - 5,
+            "price_high": prevailing + 5,
+            "price_prevailing": prevailing,
+            "price_average": None,
+            "report_type": "DAILY_RETAIL",
+            "source_file": "test.pdf",
+        }
+
+    def test_bulk_upsert_entries_counts_inserts_updates_and_skips(self, db_session, sample_commodity, sample_market):
+        """Test one batch classifies rows against stored entries and writes only changes."""
+        other_market = Market(name="Other Market", region="NCR")
+        db_session.add(other_market)
+        db_session.commit()
+
+        first = PriceService.bulk_upsert_entries(
+            db_session,
+            [
+                self._bulk_row(sample_commodity.id, sample_market.id, 45.0),
+                self._bulk_row(sample_commodity.id, other_market.id, 50.0),
+            ],
+        )
+        second = PriceService.bulk_upsert_entries(
+            db_session,
+            [
+                self._bulk_row(sample_commodity.id, sample_market.id, 45.0),
+                self._bulk_row(sample_commodity.id, other_market.id, 52.5),
+                self._bulk_row(sample_commodity.id, other_market.id, 52.5, report_date=date(2025, 1, 21)),
+            ],
+        )
+
+        assert first == {"inserted": 2, "updated": 0, "skipped": 0}
+        assert second == {"inserted": 1, "updated": 1, "skipped": 1}
+        updated = (
+            db_session.query(PriceEntry)
+            .filter(PriceEntry.market_id == other_market.id, PriceEntry.report_date == date(2025, 1, 20))
+            .one()
+        )
+        assert updated.price_prevailing == Decimal("52.50")
+        assert updated.price_high == Decimal("57.50")
+        assert db_session.query(PriceEntry).count() == 3
+
+    def test_bulk_upsert_entries_collapses_duplicates_within_batch(self, db_session, sample_commodity, sample_market):
+        """Test repeated identities in one batch are written once, keeping the last version."""
+        result = PriceService.bulk_upsert_entries(
+            db_session,
+            [
+                self._bulk_row(sample_commodity.id, sample_market.id, 45.0),
+                self._bulk_row(sample_commodity.id, sample_market.id, 45.0),
+                self._bulk_row(sample_commodity.id, sample_market.id, 47.0),
+            ],
+        )
+
+        assert result == {"inserted": 1, "updated": 1, "skipped": 1}
+        entry = db_session.query(PriceEntry).one()
+        assert entry.price_prevailing == Decimal("47.00")
+
+    def test_bulk_upsert_entries_empty_batch(self, db_session):
+        """Test an empty batch is a no-op."""
+        assert PriceService.bulk_upsert_entries(db_session, []) == {"inserted": 0, "updated": 0, "skipped": 0}
+
+    def test_diff_report_entries_returns_only_changed_rows(self, db_session, sample_commodity, sample_market):
+        """Test rows are diffed in memory against the stored report."""
+        other_market = Market(name="Other Market", region="NCR")
+        db_session.add(other_market)
+        db_session.commit()
+        PriceService.bulk_upsert_entries(
+            db_session,
+            [
+                self._bulk_row(sample_commodity.id, sample_market.id, 45.0),
+                self._bulk_row(sample_commodity.id, other_market.id, 50.0),
+                self._bulk_row(sample_commodity.id, sample_market.id, 45.0, report_date=date(2025, 1, 21)),
+            ],
+        )
+
+        changed, unchanged = PriceService.diff_report_entries(
+            db_session,
+            [
+                self._bulk_row(sample_commodity.id, str(sample_market.id), 45.0),
+                self._bulk_row(sample_commodity.id, other_market.id, 52.5),
+                self._bulk_row(sample_commodity.id, other_market.id, 52.5),
+                self._bulk_row(sample_commodity.id, other_market.id, 50.0, report_date=date(2025, 1, 21)),
+            ],
+        )
+
+        assert changed == [1, 3]
+        assert unchanged == 2
+        assert PriceService.diff_report_entries(db_session, []) == ([], 0)
+
+    def test_bulk_upsert_entries_copy_loader_falls_back_on_sqlite(self, db_session, sample_commodity, sample_market):
+        """Test the COPY loader uses batched upserts outside PostgreSQL."""
+        row = self._bulk_row(sample_commodity.id, sample_market.id, 45.0)
+
+        assert PriceService.bulk_upsert_entries(db_session, [row], loader="copy") == {
+            "inserted": 1,
+            "updated": 0,
+            "skipped": 0,
+        }
+        with pytest.raises(ValueError):
+            PriceService.bulk_upsert_entries(db_session, [row], loader="bcp")
+
+    def test_copy_loader_stages_rows_and_merges_on_postgresql(self, sample_commodity, sample_market):
+        """Test the PostgreSQL COPY loader streams text-format rows and merges them in one statement."""
+        from sqlalchemy.dialects import postgresql
+
+        db = MagicMock()
+        db.bind.dialect.name = "postgresql"
+        cursor = db.connection.return_value.connection.dbapi_connection.cursor.return_value.__enter__.return_value
+        db.execute.return_value.scalars.return_value.all.return_value = [True, False]
+        rows = [
+            self._bulk_row(sample_commodity.id, sample_market.id, 45.0),
+            dict(self._bulk_row(sample_commodity.id, uuid4(), 50.0), source_file="tab\there.pdf"),
+        ]
+
+        result = PriceService.bulk_upsert_entries(db, rows, loader="copy")
+
+        assert result == {"inserted": 1, "updated": 1, "skipped": 0}
+        copy_sql, buffer = cursor.copy_expert.call_args.args
+        assert copy_sql.startswith("COPY price_entries_staging (id, commodity_id, market_id")
+        lines = buffer.getvalue().splitlines()
+        assert len(lines) == 2
+        assert lines[0].split("\t")[4:8] == ["40.00", "50.00", "45.00", "\\N"]
+        assert lines[1].endswith("tab\\there.pdf")
+        merge_sql = str(db.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "FROM price_entries_staging ON CONFLICT ON CONSTRAINT uq_price_entries_identity" in merge_sql
+        assert "SET price_low = excluded.price_low" in merge_sql
+        db.commit.assert_called_once()
+
+    @pytest.mark.skipif(
+        not os.environ.get("TEST_DATABASE_URL", "").startswith("postgresql"),
+        reason="TEST_DATABASE_URL does not point at PostgreSQL",
+    )
+    def test_copy_loader_merges_into_postgresql(self, db_session, sample_commodity, sample_market):
+        """Test the COPY loader end to end: COPY into staging, merge, and xmax-based counts."""
+        other_market = Market(name="Other Market", region="NCR")
+        db_session.add(other_market)
+        db_session.commit()
+
+        first = PriceService.bulk_upsert_entries(
+            db_session,
+            [
+                self._bulk_row(sample_commodity.id, sample_market.id, 45.0),
+                dict(self._bulk_row(sample_commodity.id, other_market.id, 50.0), source_file="tab\there.pdf"),
+            ],
+            loader="copy",
+            commit=False,
+        )
+        # The second batch shares the transaction, so it must not re-merge the first batch's staged rows.
+        second = PriceService.bulk_upsert_entries(
+            db_session,
+            [
+                self._bulk_row(sample_commodity.id, sample_market.id, 45.0),
+                dict(self._bulk_row(sample_commodity.id, other_market.id, 52.5), source_file="tab\there.pdf"),
+                self._bulk_row(sample_commodity.id, other_market.id, 52.5, report_date=date(2025, 1, 21)),
+            ],
+            loader="copy",
+        )
+
+        assert first == {"inserted": 2, "updated": 0, "skipped": 0}
+        assert second == {"inserted": 1, "updated": 1, "skipped": 1}
+        assert db_session.query(PriceEntry).count() == 3
+        updated = (
+            db_session.query(PriceEntry)
+            .filter(PriceEntry.market_id == other_market.id, PriceEntry.report_date == date(2025, 1, 20))
+            .one()
+        )
+        assert (updated.price_low, updated.price_high, updated.price_prevailing) == (
+            Decimal("47.50"),
+            Decimal("57.50"),
+            Decimal("52.50"),
+        )
+        assert updated.price_average is None
+        assert updated.source_file == "tab\there.pdf"
@@ -4,8 +4,12 @@ Tests for scraper components (parser, downloader, source).
 
 from datetime import date, datetime
 from pathlib import Path
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import patch
 
+import httpx
+import pytest
+
+from app.scraper import http_cache, http_client
 from app.scraper.downloader import PDFDownloader
 from app.scraper.parser import PriceParser
 from app.scraper.source import MonitoringSource
@@ -53,6 +57,26 @@ class TestPriceParser:
         # Should handle whitespace
         assert "Bangus" in result
 
+    def test_derive_category_follows_map_priority(self):
+        """Test categories come from map.json keywords, earlier categories winning."""
+        parser = PriceParser()
+        assert parser._derive_category("Rice Premium (Local)") == "Rice"
+        assert parser._derive_category("Eggplant") == "Eggs"
+        assert parser._derive_category("Bell Pepper (Red)") == "Vegetables"
+        assert parser._derive_category("Coconut Oil - 1L") == "Staples"
+        assert parser._derive_category("Unknown Commodity XYZ") is None
+        assert parser._derive_category("") is None
+
+    def test_commodity_labels_are_resolved_once_per_process(self):
+        """Test label resolution is memoized on a vocabulary shared by parsers."""
+        parser = PriceParser()
+        assert PriceParser().vocabulary is parser.vocabulary
+
+        first = parser.vocabulary.resolve("Milkfish  (Bangus)")
+        assert first == ("Bangus", "Fish")
+        assert parser.vocabulary.resolved["Milkfish  (Bangus)"] is first
+        assert PriceParser().vocabulary.resolve("Milkfish  (Bangus)") is first
+
     def test_is_category_row_true(self):
         """Test identifying category rows."""
         parser = PriceParser()
@@ -80,6 +104,18 @@ class TestPriceParser:
         assert parser._parse_numeric("") is None
         assert parser._parse_numeric(None) is None
 
+    def test_assign_columns_matches_nearest_center(self):
+        """Batched column assignment picks the nearest center, preferring the left one on ties."""
+        parser = PriceParser()
+        centers = [100.0, 180.0, 260.0]
+        line = [{"text": str(x), "x0": x} for x in (20.0, 95.0, 140.0, 141.0, 219.9, 220.0, 400.0)]
+
+        midpoints = parser._column_midpoints(centers)
+        assignments = parser._assign_columns([line], midpoints, market_boundary=60.0)
+
+        assert assignments == [[None, 0, 0, 1, 1, 1, 2]]
+        assert [parser._nearest_column(w["x0"], midpoints) for w in line[1:]] == [0, 0, 1, 1, 1, 2]
+
     def test_extract_date_from_text(self):
         """Test extracting date from text."""
         parser = PriceParser()
@@ -150,6 +186,240 @@ class TestPDFDownloader:
             assert len(result) == 2
             assert all(str(p).endswith(".pdf") for p in result)
 
+    def test_download_reuses_one_client_across_retries(self, tmp_path, monkeypatch):
+        """Test a retried download goes through the same injected client."""
+        pdf_bytes = b"%PDF-1.4" + b"0" * 2048
+        responses = iter([httpx.Response(503), httpx.Response(200, content=pdf_bytes)])
+        requests = []
+
+        def _handler(request):
+            requests.append(request)
+            return next(responses)
+
+        monkeypatch.setattr(PDFDownloader, "RETRY_DELAY", 0)
+        client = httpx.Client(transport=httpx.MockTransport(_handler))
+        downloader = PDFDownloader(download_dir=str(tmp_path), client=client)
+
+        path = downloader.download_pdf_sync("https://example.com/report.pdf")
+
+        assert path.read_bytes() == pdf_bytes
+        assert len(requests) == 2
+        assert not client.is_closed
+
+    def test_download_streams_to_disk_and_hashes_on_the_fly(self, tmp_path):
+        """Test a streamed download lands atomically with its SHA-256 recorded."""
+        import hashlib
+
+        pdf_bytes = b"%PDF-1.4" + b"1" * 5000
+        client = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(200, content=pdf_bytes)))
+        downloader = PDFDownloader(download_dir=str(tmp_path), client=client)
+        downloader.CHUNK_SIZE = 1024
+
+        path = downloader.download_pdf_sync("https://example.com/report.pdf")
+
+        assert path.read_bytes() == pdf_bytes
+        assert downloader.last_sha256 == hashlib.sha256(pdf_bytes).hexdigest()
+        assert [p.name for p in tmp_path.iterdir()] == ["report.pdf"]
+
+    def test_download_rejects_non_pdf_without_touching_existing_file(self, tmp_path):
+        """Test a body without the PDF magic is rejected and the previous file kept."""
+        from app.core.exceptions import PDFDownloadError
+
+        (tmp_path / "report.pdf").write_bytes(b"%PDF-previous")
+        html = b"<html>" + b"x" * 5000
+        client = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(200, content=html)))
+        downloader = PDFDownloader(download_dir=str(tmp_path), client=client)
+
+        with pytest.raises(PDFDownloadError, match="not a PDF"):
+            downloader.download_pdf_sync("https://example.com/report.pdf")
+
+        assert [p.name for p in tmp_path.iterdir()] == ["report.pdf"]
+        assert (tmp_path / "report.pdf").read_bytes() == b"%PDF-previous"
+
+    def test_download_enforces_max_size_while_streaming(self, tmp_path):
+        """Test the size cap applies even when no Content-Length is sent."""
+        from app.core.exceptions import PDFDownloadError
+
+        def _chunks():
+            yield b"%PDF-1.4"
+            while True:
+                yield b"0" * 1024
+
+        client = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(200, content=_chunks())))
+        downloader = PDFDownloader(download_dir=str(tmp_path), client=client)
+        downloader.MAX_BYTES = 10 * 1024
+
+        with pytest.raises(PDFDownloadError, match="too large"):
+            downloader.download_pdf_sync("https://example.com/report.pdf")
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_stored_pdf_is_revalidated_and_reused_after_not_modified(self, tmp_path):
+        """Test a stored report is revalidated, and a 304 checks out the stored body instead of streaming it."""
+        pdf_bytes = b"%PDF-1.4" + b"2" * 4096
+
+        def _handler(request):
+            if request.headers.get("if-modified-since") == "Mon, 20 Jan 2025 08:00:00 GMT":
+                return httpx.Response(304)
+            return httpx.Response(200, content=pdf_bytes, headers={"Last-Modified": "Mon, 20 Jan 2025 08:00:00 GMT"})
+
+        client = httpx.Client(transport=httpx.MockTransport(_handler))
+        downloader = PDFDownloader(download_dir=str(tmp_path / "downloads"), client=client)
+
+        path = downloader.download_pdf_sync("https://example.com/report.pdf")
+        first_sha256 = downloader.last_sha256
+        path.unlink()  # the scrape task removes the PDF once parsed
+        http_cache.reset_http_cache_stats()
+
+        path = downloader.download_pdf_sync("https://example.com/report.pdf")
+
+        assert path.read_bytes() == pdf_bytes
+        assert downloader.last_sha256 == first_sha256
+        assert http_cache.http_cache_stats() == {"hits": 1, "misses": 0}
+
+    def test_not_modified_with_missing_stored_copy_refetches_unconditionally(self, tmp_path):
+        """Test a 304 whose stored body has gone is followed by an unconditional GET, not more 304s."""
+        from app.scraper.pdf_store import PDFStore
+
+        pdf_bytes = b"%PDF-1.4" + b"7" * 4096
+        seen_validators = []
+
+        def _handler(request):
+            seen_validators.append(request.headers.get("if-none-match"))
+            if request.headers.get("if-none-match") == '"v1"':
+                # Evicted by another worker between the lookup and the reply.
+                store = PDFStore()
+                store.object_path(store.lookup("https://example.com/report.pdf")).unlink()
+                return httpx.Response(304)
+            return httpx.Response(200, content=pdf_bytes, headers={"ETag": '"v1"'})
+
+        client = httpx.Client(transport=httpx.MockTransport(_handler))
+        downloader = PDFDownloader(download_dir=str(tmp_path), client=client)
+
+        downloader.download_pdf_sync("https://example.com/report.pdf").unlink()
+        path = downloader.download_pdf_sync("https://example.com/report.pdf")
+
+        assert path.read_bytes() == pdf_bytes
+        assert seen_validators == [None, '"v1"', None]
+
+    def test_republished_pdf_replaces_the_stored_copy(self, tmp_path):
+        """Test a changed upstream body at the same URL is downloaded and becomes the stored copy."""
+        import hashlib
+
+        from app.scraper.pdf_store import PDFStore
+
+        versions = {
+            '"v1"': b"%PDF-1.4" + b"5" * 4096,
+            '"v2"': b"%PDF-1.4" + b"6" * 4096,
+        }
+        current = {"etag": '"v1"'}
+
+        def _handler(request):
+            if request.headers.get("if-none-match") == current["etag"]:
+                return httpx.Response(304)
+            return httpx.Response(200, content=versions[current["etag"]], headers={"ETag": current["etag"]})
+
+        client = httpx.Client(transport=httpx.MockTransport(_handler))
+        downloader = PDFDownloader(download_dir=str(tmp_path), client=client)
+        url = "https://example.com/report.pdf"
+
+        downloader.download_pdf_sync(url).unlink()
+        current["etag"] = '"v2"'  # the source republishes a corrected report
+        path = downloader.download_pdf_sync(url)
+
+        corrected_sha256 = hashlib.sha256(versions['"v2"']).hexdigest()
+        assert path.read_bytes() == versions['"v2"']
+        assert downloader.last_sha256 == corrected_sha256
+        assert PDFStore().lookup(url) == corrected_sha256
+
+    def test_stored_pdf_is_redownloaded_without_a_request_when_preferred(self, tmp_path):
+        """Test prefer_stored checks a stored report out with no network traffic."""
+        pdf_bytes = b"%PDF-1.4" + b"4" * 4096
+        requests = []
+
+        def _handler(request):
+            requests.append(request.url.path)
+            return httpx.Response(200, content=pdf_bytes)
+
+        client = httpx.Client(transport=httpx.MockTransport(_handler))
+        downloader = PDFDownloader(download_dir=str(tmp_path), client=client)
+
+        downloader.download_pdf_sync("https://example.com/report.pdf").unlink()
+        path = downloader.download_pdf_sync("https://example.com/report.pdf", prefer_stored=True)
+
+        assert path.read_bytes() == pdf_bytes
+        assert requests == ["/report.pdf"]
+
+    def test_download_many_reports_each_url_and_limits_per_host(self, tmp_path):
+        """Test a concurrent burst returns per-URL results and respects the per-host cap."""
+        import asyncio
+
+        pdf_bytes = b"%PDF-1.4" + b"3" * 2048
+        active = {"now": 0, "peak": 0}
+
+        async def _handler(request):
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+            await asyncio.sleep(0.01)
+            active["now"] -= 1
+            if request.url.path.endswith("missing.pdf"):
+                return httpx.Response(404)
+            return httpx.Response(200, content=pdf_bytes)
+
+        urls = [f"https://example.com/report-{i}.pdf" for i in range(4)] + ["https://example.com/missing.pdf"]
+        downloader = PDFDownloader(download_dir=str(tmp_path))
+
+        async def _run():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(_handler)) as client:
+                return await downloader.download_many(urls, per_host_limit=2, client=client)
+
+        results = asyncio.run(_run())
+
+        assert [result.url for result in results] == urls
+        assert [result.ok for result in results] == [True, True, True, True, False]
+        assert all(result.bytes == len(pdf_bytes) and result.path.exists() for result in results[:4])
+        assert "HTTP 404" in results[4].error and results[4].path is None
+        assert active["peak"] == 2
+
+    def test_retry_backoff_is_jittered(self, tmp_path):
+        """Test retry waits are spread around the exponential schedule."""
+        downloader = PDFDownloader(download_dir=str(tmp_path))
+        waits = {downloader._backoff_seconds(2) for _ in range(20)}
+
+        assert len(waits) > 1
+        assert all(PDFDownloader.RETRY_DELAY * 2 <= wait <= PDFDownloader.RETRY_DELAY * 6 for wait in waits)
+
+
+class TestHttpClient:
+    """Tests for the process-wide pooled HTTP client."""
+
+    def test_pooled_client_is_shared_until_closed(self):
+        previous = http_client.set_http_client(None)
+        try:
+            client = http_client.get_http_client()
+            assert http_client.get_http_client() is client
+            assert PDFDownloader().client is client
+            assert MonitoringSource._http_client() is client
+
+            http_client.close_http_client()
+            assert client.is_closed
+            assert http_client.get_http_client() is not client
+        finally:
+            http_client.close_http_client()
+            http_client.set_http_client(previous)
+
+    def test_pooled_client_uses_configured_limits(self, monkeypatch):
+        monkeypatch.setattr("app.scraper.http_client.settings.HTTP_MAX_CONNECTIONS", 3)
+        monkeypatch.setattr("app.scraper.http_client.settings.HTTP_CONNECT_TIMEOUT_SECONDS", 2.5)
+
+        monkeypatch.setattr("app.scraper.http_client.httpx.Client", lambda **options: options)
+
+        options = http_client.build_http_client()
+
+        assert options["limits"].max_connections == 3
+        assert options["timeout"].connect == 2.5
+        assert options["http2"] is False
+
 
 class TestMonitoringSource:
     """Tests for MonitoringSource class."""
@@ -158,32 +428,45 @@ class TestMonitoringSource:
         """Test base URL is correct."""
         assert MonitoringSource.BASE_URL == "https://www.da.gov.ph/price-monitoring/"
 
-    @patch("app.scraper.source.httpx.Client")
-    def test_get_latest_pdf_links_filters_correctly(self, mock_client):
+    def test_get_latest_pdf_links_filters_correctly(self):
         """Test that PDF link filtering works correctly."""
         # Mock response with various PDF types
-        mock_response = Mock()
-        mock_response.text = """
+        html = """
         <html>
         <a href="https://da.gov.ph/Price-Monitoring-Dec-2025.pdf">Daily</a>
         <a href="https://da.gov.ph/Daily-Price-Index-Dec-2025.pdf">DPI</a>
         <a href="https://da.gov.ph/Cigarette-Monitoring.pdf">Cig</a>
         </html>
         """
-        mock_response.raise_for_status = Mock()
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, text=html))
 
-        mock_client_instance = MagicMock()
-        mock_client_instance.__enter__ = Mock(return_value=mock_client_instance)
-        mock_client_instance.__exit__ = Mock(return_value=False)
-        mock_client_instance.get.return_value = mock_response
-        mock_client.return_value = mock_client_instance
-
-        result = MonitoringSource.get_latest_pdf_links()
+        with patch.object(MonitoringSource, "client", httpx.Client(transport=transport)):
+            result = MonitoringSource.get_latest_pdf_links()
 
         # Should only include Price-Monitoring, not DPI or Cigarette
         assert len(result) == 1
         assert "Price-Monitoring" in result[0]
 
+    def test_get_latest_pdf_links_reuses_links_when_page_not_modified(self):
+        """Test a 304 for the monitoring page returns the previously parsed links."""
+        html = '<a href="https://da.gov.ph/Price-Monitoring-Dec-2025.pdf">Daily</a>'
+        seen_validators = []
+
+        def _handler(request):
+            seen_validators.append(request.headers.get("if-none-match"))
+            if request.headers.get("if-none-match") == '"page-v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, text=html, headers={"ETag": '"page-v1"'})
+
+        http_cache.reset_http_cache_stats()
+        with patch.object(MonitoringSource, "client", httpx.Client(transport=httpx.MockTransport(_handler))):
+            first = MonitoringSource.get_latest_pdf_links()
+            second = MonitoringSource.get_latest_pdf_links()
+
+        assert first == second == ["https://da.gov.ph/Price-Monitoring-Dec-2025.pdf"]
+        assert seen_validators == [None, '"page-v1"']
+        assert http_cache.http_cache_stats() == {"hits": 1, "misses": 1}
+
     def test_get_new_pdf_links_filters_processed(self):
         """Test filtering out already processed files."""
         with patch.object(MonitoringSource, "get_latest_pdf_links") as mock_get: